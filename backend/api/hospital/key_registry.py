@@ -0,0 +1,209 @@
+"""
+Hospital issuer key registry
+============================
+Signing keys are loaded from the `hospitals` table once per process and
+kept with their derived signing state (BbsMock.signer). Issuing a
+credential therefore reads no key material from the database.
+
+  - A miss (first use, or a hospital created by another worker) loads the
+    row once. Concurrent misses for the same hospital_id share one load.
+  - get_or_create() is the only place that creates a hospital. Concurrent
+    first-time auto-inits in this process share one insert. One that
+    races another worker loses on the unique hospital_id, rolls back and
+    adopts the winner's row, so both workers sign with the same key.
+  - A background refresh reloads the table every `refresh_seconds`. Keys
+    changed in the database (rotated, or removed) are picked up without a
+    restart. Like ExpirySweeper, start() must run inside the loop.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Optional
+from datetime import datetime
+import asyncio
+import logging
+import uuid
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.future import select
+
+from crypto.bbs_mock import BbsMock
+from database.db import AsyncSessionLocal
+from database.models import Hospital
+
+logger = logging.getLogger("hospital.keys")
+
+REFRESH_SECONDS = 60.0
+
+
+class IssuerKeys:
+    """One hospital's key material and the signer derived from it."""
+    __slots__ = ("id", "hospital_id", "hospital_name", "public_key", "created_at", "fingerprint", "sign")
+
+    def __init__(self, row: Hospital) -> None:
+        self.id            = row.id
+        self.hospital_id   = row.hospital_id
+        self.hospital_name = row.hospital_name
+        self.public_key    = row.public_key
+        self.created_at: Optional[datetime] = row.created_at
+        self.fingerprint   = (row.public_key, row.private_key_encrypted)
+        self.sign: Callable[[Dict[str, Any]], str] = BbsMock.signer(row.private_key_encrypted)
+
+
+class KeyRegistry:
+    def __init__(self, session_factory: Callable[[], Any] = AsyncSessionLocal,
+                 refresh_seconds: float = REFRESH_SECONDS) -> None:
+        self.session_factory = session_factory
+        self.refresh_seconds = refresh_seconds
+        self._keys: Dict[str, IssuerKeys] = {}
+        self._pending: Dict[str, "asyncio.Future[Optional[IssuerKeys]]"] = {}
+        self._running = False
+        self._task: Optional[asyncio.Task] = None   # type: ignore[type-arg]
+        # Metrics
+        self.hits      = 0
+        self.loads     = 0
+        self.created   = 0
+        self.races     = 0   # inserts lost to another worker
+        self.refreshes = 0
+        self.changed   = 0   # entries replaced or dropped by a refresh
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    async def get(self, hospital_id: str) -> Optional[IssuerKeys]:
+        keys = self._keys.get(hospital_id)
+        if keys is not None:
+            self.hits += 1
+            return keys
+        return await self._single_flight(hospital_id, lambda: self._load(hospital_id))
+
+    async def get_or_create(self, hospital_id: str, hospital_name: str) -> IssuerKeys:
+        keys = self._keys.get(hospital_id)
+        if keys is not None:
+            self.hits += 1
+            return keys
+        while True:
+            keys = await self._single_flight(hospital_id, lambda: self._load_or_create(hospital_id, hospital_name))
+            if keys is not None:    # None: we joined a plain get() that missed
+                return keys
+
+    async def _single_flight(
+        self, hospital_id: str, fetch: Callable[[], Awaitable[Optional[IssuerKeys]]]
+    ) -> Optional[IssuerKeys]:
+        pending = self._pending.get(hospital_id)
+        if pending is None:
+            pending = asyncio.ensure_future(fetch())
+            self._pending[hospital_id] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(hospital_id, None))
+        # shield: one cancelled request must not cancel the load for the others
+        return await asyncio.shield(pending)
+
+    # ------------------------------------------------------------------
+    # Database
+    # ------------------------------------------------------------------
+
+    async def _select(self, session: Any, hospital_id: str) -> Optional[Hospital]:
+        result = await session.execute(select(Hospital).where(Hospital.hospital_id == hospital_id))
+        return result.scalars().first()
+
+    def _remember(self, row: Hospital) -> IssuerKeys:
+        keys = IssuerKeys(row)
+        self._keys[keys.hospital_id] = keys
+        return keys
+
+    async def _load(self, hospital_id: str) -> Optional[IssuerKeys]:
+        async with self.session_factory() as session:
+            row = await self._select(session, hospital_id)
+        self.loads += 1
+        return self._remember(row) if row is not None else None
+
+    async def _load_or_create(self, hospital_id: str, hospital_name: str) -> IssuerKeys:
+        async with self.session_factory() as session:
+            row = await self._select(session, hospital_id)
+            self.loads += 1
+            if row is None:
+                pk, sk = BbsMock.generate_keys()
+                row = Hospital(
+                    id=str(uuid.uuid4()),
+                    hospital_id=hospital_id,
+                    hospital_name=hospital_name,
+                    public_key=pk,
+                    private_key_encrypted=sk,
+                )
+                session.add(row)
+                try:
+                    await session.commit()
+                    await session.refresh(row)
+                    self.created += 1
+                    logger.info(f"Issuer keys created for hospital {hospital_id}")
+                except IntegrityError:
+                    # Another worker inserted the same hospital_id first
+                    await session.rollback()
+                    self.races += 1
+                    row = await self._select(session, hospital_id)
+                    if row is None:
+                        raise
+            return self._remember(row)
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+
+    async def refresh(self) -> int:
+        """Reload every hospital; returns how many cached entries changed."""
+        known = set(self._keys)    # entries added while the query runs are not stale
+        async with self.session_factory() as session:
+            rows = (await session.execute(select(Hospital))).scalars().all()
+        seen = set()
+        changed = 0
+        for row in rows:
+            seen.add(row.hospital_id)
+            cached = self._keys.get(row.hospital_id)
+            if cached is None or cached.fingerprint != (row.public_key, row.private_key_encrypted):
+                changed += cached is not None
+                self._remember(row)
+        for hospital_id in known - seen:
+            del self._keys[hospital_id]
+            changed += 1
+        self.refreshes += 1
+        self.changed += changed
+        return changed
+
+    def start(self) -> None:
+        if not self._running:
+            self._running = True
+            self._task = asyncio.create_task(self._run_loop())
+            logger.info("KeyRegistry started.")
+
+    async def stop(self) -> None:
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run_loop(self) -> None:
+        while self._running:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                changed = await self.refresh()
+                if changed:
+                    logger.info(f"KeyRegistry refresh: {changed} issuer key(s) changed")
+            except Exception as exc:
+                logger.error(f"KeyRegistry refresh error: {exc}", exc_info=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "keys":      len(self._keys),
+            "hits":      self.hits,
+            "loads":     self.loads,
+            "created":   self.created,
+            "races":     self.races,
+            "refreshes": self.refreshes,
+            "changed":   self.changed,
+        }
+
+
+# Module-level singleton used by the hospital routes
+key_registry = KeyRegistry()
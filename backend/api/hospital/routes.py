@@ -1,70 +1,55 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.future import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from database.bulk import bulk_insert
 from database.db import get_db
-from database.models import Hospital, IssuedCredential
-from .schemas import HospitalInitRequest, HospitalInitResponse, IssueCredentialRequest, IssueCredentialResponse
-from crypto.bbs_mock import BbsMock
+from database.models import IssuedCredential
+from .schemas import (HospitalInitRequest, HospitalInitResponse, IssueCredentialRequest, IssueCredentialResponse,
+                      IssueCredentialBatchRequest, IssueCredentialBatchResponse)
+from .key_registry import key_registry
+from datetime import datetime, timezone
 import uuid
 import json
 from hashlib import sha256
+import logging
 
+logger = logging.getLogger("hospital")
 router = APIRouter()
 
+# Credentials per POST /issue/batch (one COPY on Postgres, one executemany on SQLite)
+ISSUE_BATCH_MAX = 1000
+
+# Keys come from the in-process registry (see key_registry.py); its refresh
+# task picks up keys changed in the database.
+@router.on_event("startup")
+async def _start_key_registry():
+    try:
+        await key_registry.refresh()
+    except Exception as exc:
+        logger.warning(f"Issuer key preload skipped: {exc}")
+    key_registry.start()
+
+@router.on_event("shutdown")
+async def _stop_key_registry():
+    await key_registry.stop()
+
 @router.post("/init", response_model=HospitalInitResponse)
-async def init_hospital(req: HospitalInitRequest, db: AsyncSession = Depends(get_db)):
-    """Initialize a new hospital issuer"""
-    # Check if exists
-    result = await db.execute(select(Hospital).where(Hospital.hospital_id == req.hospital_id))
-    existing = result.scalars().first()
-    if existing:
-        return HospitalInitResponse(
-            hospital_id=existing.hospital_id,
-            public_key=existing.public_key,
-            created_at=existing.created_at
-        )
-        
-    pk, sk = BbsMock.generate_keys()
-    
-    hospital = Hospital(
-        id=str(uuid.uuid4()),
-        hospital_id=req.hospital_id,
-        hospital_name=req.hospital_name,
-        public_key=pk,
-        private_key_encrypted=sk
-    )
-    db.add(hospital)
-    await db.commit()
-    await db.refresh(hospital)
-    
+async def init_hospital(req: HospitalInitRequest):
+    """Initialize a new hospital issuer (returns the existing keys if it is known)"""
+    keys = await key_registry.get_or_create(req.hospital_id, req.hospital_name)
     return HospitalInitResponse(
-        hospital_id=hospital.hospital_id,
-        public_key=hospital.public_key,
-        created_at=hospital.created_at
+        hospital_id=keys.hospital_id,
+        public_key=keys.public_key,
+        created_at=keys.created_at
     )
 
 @router.post("/issue", response_model=IssueCredentialResponse)
 async def issue_credential(req: IssueCredentialRequest, db: AsyncSession = Depends(get_db)):
     """Issue a medical credential signed by the hospital"""
-    result = await db.execute(select(Hospital).where(Hospital.hospital_id == req.hospital_id))
-    hospital = result.scalars().first()
-    
-    if not hospital:
-        # Auto-init for demo if not exists
-        pk, sk = BbsMock.generate_keys()
-        hospital = Hospital(
-            id=str(uuid.uuid4()),
-            hospital_id=req.hospital_id,
-            hospital_name=req.hospital_id, # Fallback
-            public_key=pk,
-            private_key_encrypted=sk
-        )
-        db.add(hospital)
-        await db.commit()
-        await db.refresh(hospital)
+    # Auto-init for demo if not exists (hospital_id doubles as the name)
+    hospital = await key_registry.get_or_create(req.hospital_id, req.hospital_id)
 
     # Sign attributes
-    signature = BbsMock.sign(req.attributes, hospital.private_key_encrypted)
+    signature = hospital.sign(req.attributes)
     credential_id = str(uuid.uuid4())
     
     # Audit log (no PII stored, just hash)
@@ -79,15 +64,48 @@ async def issue_credential(req: IssueCredentialRequest, db: AsyncSession = Depen
         attributes_count=len(req.attributes)
     )
     db.add(issued_cred)
-    await db.commit()
-    await db.refresh(issued_cred)
+    await db.commit()   # issued_at comes back from the INSERT (RETURNING)
     
+    return _credential_response(hospital, credential_id, req.credential_type, req.attributes,
+                                signature, issued_cred.issued_at)
+
+@router.post("/issue/batch", response_model=IssueCredentialBatchResponse)
+async def issue_credentials_batch(req: IssueCredentialBatchRequest, db: AsyncSession = Depends(get_db)):
+    """Issue one credential per attribute set, stored with a single bulk insert and commit"""
+    if not req.attributes:
+        raise HTTPException(status_code=400, detail="No attribute sets given")
+    if len(req.attributes) > ISSUE_BATCH_MAX:
+        raise HTTPException(status_code=400, detail=f"At most {ISSUE_BATCH_MAX} credentials per batch")
+    hospital = await key_registry.get_or_create(req.hospital_id, req.hospital_id)
+
+    # The bulk path returns no rows, so ids and issued_at are set here
+    issued_at = datetime.now(timezone.utc)
+    rows, credentials = [], []
+    for attributes in req.attributes:
+        credential_id = str(uuid.uuid4())
+        signature = hospital.sign(attributes)
+        rows.append({
+            "id":               str(uuid.uuid4()),
+            "credential_id":    credential_id,
+            "hospital_id":      hospital.id,
+            "credential_type":  req.credential_type,
+            "credential_hash":  sha256(json.dumps(attributes, sort_keys=True).encode()).hexdigest(),
+            "attributes_count": len(attributes),
+            "issued_at":        issued_at,
+        })
+        credentials.append(_credential_response(hospital, credential_id, req.credential_type, attributes,
+                                                signature, issued_at))
+    await bulk_insert(db, IssuedCredential, rows)
+    await db.commit()
+    return IssueCredentialBatchResponse(count=len(credentials), credentials=credentials)
+
+def _credential_response(hospital, credential_id, credential_type, attributes, signature, issued_at):
     # Generate QR Data
     qr_payload = {
         "id": credential_id,
-        "type": req.credential_type,
+        "type": credential_type,
         "iss": hospital.hospital_id,
-        "data": req.attributes,
+        "data": attributes,
         "sig": signature,
         "pk": hospital.public_key
     }
@@ -97,15 +115,18 @@ async def issue_credential(req: IssueCredentialRequest, db: AsyncSession = Depen
         credential_id=credential_id,
         signature=signature,
         issuer_public_key=hospital.public_key,
-        attributes=req.attributes,
-        issued_at=issued_cred.issued_at,
+        attributes=attributes,
+        issued_at=issued_at,
         qr_code_data=qr_data
     )
 
+@router.get("/keys/metrics")
+async def key_registry_metrics():
+    return key_registry.stats()
+
 @router.get("/{hospital_id}/public-key")
-async def get_public_key(hospital_id: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Hospital).where(Hospital.hospital_id == hospital_id))
-    hospital = result.scalars().first()
+async def get_public_key(hospital_id: str):
+    hospital = await key_registry.get(hospital_id)
     if not hospital:
         raise HTTPException(status_code=404, detail="Hospital not found")
         
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 class HospitalInitRequest(BaseModel):
@@ -23,3 +23,12 @@ class IssueCredentialResponse(BaseModel):
     attributes: Dict[str, Any]
     issued_at: datetime
     qr_code_data: str
+
+class IssueCredentialBatchRequest(BaseModel):
+    hospital_id: str
+    credential_type: str
+    attributes: List[Dict[str, Any]]   # one credential per attribute set
+
+class IssueCredentialBatchResponse(BaseModel):
+    count: int
+    credentials: List[IssueCredentialResponse]
@@ -1,21 +1,161 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.future import select
+from sqlalchemy import case, delete, exists, func, literal_column, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from database.db import get_db
+from database.db import get_db, AsyncSessionLocal
 from database.models import VerificationRequest, VerificationResult
 from .schemas import ProviderRequest, ProviderRequestResponse, VerifyProofRequest, VerifyProofResponse
 from crypto.bbs_mock import BbsMock
+from crypto.predicate_eval import CompiledPredicate, PredicateEvaluator
+from utils.export import stream_export, parse_time_range
+from utils.expiry import ExpiryIndex, ExpirySweeper
+from utils.pubsub import broker, sse_response
+from utils.group_commit import GroupCommitWriter
+from utils.lookup_cache import LRUCache
+from app.config import settings
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional
+import base64
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import json
+import logging
 
+logger = logging.getLogger("provider")
 router = APIRouter()
 
+# Requests nobody answered are purged this long after they expire; answered
+# ones stay because verification_results references them.
+UNANSWERED_RETENTION = timedelta(hours=1)
+
+_purge_index = ExpiryIndex()   # request_id → purge deadline (expires_at + retention)
+
+# Latest result per request, so a terminal that subscribes just after the
+# proof landed still gets it without another DB round-trip.
+RECENT_RESULTS_LIMIT = 10_000
+_recent_results: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+def _publish_result(event: Dict[str, Any]):
+    _recent_results[event["request_id"]] = event
+    _recent_results.move_to_end(event["request_id"])
+    if len(_recent_results) > RECENT_RESULTS_LIMIT:
+        _recent_results.popitem(last=False)
+    broker.publish(f"provider:request:{event['request_id']}", "verification", event)
+    broker.publish(f"provider:{event['provider_id']}", "verification", event)
+
+def _utc(ts: Optional[datetime]) -> Optional[datetime]:
+    """A stored timestamp as aware UTC. Timestamps are written in UTC;
+    Postgres returns them aware, SQLite naive."""
+    return ts if ts is None or ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+# Request metadata, read through on GET /request/{id} and POST /verify (a
+# wallet fetches the request, then submits the proof). Filled on create and
+# on a miss. Rows never change after the INSERT and are purged an hour after
+# they expire, so an entry cannot go stale within the TTL; expiry itself is
+# checked against the cached expires_at.
+REQUEST_CACHE_SIZE = 10_000
+REQUEST_CACHE_TTL  = 300.0
+
+class _CachedRequest(NamedTuple):
+    id: str
+    request_id: str
+    provider_id: str
+    provider_name: str
+    predicate: Dict[str, Any]
+    predicate_human_readable: Optional[str]
+    expires_at: Optional[datetime]
+    matches: Optional[CompiledPredicate]    # None when the predicate cannot be evaluated here
+
+_request_cache = LRUCache(REQUEST_CACHE_SIZE, ttl=REQUEST_CACHE_TTL)
+
+def _cache_request(request: VerificationRequest) -> _CachedRequest:
+    try:
+        matches = PredicateEvaluator.compile(request.predicate)
+    except ValueError:
+        matches = None
+    entry = _CachedRequest(
+        id=request.id,
+        request_id=request.request_id,
+        provider_id=request.provider_id,
+        provider_name=request.provider_name,
+        predicate=request.predicate,
+        predicate_human_readable=request.predicate_human_readable,
+        expires_at=_utc(request.expires_at),
+        matches=matches,
+    )
+    _request_cache.put(request.request_id, entry)
+    return entry
+
+async def _get_request(db: AsyncSession, request_id: str) -> Optional[_CachedRequest]:
+    entry = _request_cache.get(request_id)
+    if entry is None:
+        result = await db.execute(select(VerificationRequest).where(VerificationRequest.request_id == request_id))
+        request = result.scalars().first()
+        if request is None:
+            return None
+        entry = _cache_request(request)
+    return entry
+
+def _is_expired(request) -> bool:
+    return request.expires_at is not None and _utc(request.expires_at) <= datetime.now(timezone.utc)
+
+async def _purge_unanswered(request_ids: List[str]):
+    """Delete a batch of expired, unanswered requests in one statement"""
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            delete(VerificationRequest)
+            .where(VerificationRequest.request_id.in_(request_ids))
+            .where(~exists().where(VerificationResult.request_id == VerificationRequest.id))
+        )
+        await session.commit()
+    for request_id in request_ids:
+        _request_cache.pop(request_id)
+
+_purge_sweeper = ExpirySweeper("provider-requests", _purge_index, _purge_unanswered, max_sleep=30.0)
+
+# Result rows go through the group-commit writer (VERIFICATION_WRITE_MODE)
+_result_writer = GroupCommitWriter(
+    "provider-results",
+    AsyncSessionLocal,
+    mode=settings.VERIFICATION_WRITE_MODE,
+    batch_size=settings.VERIFICATION_BATCH_SIZE,
+    linger=settings.VERIFICATION_FLUSH_MS / 1000,
+)
+
+@router.on_event("startup")
+async def _start_purge_sweeper():
+    # The heap is in-process, so rebuild it: drop everything already past
+    # retention in bulk, then schedule the still-recent unanswered requests.
+    cutoff = datetime.now(timezone.utc) - UNANSWERED_RETENTION
+    unanswered = ~exists().where(VerificationResult.request_id == VerificationRequest.id)
+    try:
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                delete(VerificationRequest).where(VerificationRequest.expires_at < cutoff).where(unanswered)
+            )
+            await session.commit()
+            rows = await session.execute(
+                select(VerificationRequest.request_id, VerificationRequest.expires_at).where(unanswered)
+            )
+            for request_id, expires_at in rows:
+                if expires_at is not None:
+                    _purge_index.schedule(request_id, (_utc(expires_at) + UNANSWERED_RETENTION).timestamp())
+    except Exception as exc:
+        logger.warning(f"Request purge backfill skipped: {exc}")
+    _purge_sweeper.start()
+    if _result_writer.mode != "direct":
+        _result_writer.start()
+
+@router.on_event("shutdown")
+async def _stop_purge_sweeper():
+    await _purge_sweeper.stop()
+    await _result_writer.stop()     # commits whatever is still queued
+
 @router.post("/request", response_model=ProviderRequestResponse)
 async def create_verification_request(req: ProviderRequest, db: AsyncSession = Depends(get_db)):
     """Provider (Pharmacy/Insurance) creates a proof request"""
     req_id = f"req_{uuid.uuid4().hex[:8]}"
-    expires = datetime.now() + timedelta(minutes=15)
+    expires = datetime.now(timezone.utc) + timedelta(minutes=15)
     
     # Simple human readable generator (for demo)
     desc = "Proof Request"
@@ -34,8 +174,9 @@ async def create_verification_request(req: ProviderRequest, db: AsyncSession = D
         expires_at=expires
     )
     db.add(request)
-    await db.commit()
-    await db.refresh(request)
+    await db.commit()   # created_at comes back from the INSERT (RETURNING)
+    _purge_index.schedule(req_id, (expires + UNANSWERED_RETENTION).timestamp())
+    _cache_request(request)
     
     qr_data = f"mediguard://verify?req={req_id}&provider={req.provider_id}"
     
@@ -50,10 +191,11 @@ async def create_verification_request(req: ProviderRequest, db: AsyncSession = D
 
 @router.get("/request/{request_id}")
 async def get_request(request_id: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(VerificationRequest).where(VerificationRequest.request_id == request_id))
-    req = result.scalars().first()
+    req = await _get_request(db, request_id)
     if not req:
         raise HTTPException(status_code=404, detail="Request not found")
+    if _is_expired(req):
+        raise HTTPException(status_code=410, detail="Request expired")
         
     return {
         "request_id": req.request_id,
@@ -65,16 +207,26 @@ async def get_request(request_id: str, db: AsyncSession = Depends(get_db)):
 @router.post("/verify", response_model=VerifyProofResponse)
 async def verify_proof(req: VerifyProofRequest, db: AsyncSession = Depends(get_db)):
     """Verify the submitted ZK proof"""
-    # 1. Fetch request to get predicate
-    result = await db.execute(select(VerificationRequest).where(VerificationRequest.request_id == req.request_id))
-    request = result.scalars().first()
+    # 1. Fetch request to get predicate (usually cached by the wallet's GET)
+    request = await _get_request(db, req.request_id)
     
     if not request:
         raise HTTPException(status_code=404, detail="Request expired or not found")
+    if _is_expired(request):
+        raise HTTPException(status_code=410, detail="Request expired")
+    # Give the connection back before waiting on the result writer
+    await db.close()
         
     # 2. Verify Proof (Crypto)
     # Using mock for now, replace with actual BBS verify
     verified = BbsMock.verify_proof(req.proof, req.issuer_public_key, req.revealed_attributes)
+    error_code = None
+    # Disclosed attributes must satisfy the predicate as well (nothing to
+    # check when the proof reveals none of them)
+    matches = request.matches
+    if verified and matches is not None and matches.attributes <= req.revealed_attributes.keys():
+        if not matches(req.revealed_attributes):
+            verified, error_code = False, "PREDICATE_NOT_SATISFIED"
     
     # 3. Log Result
     ver_id = f"ver_{uuid.uuid4().hex[:8]}"
@@ -85,39 +237,253 @@ async def verify_proof(req: VerifyProofRequest, db: AsyncSession = Depends(get_d
         request_id=request.id,
         provider_id=request.provider_id,
         verified=verified,
+        error_code=error_code,
         proof_hash=uuid.uuid4().hex # Randomize to simulate unlinkability (different proof per request)
     )
-    db.add(res)
-    await db.commit()
+    await _result_writer.write(res)
+    _purge_index.cancel(request.request_id)
+
+    timestamp = datetime.now(timezone.utc)
+    _publish_result({
+        "request_id": req.request_id,
+        "verification_id": ver_id,
+        "provider_id": request.provider_id,
+        "verified": verified,
+        "predicate": request.predicate_human_readable,
+        "timestamp": timestamp.isoformat(),
+    })
     
     return VerifyProofResponse(
         verified=verified,
         request_id=req.request_id,
         verification_id=ver_id,
         provider_id=request.provider_id,
-        timestamp=datetime.now()
+        timestamp=timestamp
     )
 
-@router.get("/{provider_id}/audit")
-async def get_audit_log(provider_id: str, db: AsyncSession = Depends(get_db)):
-    """Get verification history for a provider"""
-    # Join results with requests
-    query = select(VerificationResult, VerificationRequest).join(
+@router.get("/results/metrics")
+async def result_writer_metrics():
+    return _result_writer.stats()
+
+@router.get("/requests/metrics")
+async def request_cache_metrics():
+    return _request_cache.stats()
+
+AUDIT_PAGE_SIZE = 100
+AUDIT_MAX_PAGE_SIZE = 1000
+# Summary buckets: SQLite strftime formats; Postgres uses date_trunc(<name>)
+AUDIT_BUCKETS = {"minute": "%Y-%m-%d %H:%M:00", "hour": "%Y-%m-%d %H:00:00", "day": "%Y-%m-%d 00:00:00"}
+
+def _encode_cursor(verified_at: datetime, result_id: str) -> str:
+    return base64.urlsafe_b64encode(f"{verified_at.isoformat()}|{result_id}".encode()).decode().rstrip("=")
+
+def _decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        ts, result_id = raw.split("|", 1)
+        return datetime.fromisoformat(ts), result_id
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _audit_query(
+    provider_id: str,
+    cursor:      Optional[str] = None,
+    since:       Optional[datetime] = None,
+    limit:       int = AUDIT_PAGE_SIZE,
+):
+    """
+    One page, newest first, in (verified_at, id) order. `cursor` continues
+    after the last row of the previous page. Served by
+    ix_verification_results_provider_id_verified_at_id without a sort.
+    """
+    query = select(
+        VerificationResult.id,
+        VerificationResult.verification_id,
+        VerificationResult.verified,
+        VerificationResult.verified_at,
+        VerificationRequest.predicate_human_readable,
+    ).join(
         VerificationRequest, VerificationResult.request_id == VerificationRequest.id
-    ).where(VerificationResult.provider_id == provider_id).order_by(VerificationResult.verified_at.desc())
-    
-    result = await db.execute(query)
-    rows = result.all()
-    
+    ).where(VerificationResult.provider_id == provider_id)
+    if since is not None:
+        query = query.where(VerificationResult.verified_at >= since)
+    if cursor:
+        # A plain tuple on the right binds with the columns' types
+        query = query.where(tuple_(VerificationResult.verified_at, VerificationResult.id) < _decode_cursor(cursor))
+    return query.order_by(VerificationResult.verified_at.desc(), VerificationResult.id.desc()).limit(limit)
+
+@router.get("/{provider_id}/audit")
+async def get_audit_log(
+    provider_id: str,
+    limit:  int = Query(AUDIT_PAGE_SIZE, ge=1, le=AUDIT_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    since:  Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get verification history for a provider, one page at a time (newest first).
+
+    Pass `next_cursor` back as `cursor` for the next, older page. For
+    incremental polling pass the previous response's `newest` as `since`.
+    `since` is inclusive and timestamps have one-second resolution, so
+    de-duplicate on verification_id. Use /audit/export to stream everything
+    and /audit/summary for counts.
+    """
+    since_ts, _ = parse_time_range(since, None)
+    rows = (await db.execute(_audit_query(provider_id, cursor, since_ts, limit))).all()
+    next_cursor = _encode_cursor(rows[-1].verified_at, rows[-1].id) if len(rows) == limit else None
+
     return {
-        "total": len(rows),
+        "count": len(rows),
+        "next_cursor": next_cursor,
+        "newest": rows[0].verified_at if rows else since,
         "verifications": [
             {
-                "verification_id": row[0].verification_id,
-                "verified": row[0].verified,
-                "predicate": row[1].predicate_human_readable,
-                "timestamp": row[0].verified_at
+                "verification_id": row.verification_id,
+                "verified": row.verified,
+                "predicate": row.predicate_human_readable,
+                "timestamp": row.verified_at
             }
             for row in rows
         ]
     }
+
+def _audit_bucket(dialect: str, bucket: str):
+    if dialect == "sqlite":
+        return func.strftime(AUDIT_BUCKETS[bucket], VerificationResult.verified_at)
+    # Inlined (bucket is one of AUDIT_BUCKETS): with a bound parameter Postgres
+    # would not match the SELECT expression to the GROUP BY one
+    return func.date_trunc(literal_column(f"'{bucket}'"), VerificationResult.verified_at)
+
+def _audit_summary_queries(
+    provider_id: str,
+    dialect:     str,
+    bucket:      str = "hour",
+    buckets:     int = 48,
+    since:       Optional[datetime] = None,
+    until:       Optional[datetime] = None,
+):
+    """(totals, per-bucket counts newest first) for one provider, aggregated in SQL."""
+    verified_count = func.sum(case((VerificationResult.verified, 1), else_=0))
+    conditions = [VerificationResult.provider_id == provider_id]
+    if since is not None:
+        conditions.append(VerificationResult.verified_at >= since)
+    if until is not None:
+        conditions.append(VerificationResult.verified_at <= until)
+    totals = select(func.count(), verified_count).where(*conditions)
+    start = _audit_bucket(dialect, bucket).label("start")
+    per_bucket = (
+        select(start, func.count(), verified_count)
+        .where(*conditions)
+        .group_by(start)
+        .order_by(start.desc())
+        .limit(buckets)
+    )
+    return totals, per_bucket
+
+@router.get("/{provider_id}/audit/summary")
+async def get_audit_summary(
+    provider_id: str,
+    bucket:  str = Query("hour", pattern="^(minute|hour|day)$"),
+    buckets: int = Query(48, ge=1, le=1000),
+    since:   Optional[str] = None,
+    until:   Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """Verification counts by result, overall and for the newest `buckets` time buckets"""
+    since_ts, until_ts = parse_time_range(since, until)
+    totals, per_bucket = _audit_summary_queries(provider_id, db.bind.dialect.name, bucket, buckets, since_ts, until_ts)
+    total, verified = (await db.execute(totals)).one()
+    rows = (await db.execute(per_bucket)).all()
+    total, verified = total or 0, verified or 0
+
+    return {
+        "provider_id": provider_id,
+        "bucket": bucket,
+        "total": total,
+        "verified": verified,
+        "failed": total - verified,
+        "buckets": [
+            {"start": start, "total": count, "verified": ok, "failed": count - ok}
+            for start, count, ok in rows
+        ],
+    }
+
+AUDIT_EXPORT_COLUMNS = ["verification_id", "request_id", "verified", "predicate", "error_code", "timestamp"]
+
+@router.get("/{provider_id}/audit/export")
+async def export_audit_log(
+    provider_id: str,
+    fmt: str = Query("ndjson", alias="format"),
+    gzip: bool = False,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    verified: Optional[bool] = None,
+):
+    """Stream a provider's verification history without materialising it in memory"""
+    since_ts, until_ts = parse_time_range(since, until)
+
+    query = select(VerificationResult, VerificationRequest).join(
+        VerificationRequest, VerificationResult.request_id == VerificationRequest.id
+    ).where(VerificationResult.provider_id == provider_id)
+    if since_ts:
+        query = query.where(VerificationResult.verified_at >= since_ts)
+    if until_ts:
+        query = query.where(VerificationResult.verified_at <= until_ts)
+    if verified is not None:
+        query = query.where(VerificationResult.verified == verified)
+    query = query.order_by(VerificationResult.verified_at.desc()).execution_options(yield_per=500)
+
+    async def _rows():
+        # The request-scoped session is closed before the body streams, so own one here
+        async with AsyncSessionLocal() as session:
+            result = await session.stream(query)
+            async for res, request in result:
+                yield {
+                    "verification_id": res.verification_id,
+                    "request_id": request.request_id,
+                    "verified": res.verified,
+                    "predicate": request.predicate_human_readable,
+                    "error_code": res.error_code,
+                    "timestamp": res.verified_at,
+                }
+
+    return stream_export(_rows(), fmt, f"provider-{provider_id}-audit", AUDIT_EXPORT_COLUMNS, gzip)
+
+@router.get("/request/{request_id}/events")
+async def stream_request_result(request_id: str, db: AsyncSession = Depends(get_db)):
+    """Server-sent events: pushes the verification result for one request, then closes"""
+    snapshot = _recent_results.get(request_id)
+    if snapshot is None:
+        result = await db.execute(
+            select(VerificationRequest, VerificationResult)
+            .outerjoin(VerificationResult, VerificationResult.request_id == VerificationRequest.id)
+            .where(VerificationRequest.request_id == request_id)
+            .order_by(VerificationResult.verified_at.desc())
+            .limit(1)
+        )
+        row = result.first()
+        if not row:
+            raise HTTPException(status_code=404, detail="Request not found")
+        request, res = row
+        if res is not None:
+            snapshot = {
+                "request_id": request.request_id,
+                "verification_id": res.verification_id,
+                "provider_id": request.provider_id,
+                "verified": res.verified,
+                "predicate": request.predicate_human_readable,
+                "timestamp": res.verified_at.isoformat() if res.verified_at else None,
+            }
+
+    return sse_response(
+        f"provider:request:{request_id}",
+        event="verification",
+        snapshot=lambda: _recent_results.get(request_id) or snapshot,
+        is_final=lambda event: True,
+    )
+
+@router.get("/{provider_id}/events")
+async def stream_provider_events(provider_id: str):
+    """Server-sent events: every verification completed for this provider"""
+    return sse_response(f"provider:{provider_id}", event="verification")
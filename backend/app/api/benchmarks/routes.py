@@ -5,7 +5,8 @@ Always returns HTTP 200 — never propagates 500 to the client.
 """
 
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+
+from utils.fast_json import FastJSONResponse
 
 router = APIRouter()
 
@@ -24,8 +25,8 @@ async def get_benchmarks():
     """
     try:
         from benchmarks.benchmark_service import engine as benchmark_engine
-        data = await benchmark_engine.get_snapshot()
-        return JSONResponse(content=data)
+        data = await benchmark_engine.get_snapshot(encoded=True)
+        return FastJSONResponse(content=data)
     except Exception as exc:
         # Last-resort fallback — never let a 500 reach the client
         import random
@@ -38,7 +39,7 @@ async def get_benchmarks():
             {"time": now.strftime("%H:%M:%S"), "value": round(random.uniform(80, 240), 1), "users": random.randint(3, 20)}
             for _ in range(6)
         ]
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "proofGenTime":     round(random.uniform(115, 140), 1),
             "verificationTime": round(random.uniform(70, 90), 1),
             "proofSize":        random.randint(350, 420),
@@ -5,27 +5,50 @@ GET  /api/issuer/issued — return all issued credentials (newest first)
 GET  /api/issuer/issued/{credential_id} — return one credential
 DELETE /api/issuer/issued/{credential_id} — revoke a credential
 GET  /api/issuer/stats  — aggregate stats for the dashboard
+GET  /api/issuer/export — stream issued credentials as NDJSON / CSV (optionally gzip)
+GET  /api/issuer/status-list/{issuer_id}         — gzip'd revocation bitstring (ETag-cacheable)
+GET  /api/issuer/status-list/{issuer_id}/raw     — same bitstring as raw application/gzip bytes
+GET  /api/issuer/status-list/{issuer_id}/diff    — revocations changed since a list version
+GET  /api/issuer/status-list/{issuer_id}/{index} — O(1) revocation check of one credential
 """
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response
 from pydantic import BaseModel
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any
 from datetime import datetime, timezone
 import uuid
 import hashlib
 import json
 import logging
 
+from utils.export import stream_export, parse_time_range, iter_time_window
+from utils.status_list import status_lists
+from utils.conditional import versions, conditional_json, etag_matches
+from utils.records import Record, record_dict
+from utils.fast_json import FastJSONResponse, Fragment, encode, dumps
+from utils.compression import precompressed
+from utils.lookup_cache import LRUCache
+from app.store import store
+
 logger = logging.getLogger("issuer")
 router = APIRouter()
 
 # ---------------------------------------------------------------------------
-# In-memory credential store (persists for the lifetime of the server process)
-# Replacing with a database is as simple as swapping this list for ORM calls.
+# Credential store: credential_id → credential, in issue order. In-memory per
+# process by default; STORE_BACKEND=sqlite|shm shares it between workers
+# (records are then copies — write them back after changing them).
 # ---------------------------------------------------------------------------
 
-_credential_store: List[Dict[str, Any]] = []
+_credential_store = store.table("issuer_credentials")
+
+DEFAULT_ISSUER_ID = "privaseal-hospital-001"
+
+# Encoded JSON of listed credentials, keyed by (id, status). Revocation is
+# the only change a credential ever sees, so a key never goes stale — even
+# when another worker revoked it.
+ISSUED_JSON_CACHE_SIZE = 10_000
+_issued_json = LRUCache(ISSUED_JSON_CACHE_SIZE)
 
 
 # ---------------------------------------------------------------------------
@@ -34,7 +57,7 @@ _credential_store: List[Dict[str, Any]] = []
 
 class IssueCredentialRequest(BaseModel):
     credential_type: str          # vaccination | prescription | age_verification
-    issuer_id:       Optional[str] = "privaseal-hospital-001"
+    issuer_id:       Optional[str] = DEFAULT_ISSUER_ID
     attributes:      Dict[str, Any] = {}
 
 
@@ -42,10 +65,53 @@ class RevokeRequest(BaseModel):
     reason: Optional[str] = "Revoked by issuer"
 
 
+# ---------------------------------------------------------------------------
+# Stored record
+# ---------------------------------------------------------------------------
+
+_DISPLAY_FIELDS = (
+    "aadhaar", "state", "gender", "vaccineType", "manufacturer", "dateAdministered",
+    "doseNumber", "medication", "dosageInstructions", "prescribedBy",
+)
+
+
+class IssuerCredential(Record):
+    """
+    Issued credential. Display fields the attributes did not provide stay
+    unset and read as "—"; typeLabel and statusListCredential are derived.
+    """
+    KEYS = (
+        "id", "type", "typeLabel", "issuerId", "name", "dob", *_DISPLAY_FIELDS,
+        "issuedAt", "status", "attrHash", "attributeCount",
+        "statusListIndex", "statusListCredential", "revokedAt", "revokeReason",
+    )
+    DEFAULTS = {"name": "—", "dob": "—", **{k: "—" for k in _DISPLAY_FIELDS}}
+    CODES = ("type", "issuerId", "status")
+    __slots__ = tuple(k for k in KEYS if k not in ("typeLabel", "statusListCredential"))
+
+    @property
+    def typeLabel(self) -> str:
+        return CREDENTIAL_TYPE_LABELS.get(self.type, self.type)
+
+    @property
+    def statusListCredential(self) -> str:
+        return f"/api/issuer/status-list/{self.issuerId}"
+
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
+EXPORT_COLUMNS = [
+    "id", "type", "typeLabel", "issuerId", "name", "dob", "state", "gender",
+    "vaccineType", "manufacturer", "dateAdministered", "doseNumber",
+    "medication", "dosageInstructions", "prescribedBy",
+    "issuedAt", "status", "revokedAt", "revokeReason", "attrHash", "attributeCount",
+    "statusListIndex",
+]
+
+STATUS_LIST_CACHE_CONTROL = "public, max-age=60, must-revalidate"
+
 CREDENTIAL_TYPE_LABELS = {
     "vaccination":       "Vaccination Record",
     "prescription":      "Medical Prescription",
@@ -53,56 +119,64 @@ CREDENTIAL_TYPE_LABELS = {
 }
 
 
-def _make_credential(req: IssueCredentialRequest) -> Dict[str, Any]:
+def _make_credential(req: IssueCredentialRequest) -> IssuerCredential:
     """Build a full credential record from an issue request."""
     cred_id   = str(uuid.uuid4())
     attrs     = req.attributes
     now       = datetime.now(timezone.utc).isoformat()
+    issuer_id = req.issuer_id or DEFAULT_ISSUER_ID
 
     # Privacy-preserving hash (no PII in the log — only the hash)
     attr_hash = hashlib.sha256(
         json.dumps(attrs, sort_keys=True).encode()
     ).hexdigest()[:16]
 
-    # Derive display-friendly fields from attrs with sensible fallbacks
-    name = (
-        attrs.get("patient_name")
-        or attrs.get("full_name")
-        or attrs.get("name")
-        or "—"
-    )
-    dob = (
-        attrs.get("date_of_birth")
-        or attrs.get("dob")
-        or "—"
+    cred = IssuerCredential(
+        id              = cred_id,
+        type            = req.credential_type,
+        issuerId        = issuer_id,
+        issuedAt        = now,
+        status          = "Active",
+        attrHash        = attr_hash,
+        attributeCount  = len(attrs),
+        # Revocation status list entry (bit index in the issuer's bitstring)
+        statusListIndex = status_lists.get_or_create(issuer_id).allocate(),
     )
 
-    return {
-        "id":              cred_id,
-        "type":            req.credential_type,
-        "typeLabel":       CREDENTIAL_TYPE_LABELS.get(req.credential_type, req.credential_type),
-        "issuerId":        req.issuer_id,
-        # Display fields (derived from attributes)
-        "name":            name,
-        "dob":             dob,
-        "aadhaar":         attrs.get("aadhaar_number", "—"),
-        "state":           attrs.get("state", "—"),
-        "gender":          attrs.get("gender", "—"),
+    # Display fields (derived from attributes); missing ones read as "—"
+    name = attrs.get("patient_name") or attrs.get("full_name") or attrs.get("name")
+    dob  = attrs.get("date_of_birth") or attrs.get("dob")
+    if name:
+        cred["name"] = name
+    if dob:
+        cred["dob"] = dob
+    for key, attr in (
+        ("aadhaar",            "aadhaar_number"),
+        ("state",              "state"),
+        ("gender",             "gender"),
         # Vaccination-specific
-        "vaccineType":     attrs.get("vaccine_type", "—"),
-        "manufacturer":    attrs.get("manufacturer", "—"),
-        "dateAdministered":attrs.get("date_administered", "—"),
-        "doseNumber":      attrs.get("dose_number", "—"),
+        ("vaccineType",        "vaccine_type"),
+        ("manufacturer",       "manufacturer"),
+        ("dateAdministered",   "date_administered"),
+        ("doseNumber",         "dose_number"),
         # Prescription-specific
-        "medication":      attrs.get("medication", "—"),
-        "dosageInstructions": attrs.get("dosage_instructions", "—"),
-        "prescribedBy":    attrs.get("prescribing_doctor", "—"),
-        # Metadata
-        "issuedAt":        now,
-        "status":          "Active",
-        "attrHash":        attr_hash,
-        "attributeCount":  len(attrs),
-    }
+        ("medication",         "medication"),
+        ("dosageInstructions", "dosage_instructions"),
+        ("prescribedBy",       "prescribing_doctor"),
+    ):
+        if attr in attrs:
+            cred[key] = attrs[attr]
+    return cred
+
+
+def _credential_json(cred: Record) -> Fragment:
+    """Pre-encoded credential for list responses, encoded once per status."""
+    key = (cred["id"], cred["status"])
+    fragment = _issued_json.get(key)
+    if fragment is None:
+        fragment = encode(cred)
+        _issued_json.put(key, fragment)
+    return fragment
 
 
 # ---------------------------------------------------------------------------
@@ -131,11 +205,12 @@ async def issue_credential(req: IssueCredentialRequest):
     """
     try:
         cred = _make_credential(req)
-        _credential_store.append(cred)          # ← push, never overwrite
+        _credential_store[cred["id"]] = cred    # ← new key, never overwrite
+        versions.bump("issuer:stats")
         logger.info(f"Credential issued: {cred['id']} type={cred['type']}")
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "success":    True,
-            "credential": cred,
+            "credential": record_dict(cred),
             "message":    f"{cred['typeLabel']} issued successfully.",
         })
     except Exception as exc:
@@ -154,7 +229,7 @@ async def get_issued_credentials(
     Return all issued credentials, newest first.
     Supports optional search (by name) and type filter.
     """
-    results = list(reversed(_credential_store))
+    results = list(reversed(_credential_store.values()))
 
     # Filter by type
     if type_filter and type_filter != "all":
@@ -174,8 +249,8 @@ async def get_issued_credentials(
     start = (page - 1) * per_page
     page_data = results[start: start + per_page]
 
-    return JSONResponse(content={
-        "data":       page_data,
+    return FastJSONResponse(content={
+        "data":       [_credential_json(c) for c in page_data],
         "total":      total,
         "page":       page,
         "per_page":   per_page,
@@ -186,36 +261,161 @@ async def get_issued_credentials(
 @router.get("/issued/{credential_id}")
 async def get_single_credential(credential_id: str):
     """Fetch a single credential by its UUID."""
-    for cred in _credential_store:
-        if cred["id"] == credential_id:
-            return JSONResponse(content={"credential": cred})
-    raise HTTPException(status_code=404, detail="Credential not found")
+    cred = _credential_store.get(credential_id)
+    if cred is None:
+        raise HTTPException(status_code=404, detail="Credential not found")
+    return FastJSONResponse(content={"credential": record_dict(cred)})
 
 
 @router.delete("/issued/{credential_id}")
 async def revoke_credential(credential_id: str, body: RevokeRequest = RevokeRequest()):
     """Revoke (soft-delete) a credential by setting its status to Revoked."""
-    for cred in _credential_store:
-        if cred["id"] == credential_id:
-            if cred["status"] == "Revoked":
-                raise HTTPException(status_code=409, detail="Already revoked")
-            cred["status"] = "Revoked"
-            cred["revokedAt"] = datetime.now(timezone.utc).isoformat()
-            cred["revokeReason"] = body.reason
-            logger.info(f"Credential revoked: {credential_id}")
-            return JSONResponse(content={"success": True, "credential": cred})
-    raise HTTPException(status_code=404, detail="Credential not found")
+    cred = _credential_store.get(credential_id)
+    if cred is None:
+        raise HTTPException(status_code=404, detail="Credential not found")
+    if cred["status"] == "Revoked":
+        raise HTTPException(status_code=409, detail="Already revoked")
+    cred["status"] = "Revoked"
+    cred["revokedAt"] = datetime.now(timezone.utc).isoformat()
+    cred["revokeReason"] = body.reason
+    _credential_store[credential_id] = cred
+    if "statusListIndex" in cred:
+        status_lists.get_or_create(cred["issuerId"]).set_revoked(cred["statusListIndex"])
+    versions.bump("issuer:stats")
+    logger.info(f"Credential revoked: {credential_id}")
+    return FastJSONResponse(content={"success": True, "credential": record_dict(cred)})
 
 
 @router.get("/stats")
-async def get_issuer_stats():
-    """Aggregate stats for the dashboard cards."""
-    total  = len(_credential_store)
-    active = sum(1 for c in _credential_store if c["status"] == "Active")
-    types  = len({c["type"] for c in _credential_store})
-    return JSONResponse(content={
-        "totalIssued":       total,
-        "activeCredentials": active,
-        "activePercent":     round((active / total * 100) if total else 0, 1),
-        "typesSupported":    max(types, 3),
+async def get_issuer_stats(request: Request, wait: float = 0):
+    """
+    Aggregate stats for the dashboard cards.
+    ETag-versioned: If-None-Match gets a 304 on no change, ?wait=N long-polls.
+    """
+    def _build():
+        creds  = _credential_store.values()
+        total  = len(creds)
+        active = sum(1 for c in creds if c["status"] == "Active")
+        types  = len({c["type"] for c in creds})
+        return {
+            "totalIssued":       total,
+            "activeCredentials": active,
+            "activePercent":     round((active / total * 100) if total else 0, 1),
+            "typesSupported":    max(types, 3),
+        }
+
+    return await conditional_json(request, "issuer:stats", _build, wait)
+
+
+@router.get("/export")
+async def export_issued_credentials(
+    fmt:         str = Query("ndjson", alias="format"),
+    gzip:        bool = False,
+    since:       Optional[str] = None,
+    until:       Optional[str] = None,
+    type_filter: Optional[str] = None,
+    status:      Optional[str] = None,
+    issuer_id:   Optional[str] = None,
+):
+    """
+    Stream issued credentials newest-first as NDJSON or CSV.
+    Rows are filtered lazily, so memory use does not grow with the store.
+    """
+    since_ts, until_ts = parse_time_range(since, until)
+
+    # Read lazily, newest first, a batch at a time: issues may resize the
+    # store mid-stream, and shared backends decode only what is sent
+    creds = _credential_store.iter_newest()
+
+    def _rows():
+        for cred in iter_time_window(creds, "issuedAt", since_ts, until_ts):
+            if type_filter and type_filter != "all" and cred["type"] != type_filter:
+                continue
+            if status and status != "all" and cred["status"] != status:
+                continue
+            if issuer_id and cred["issuerId"] != issuer_id:
+                continue
+            yield cred
+
+    return stream_export(_rows(), fmt, "issued-credentials", EXPORT_COLUMNS, gzip)
+
+
+# ---------------------------------------------------------------------------
+# Revocation status lists
+# ---------------------------------------------------------------------------
+
+def _get_status_list(issuer_id: str):
+    status_list = status_lists.get(issuer_id)
+    if status_list is None:
+        raise HTTPException(status_code=404, detail="Status list not found")
+    return status_list
+
+
+@router.get("/status-list/{issuer_id}")
+async def get_status_list(issuer_id: str, request: Request):
+    """
+    Publish the issuer's revocation bitstring as a StatusList2021-style document.
+    The gzip'd list and the compressed document are cached per version;
+    unchanged lists answer 304.
+    """
+    status_list = _get_status_list(issuer_id)
+    _, etag = status_list.encoded()
+    headers = {"ETag": etag, "Cache-Control": STATUS_LIST_CACHE_CONTROL}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    body = dumps({
+        "id":            f"/api/issuer/status-list/{issuer_id}",
+        "type":          "StatusList2021",
+        "statusPurpose": "revocation",
+        "issuer":        issuer_id,
+        "version":       status_list.version,
+        "size":          status_list.capacity,
+        "encodedList":   status_list.encoded_list(),
+    })
+    return await precompressed.response(request, body, etag, "application/json", headers)
+
+
+@router.get("/status-list/{issuer_id}/raw")
+async def get_status_list_raw(issuer_id: str, request: Request):
+    """Raw gzip'd bitstring for terminals that keep the list as a binary blob."""
+    status_list = _get_status_list(issuer_id)
+    gz, etag = status_list.encoded()
+    headers = {
+        "ETag":             etag,
+        "Cache-Control":    STATUS_LIST_CACHE_CONTROL,
+        "X-Status-Version": str(status_list.version),
+    }
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=gz, media_type="application/gzip", headers=headers)
+
+
+@router.get("/status-list/{issuer_id}/diff")
+async def get_status_list_diff(issuer_id: str, since: int = 0):
+    """
+    Revocation changes after list version `since`.
+    `full_resync: true` means the journal no longer covers that version.
+    """
+    status_list = _get_status_list(issuer_id)
+    changes = status_list.diff(since)
+    return FastJSONResponse(content={
+        "issuer":      issuer_id,
+        "since":       since,
+        "version":     status_list.version,
+        "size":        status_list.capacity,
+        "full_resync": changes is None,
+        "changes":     [{"index": i, "revoked": r} for i, r in (changes or [])],
+    })
+
+
+@router.get("/status-list/{issuer_id}/{index}")
+async def check_revocation(issuer_id: str, index: int):
+    """Single bit test — no credential record is touched."""
+    status_list = _get_status_list(issuer_id)
+    return FastJSONResponse(content={
+        "issuer":  issuer_id,
+        "index":   index,
+        "revoked": status_list.is_revoked(index),
+        "version": status_list.version,
     })
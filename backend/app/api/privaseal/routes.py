@@ -10,6 +10,7 @@ Routes (all mounted at /api/privaseal):
   POST /user/firebase-sync           upsert user from Firebase JWT (NEW)
   GET  /user/firebase/{uid}          fetch backend profile by Firebase UID (NEW)
   POST /user/upload-documents        upload front/back/selfie images (base64)
+  POST /user/upload-documents/multipart  same, streamed as multipart/form-data
   POST /user/request                 submit verification request (docs REQUIRED)
   GET  /user/{user_id}/status        check status + credential
   GET  /user/{user_id}/credential    fetch full credential
@@ -17,35 +18,103 @@ Routes (all mounted at /api/privaseal):
   ADMIN
   -----
   GET  /admin/requests               list (filterable, paginated)
-  GET  /admin/requests/{id}          full detail incl. doc images (admin only)
+  GET  /admin/requests/{id}          full detail incl. doc image URLs (admin only)
+  GET  /admin/requests/{id}/documents/{side}  stream one document image from the blob store
+  GET  /admin/requests/{id}/documents/{side}/thumbnail  downscaled JPEG for review
   POST /admin/approve/{id}           approve → issue PrivaSeal ID + QR
   POST /admin/reject/{id}            reject with reason
   POST /admin/request-reupload/{id}  ask user to resubmit documents
+  POST /admin/revoke/{privaseal_id}  revoke an issued credential (flips its status-list bit)
 
   VERIFIER
   --------
   POST /verifier/check               lookup by PrivaSeal ID or QR URI
   GET  /verifier/stats               aggregate counts
+  GET  /verifier/metrics             check-path cache and ID-filter counters
+  GET  /verifier/id-filter           Bloom filter of issued PrivaSeal IDs (ETag-cacheable)
 
   SHARED
   ------
   GET  /audit                        full audit log
+  GET  /audit/metrics                audit writer queue / log counters
+  GET  /audit/export                 stream audit log as NDJSON / CSV (optionally gzip)
   GET  /stats                        platform-wide counters
+
+/user/{user_id}/status and the /stats endpoints are ETag-versioned:
+If-None-Match returns 304 when nothing changed, ?wait=N long-polls.
 """
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, Response
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Mapping
 from datetime import datetime, timezone
-import uuid, hashlib, logging, random, string
+from types import MappingProxyType
+from urllib.parse import unquote_plus
+import uuid, hashlib, logging, random, string, base64, binascii, os, re
+
+from app.config import settings
+
+from utils.export import stream_export, parse_time_range
+from utils.status_list import status_lists
+from utils.conditional import versions, conditional_json, etag_matches
+from utils.blob_store import BlobStore
+from utils.streaming_upload import StreamingUpload
+from utils.thumbnails import ThumbnailCache, ThumbnailWorker
+from utils.segment_log import SegmentLog
+from utils.audit_writer import AuditWriter
+from utils.store_journal import StoreJournal
+from utils.lookup_cache import LRUCache
+from utils.bloom_filter import BloomFilter
+from utils.records import Record
+from utils.fast_json import FastJSONResponse
+from utils.compression import precompressed
+from app.store import store
 
 logger = logging.getLogger("privaseal")
 router = APIRouter()
 
-# ── In-memory stores ──────────────────────────────────────────────────────────
+# ── Stored records ────────────────────────────────────────────────────────────
+# Slotted mapping records (utils.records): the same record["key"] access as
+# the dicts they replace, a fraction of the memory per record.
+
+class PrivaSealRequest(Record):
+    KEYS = (
+        "id", "user_id", "user_name", "user_email", "doc_type", "_doc_hash",
+        "_front_blob", "_back_blob", "_selfie_blob", "status", "submitted_at",
+        "reviewed_at", "admin_id", "reject_reason", "reupload_reason", "privaseal_id",
+    )
+    DEFAULTS = {k: None for k in ("_back_blob", "reviewed_at", "admin_id",
+                                  "reject_reason", "reupload_reason", "privaseal_id")}
+    CODES = ("doc_type", "status", "admin_id")
+    __slots__ = KEYS
+
+class PrivaSealCredential(Record):
+    """qrUri and statusListCredential are derived, not stored."""
+    KEYS = (
+        "privasealId", "userId", "fullName", "ageVerified", "_identityHash", "issuedAt",
+        "expiresAt", "qrUri", "status", "statusListIndex", "statusListCredential",
+        "revokedAt", "revokeReason",
+    )
+    DEFAULTS = {"expiresAt": None}
+    CODES = ("status",)
+    __slots__ = tuple(k for k in KEYS if k not in ("qrUri", "statusListCredential"))
+
+    @property
+    def qrUri(self) -> str:
+        return _make_qr_uri(self.privasealId)
+
+    @property
+    def statusListCredential(self) -> str:
+        return f"/api/issuer/status-list/{STATUS_LIST_ID}"
 
-_users:        Dict[str, Dict] = {
+# ── Stores ────────────────────────────────────────────────────────────────────
+# Per-process dicts by default; STORE_BACKEND=sqlite|shm shares them between
+# uvicorn workers. Records read from a shared store are copies, so every
+# mutation is written back through _persist().
+
+_SEED_USERS: Dict[str, Dict] = {
     "admin-root": {
         "id": "admin-root",
         "email": "admin@privaseal.com",
@@ -65,11 +134,96 @@ _users:        Dict[str, Dict] = {
         "docs_uploaded": True
     }
 }
-_fb_uid_index: Dict[str, str]  = {}   # firebase_uid → user_id (internal)
-_doc_uploads:  Dict[str, Dict] = {}   # user_id → latest document upload
-_requests:     Dict[str, Dict] = {}   # request_id → verification request
-_credentials:  Dict[str, Dict] = {}   # privaseal_id → credential
-_audit_log:    List[Dict]      = []   # chronological audit entries
+_users        = store.table("privaseal_users")          # user_id → user
+_fb_uid_index = store.table("privaseal_fb_uid_index")   # firebase_uid → user_id (internal)
+_doc_uploads  = store.table("privaseal_doc_uploads")    # user_id → latest document upload
+_requests     = store.table("privaseal_requests")       # request_id → verification request
+_credentials  = store.table("privaseal_credentials")    # privaseal_id → credential
+
+# Secondary indexes — maintained on every write to _users / _requests.
+# Derived (rebuilt on startup) for the memory backend, stored when shared.
+_email_index   = store.table("privaseal_email_index")    # email → user_id
+_user_requests = store.table("privaseal_user_requests")  # user_id → request_ids, oldest → newest
+
+_tables = {
+    "users":        _users,
+    "fb_uid_index": _fb_uid_index,
+    "doc_uploads":  _doc_uploads,
+    "requests":     _requests,
+    "credentials":  _credentials,
+}
+
+for _seed in _SEED_USERS.values():
+    if _seed["id"] not in _users:
+        _users[_seed["id"]] = dict(_seed)
+        _email_index[_seed["email"]] = _seed["id"]
+
+# WAL + periodic snapshots of the memory backend's stores; reloaded on
+# startup. Shared backends are durable (or shared) on their own.
+_journal = StoreJournal(os.path.join(settings.DATA_DIR, "privaseal"), _tables)
+
+# Bloom filter over every issued PrivaSeal ID, so ID generation and
+# /verifier/check skip the store for IDs that were never issued; published at
+# /verifier/id-filter for terminals to pre-check offline. Rebuilt from
+# _credentials on startup (and at twice the size once full). With a shared
+# backend each issue is also appended to _id_log, which every worker replays.
+ID_FILTER_CAPACITY = 100_000
+ID_FILTER_FP_RATE  = 0.001
+ID_FILTER_CACHE_CONTROL = "public, max-age=60, must-revalidate"
+_id_filter   = BloomFilter(ID_FILTER_CAPACITY, ID_FILTER_FP_RATE)
+_id_log      = store.table("privaseal_id_log")   # "next" → count, "%012d" → privaseal_id
+_id_log_seen = 0
+_id_filter_counts = {"falsePositives": 0, "filteredMisses": 0, "generationRetries": 0}
+
+# Audit trail: durable append-only segment log (newest-first reads via its
+# sparse index), plus per-action counters rebuilt from it at startup
+_audit_log = SegmentLog(
+    os.path.join(settings.DATA_DIR, "audit", "privaseal"),
+    max_segments=settings.AUDIT_MAX_SEGMENTS or None,
+    shared=store.shared,        # every worker appends to the same log
+)
+_audit_counts: Dict[str, int] = {}
+_audit_counted = 0              # audit log seq up to which _audit_counts is current
+
+def _write_audit_batch(batch: List[Tuple[Dict, float]]):
+    for entry, ts in batch:
+        _audit_log.append(entry, ts)
+
+# Handlers only enqueue; the writer appends to the log in batches off the request path
+_audit_writer = AuditWriter("privaseal-audit", _write_audit_batch)
+
+# Document images are stored once on disk, keyed by sha256; records keep digests
+_blobs = BlobStore(os.path.join(settings.DATA_DIR, "blobs"))
+DOC_SIDES = ("front", "back", "selfie")
+MAX_IMAGE_BYTES = 5 * 1024 * 1024
+IMMUTABLE = "private, max-age=31536000, immutable"   # blobs and derivatives never change
+
+# Review thumbnails, rendered once per blob in the background after upload
+_thumbs       = ThumbnailCache(_blobs, os.path.join(settings.DATA_DIR, "thumbs"))
+_thumb_worker = ThumbnailWorker(_thumbs)
+
+@router.on_event("startup")
+async def _start_background_tasks():
+    if not store.shared:
+        _journal.load()
+        _rebuild_indexes()
+        _journal.start()
+    _rebuild_id_filter()
+    _count_audits()
+    _audit_log.start()
+    _audit_writer.start()
+    _thumb_worker.start()
+
+@router.on_event("shutdown")
+async def _stop_background_tasks():
+    await _thumb_worker.stop()
+    await _audit_writer.stop()
+    await _audit_log.stop()
+    await _journal.stop()
+
+# Revocation bitstring for PrivaSeal credentials, published via
+# GET /api/issuer/status-list/privaseal-authority
+STATUS_LIST_ID = "privaseal-authority"
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
@@ -85,23 +239,170 @@ def _privaseal_id() -> str:
     p2 = "".join(random.choices(chars, k=4))
     return f"PS-{p1}-{p2}"
 
+def _new_privaseal_id() -> str:
+    """
+    An unissued PrivaSeal ID. The filter has no false negatives, so a
+    candidate it has never seen is used without touching the store; only
+    its positives are confirmed against _credentials.
+    """
+    if store.shared:
+        _sync_id_filter()
+    while True:
+        privaseal_id = _privaseal_id()
+        if privaseal_id not in _id_filter:
+            return privaseal_id
+        if privaseal_id not in _credentials:
+            _id_filter_counts["falsePositives"] += 1
+            return privaseal_id
+        _id_filter_counts["generationRetries"] += 1
+
+def _index_privaseal_id(privaseal_id: str):
+    """Record a newly issued ID in the filter (and, when shared, in _id_log)."""
+    _id_filter.add(privaseal_id)
+    if store.shared:
+        n = _id_log.modify("next", lambda n: (n or 0) + 1)
+        _id_log[f"{n - 1:012d}"] = privaseal_id
+    if _id_filter.full:
+        _rebuild_id_filter(2 * _id_filter.capacity)
+
+def _rebuild_id_filter(min_capacity: int = ID_FILTER_CAPACITY):
+    global _id_filter, _id_log_seen
+    seen = _id_log.get("next", 0) if store.shared else 0
+    ids = list(_credentials)
+    _id_filter = BloomFilter.from_keys(ids, max(min_capacity, 2 * len(ids)), ID_FILTER_FP_RATE)
+    # IDs logged while we iterated are replayed again — adding is idempotent
+    _id_log_seen = seen
+
+def _sync_id_filter():
+    """Add IDs issued by other workers (shared backends)."""
+    global _id_log_seen
+    end = _id_log.get("next", 0)
+    while _id_log_seen < end:
+        privaseal_id = _id_log.get(f"{_id_log_seen:012d}")
+        if privaseal_id is None:
+            break        # its writer has not stored it yet; picked up next time
+        _id_filter.add(privaseal_id)
+        _id_log_seen += 1
+    if _id_filter.full:
+        _rebuild_id_filter(2 * _id_filter.capacity)
+
+def _user_by_email(email: str) -> Optional[Dict]:
+    user_id = _email_index.get(email)
+    return _users.get(user_id) if user_id else None
+
+def _persist(table: str, key: str, value: Any):
+    """Write one store entry back and journal it — call after every mutation."""
+    _tables[table][key] = value
+    _journal.put(table, key, value)
+
+def _add_user(user: Dict):
+    _persist("users", user["id"], user)
+    # First user per email wins, as the old scan did (firebase-sync may add a
+    # second one); modify() is an atomic setdefault on shared tables
+    _email_index.modify(user["email"], lambda user_id: user_id or user["id"])
+
+def _add_request(req: PrivaSealRequest):
+    _persist("requests", req["id"], req)
+    _user_requests.modify(req["user_id"], lambda ids: (ids or []) + [req["id"]])
+
+def _rebuild_indexes():
+    """Derive the secondary indexes and the status list from reloaded stores (memory backend)."""
+    _email_index.clear()
+    emails: Dict[str, str] = {}
+    for uid, u in _users.items():        # dict order == signup order
+        emails.setdefault(u["email"], uid)
+    _email_index.update(emails)
+    _user_requests.clear()
+    for rid, req in _requests.items():   # dict order == submission order
+        _user_requests.setdefault(req["user_id"], []).append(rid)
+    sl = status_lists.get_or_create(STATUS_LIST_ID)
+    for cred in _credentials.values():
+        index = cred.get("statusListIndex")
+        if index is None:
+            continue
+        while sl.next_index <= index:
+            sl.allocate()
+        if cred["status"] == "revoked":
+            sl.set_revoked(index)
+
+def _requests_for(user_id: str) -> List[Dict]:
+    """The user's requests in submission order (oldest first)."""
+    found = (_requests.get(rid) for rid in _user_requests.get(user_id, ()))
+    return [req for req in found if req is not None]
+
+def _latest_request(user_id: str) -> Optional[Dict]:
+    for rid in reversed(_user_requests.get(user_id, ())):
+        req = _requests.get(rid)
+        if req:
+            return req
+    return None
+
+def _store_image(data: str) -> str:
+    """Decode a base64 (or data-URL) image once and store it; returns the digest."""
+    if data.startswith("data:"):
+        data = data.split(",", 1)[-1]
+    try:
+        raw = base64.b64decode(data, validate=True)
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=400, detail="Image is not valid base64")
+    return _blobs.put_bytes(raw)
+
+def _doc_urls(req: Dict) -> Dict[str, Optional[str]]:
+    """Full-size and thumbnail URLs for each document side present on a request."""
+    urls: Dict[str, Optional[str]] = {}
+    for side in DOC_SIDES:
+        base = f"/api/privaseal/admin/requests/{req['id']}/documents/{side}"
+        present = bool(req.get(f"_{side}_blob"))
+        urls[f"{side}_image"] = base if present else None
+        urls[f"{side}_thumb"] = f"{base}/thumbnail" if present else None
+    return urls
+
 def _hash(value: str) -> str:
     return hashlib.sha256(value.encode()).hexdigest()[:16]
 
-def _audit(action: str, actor: str, target: str, detail: str = ""):
-    _audit_log.append({
+def _count_audits():
+    """Fold audit log entries not yet counted (e.g. written by other workers) into _audit_counts."""
+    global _audit_counted
+    seq = max(_audit_counted, _audit_log.first_seq)
+    for entry in _audit_log.iter_from(seq):
+        _audit_counts[entry["action"]] = _audit_counts.get(entry["action"], 0) + 1
+        seq += 1
+    _audit_counted = seq
+
+def _audit_count(action: str) -> int:
+    if store.shared:
+        _count_audits()
+    return _audit_counts.get(action, 0)
+
+def _audit_token() -> int:
+    """Changes whenever any worker appends to the shared audit log (the store's token does not)."""
+    return _audit_log.next_seq
+
+async def _audit(action: str, actor: str, target: str, detail: str = ""):
+    now = datetime.now(timezone.utc)
+    if not store.shared:
+        # Counted here rather than from the log, so reads never lag the writer queue
+        _audit_counts[action] = _audit_counts.get(action, 0) + 1
+    # Every audited mutation moves the platform counters
+    versions.bump("privaseal:stats")
+    # Only waits if the writer has fallen a full queue behind (backpressure)
+    await _audit_writer.submit(({
         "id":        _uid(),
-        "timestamp": _now(),
+        "timestamp": now.isoformat(),
         "action":    action,
         "actor":     actor,
         "target":    target,
         "detail":    detail,
-    })
+    }, now.timestamp()))
+
+def _touch_user(user_id: str):
+    """Invalidate the user's status ETag (wakes long-polling clients)."""
+    versions.bump(f"privaseal:user:{user_id}")
 
 def _make_qr_uri(privaseal_id: str) -> str:
     return f"privaseal://verify?id={privaseal_id}&v=1"
 
-def _make_credential(user: Dict, privaseal_id: str) -> Dict:
+def _make_credential(user: Dict, privaseal_id: str) -> PrivaSealCredential:
     dob_str = user.get("dob", "")
     try:
         dob = datetime.fromisoformat(dob_str)
@@ -110,7 +411,7 @@ def _make_credential(user: Dict, privaseal_id: str) -> Dict:
     except Exception:
         age_verified = True  # demo fallback
 
-    return {
+    return PrivaSealCredential({
         "privasealId":   privaseal_id,
         "userId":        user["id"],
         "fullName":      user.get("full_name", ""),
@@ -118,10 +419,9 @@ def _make_credential(user: Dict, privaseal_id: str) -> Dict:
         # Internal hash — never returned to verifier
         "_identityHash": _hash(user.get("full_name", "") + dob_str),
         "issuedAt":      _now(),
-        "expiresAt":     None,
-        "qrUri":         _make_qr_uri(privaseal_id),
         "status":        "active",
-    }
+        "statusListIndex": status_lists.get_or_create(STATUS_LIST_ID).allocate(),
+    })
 
 # ── Pydantic Models ───────────────────────────────────────────────────────────
 
@@ -174,12 +474,11 @@ class VerifierCheckBody(BaseModel):
 
 @router.post("/user/signup")
 async def user_signup(body: SignupBody):
-    existing = next((u for u in _users.values() if u["email"] == body.email), None)
-    if existing:
+    if _user_by_email(body.email):
         raise HTTPException(status_code=409, detail="Email already registered")
 
     user_id = _uid()
-    _users[user_id] = {
+    _add_user({
         "id":            user_id,
         "full_name":     body.full_name,
         "email":         body.email,
@@ -189,10 +488,10 @@ async def user_signup(body: SignupBody):
         "created_at":    _now(),
         "status":        "active",
         "docs_uploaded": False,
-    }
-    _audit("USER_SIGNUP", user_id, user_id, f"role={body.role}")
+    })
+    await _audit("USER_SIGNUP", user_id, user_id, f"role={body.role}")
 
-    return JSONResponse(content={
+    return FastJSONResponse(content={
         "success":      True,
         "user_id":      user_id,
         "role":         body.role,
@@ -204,12 +503,12 @@ async def user_signup(body: SignupBody):
 
 @router.post("/user/login")
 async def user_login(body: LoginBody):
-    user = next((u for u in _users.values() if u["email"] == body.email), None)
-    if not user or user["_pw_hash"] != _hash(body.password):
+    user = _user_by_email(body.email)
+    if not user or user.get("_pw_hash") != _hash(body.password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    _audit("USER_LOGIN", user["id"], user["id"])
-    return JSONResponse(content={
+    await _audit("USER_LOGIN", user["id"], user["id"])
+    return FastJSONResponse(content={
         "success":      True,
         "user_id":      user["id"],
         "role":         user["role"],
@@ -243,19 +542,22 @@ async def firebase_sync(body: FirebaseSyncBody):
     if existing_id and existing_id in _users:
         user = _users[existing_id]
         user["full_name"]    = body.display_name or user.get("full_name", "")
-        return JSONResponse(content={
+        _persist("users", existing_id, user)
+        _touch_user(existing_id)
+        return FastJSONResponse(content={
             "success": True, "user_id": existing_id, "firebase_uid": verified_uid,
             "role": user.get("role", "user"), "name": user.get("full_name", ""),
             "docs_uploaded": user.get("docs_uploaded", False), "created": False,
         })
 
     # Pre-provisioned user by email (e.g. root admin or verifier)
-    pre_provisioned = next((u for u in _users.values() if u["email"] == body.email), None)
+    pre_provisioned = _user_by_email(body.email)
     if pre_provisioned and not pre_provisioned.get("firebase_uid"):
         user_id = pre_provisioned["id"]
         pre_provisioned["firebase_uid"] = verified_uid
-        _fb_uid_index[verified_uid] = user_id
-        return JSONResponse(content={
+        _persist("users", user_id, pre_provisioned)
+        _persist("fb_uid_index", verified_uid, user_id)
+        return FastJSONResponse(content={
             "success": True, "user_id": user_id, "firebase_uid": verified_uid,
             "role": pre_provisioned["role"], "name": pre_provisioned["full_name"],
             "docs_uploaded": pre_provisioned.get("docs_uploaded", False), "created": False
@@ -273,9 +575,10 @@ async def firebase_sync(body: FirebaseSyncBody):
         "status":        "active",
         "docs_uploaded": False,
     }
-    _users[user_id] = user
-    _fb_uid_index[verified_uid] = user_id
-    return JSONResponse(status_code=201, content={
+    _add_user(user)
+    _persist("fb_uid_index", verified_uid, user_id)
+    versions.bump("privaseal:stats")
+    return FastJSONResponse(status_code=201, content={
         "success": True, "user_id": user_id, "role": "user",
         "name": user["full_name"], "docs_uploaded": False, "created": True
     })
@@ -304,14 +607,10 @@ async def get_user_by_firebase_uid(firebase_uid: str):
     user = _users[user_id]
 
     # Find latest request + credential
-    req = next(
-        (r for r in sorted(_requests.values(), key=lambda x: x["submitted_at"], reverse=True)
-         if r["user_id"] == user_id),
-        None,
-    )
+    req = _latest_request(user_id)
     cred = _credentials.get(req["privaseal_id"]) if req and req.get("privaseal_id") else None
 
-    return JSONResponse(content={
+    return FastJSONResponse(content={
         "user": {
             "user_id":       user_id,
             "firebase_uid":  firebase_uid,
@@ -363,7 +662,7 @@ async def save_user_profile(body: UserProfileBody):
     
     # Security: Prevent edit after approval
     # Check if a successful request exists for this user
-    req = next((r for r in _requests.values() if r["user_id"] == body.user_id and r["status"] == "approved"), None)
+    req = next((r for r in _requests_for(body.user_id) if r["status"] == "approved"), None)
     if req:
         raise HTTPException(status_code=403, detail="Profile cannot be modified after verification approval")
     
@@ -381,13 +680,15 @@ async def save_user_profile(body: UserProfileBody):
         "id_number":     body.id_number,
         "profile_completed": True
     })
+    _persist("users", body.user_id, user)
 
-    _audit("PROFILE_UPDATE", body.user_id, body.user_id, "Identity profile saved")
+    await _audit("PROFILE_UPDATE", body.user_id, body.user_id, "Identity profile saved")
+    _touch_user(body.user_id)
     return {"success": True, "message": "Profile updated successfully"}
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# USER — DOCUMENT UPLOAD  (POST /user/upload-documents)
+# USER — DOCUMENT UPLOAD  (POST /user/upload-documents[/multipart])
 # ─────────────────────────────────────────────────────────────────────────────
 
 @router.post("/user/upload-documents")
@@ -403,29 +704,92 @@ async def upload_documents(body: DocumentUploadBody):
 
     # Validate base64 size (prevent giant payloads; 5 MB per image approx)
     MAX_B64 = 7_000_000
-    for label, data in [("front", body.front_image), ("selfie", body.selfie_image)]:
-        if len(data) > MAX_B64:
+    for label, data in [("front", body.front_image), ("back", body.back_image), ("selfie", body.selfie_image)]:
+        if data and len(data) > MAX_B64:
             raise HTTPException(status_code=413, detail=f"{label} image too large (max ~5 MB)")
 
+    # Decode + hash + write off the event loop; only digests are kept in memory
+    front_blob  = await run_in_threadpool(_store_image, body.front_image)
+    back_blob   = await run_in_threadpool(_store_image, body.back_image) if body.back_image else None
+    selfie_blob = await run_in_threadpool(_store_image, body.selfie_image)
+
+    return await _record_upload(body.user_id, body.doc_type, body.doc_number, front_blob, back_blob, selfie_blob)
+
+
+@router.post("/user/upload-documents/multipart")
+async def upload_documents_multipart(request: Request):
+    """
+    Streaming alternative to /user/upload-documents: raw image files as
+    multipart/form-data (fields user_id, doc_type, doc_number; files
+    front_image, selfie_image, optional back_image). Files are hashed while
+    they are spooled to disk and oversized ones are cut off mid-stream.
+    """
+    upload = StreamingUpload(
+        _blobs.temp_dir(),
+        file_fields=("front_image", "back_image", "selfie_image"),
+        file_limit=MAX_IMAGE_BYTES,
+    )
+    fields, files = await upload.parse(request)
+    try:
+        for name in ("user_id", "doc_type", "doc_number"):
+            if not fields.get(name):
+                raise HTTPException(status_code=400, detail=f"{name} is required")
+        user_id = fields["user_id"]
+        if user_id not in _users:
+            raise HTTPException(status_code=404, detail="User not found")
+        if "front_image" not in files:
+            raise HTTPException(status_code=400, detail="Front image is required")
+        if "selfie_image" not in files:
+            raise HTTPException(status_code=400, detail="Selfie image is required")
+
+        blobs = {
+            name: _blobs.adopt_file(f.tmp_path, f.digest)
+            for name, f in files.items() if f.size
+        }
+    finally:
+        upload.discard()
+
+    return await _record_upload(
+        user_id, fields["doc_type"], fields["doc_number"],
+        blobs.get("front_image"), blobs.get("back_image"), blobs.get("selfie_image"),
+    )
+
+
+async def _record_upload(
+    user_id:     str,
+    doc_type:    str,
+    doc_number:  str,
+    front_blob:  Optional[str],
+    back_blob:   Optional[str],
+    selfie_blob: Optional[str],
+) -> FastJSONResponse:
+    if not front_blob or not selfie_blob:
+        raise HTTPException(status_code=400, detail="Front and selfie images must not be empty")
+
     upload = {
-        "user_id":        body.user_id,
-        "doc_type":       body.doc_type,
-        "_doc_hash":      _hash(body.doc_number),  # hash immediately
-        "front_image":    body.front_image,          # admin-only, never sent to verifier
-        "back_image":     body.back_image,
-        "selfie_image":   body.selfie_image,
+        "user_id":        user_id,
+        "doc_type":       doc_type,
+        "_doc_hash":      _hash(doc_number),        # hash immediately
+        "front_blob":     front_blob,               # admin-only, never sent to verifier
+        "back_blob":      back_blob,
+        "selfie_blob":    selfie_blob,
         "uploaded_at":    _now(),
         "status":         "received",               # received | reupload_requested
     }
-    _doc_uploads[body.user_id] = upload
-    _users[body.user_id]["docs_uploaded"] = True
+    user = _users[user_id]
+    user["docs_uploaded"] = True
+    _persist("doc_uploads", user_id, upload)
+    _persist("users", user_id, user)
+    for digest in (front_blob, back_blob, selfie_blob):
+        _thumb_worker.submit(digest)
 
-    _audit("DOC_UPLOAD", body.user_id, body.user_id, f"doc_type={body.doc_type}")
+    await _audit("DOC_UPLOAD", user_id, user_id, f"doc_type={doc_type}")
+    _touch_user(user_id)
 
-    return JSONResponse(content={
+    return FastJSONResponse(content={
         "success":   True,
         "message":   "Documents uploaded successfully. You may now submit your verification request.",
-        "doc_type":  body.doc_type,
+        "doc_type":  doc_type,
         "status":    "received",
     })
 
@@ -447,12 +811,12 @@ async def submit_verification_request(body: VerificationRequestBody):
 
     # Prevent duplicate pending
     existing = next(
-        (r for r in _requests.values()
-         if r["user_id"] == body.user_id and r["status"] in ("pending", "reupload_requested")),
+        (r for r in _requests_for(body.user_id)
+         if r["status"] in ("pending", "reupload_requested")),
         None,
     )
     if existing:
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "success":    True,
             "request_id": existing["id"],
             "status":     existing["status"],
@@ -460,28 +824,24 @@ async def submit_verification_request(body: VerificationRequestBody):
         })
 
     request_id = _uid()
-    _requests[request_id] = {
+    _add_request(PrivaSealRequest({
         "id":              request_id,
         "user_id":         body.user_id,
         "user_name":       user["full_name"],
         "user_email":      user["email"],
         "doc_type":        upload["doc_type"],
         "_doc_hash":       upload["_doc_hash"],
-        # Image keys for admin-only access (stripped before verifier response)
-        "_front_image":    upload["front_image"],
-        "_back_image":     upload.get("back_image"),
-        "_selfie_image":   upload["selfie_image"],
+        # Blob digests for admin-only access (stripped before verifier response)
+        "_front_blob":     upload["front_blob"],
+        "_back_blob":      upload.get("back_blob"),
+        "_selfie_blob":    upload["selfie_blob"],
         "status":          "pending",
         "submitted_at":    _now(),
-        "reviewed_at":     None,
-        "admin_id":        None,
-        "reject_reason":   None,
-        "reupload_reason": None,
-        "privaseal_id":    None,
-    }
-    _audit("VERIFICATION_REQUEST", body.user_id, request_id, f"doc={upload['doc_type']}")
+    }))
+    await _audit("VERIFICATION_REQUEST", body.user_id, request_id, f"doc={upload['doc_type']}")
+    _touch_user(body.user_id)
 
-    return JSONResponse(content={
+    return FastJSONResponse(content={
         "success":    True,
         "request_id": request_id,
         "status":     "pending",
@@ -490,22 +850,21 @@ async def submit_verification_request(body: VerificationRequestBody):
 
 
 @router.get("/user/{user_id}/status")
-async def get_user_status(user_id: str):
-    user = _users.get(user_id)
-    if not user:
+async def get_user_status(user_id: str, request: Request, wait: float = 0):
+    if user_id not in _users:
         raise HTTPException(status_code=404, detail="User not found")
+    return await conditional_json(request, f"privaseal:user:{user_id}", lambda: _user_status(user_id), wait)
 
-    req = next(
-        (r for r in sorted(_requests.values(), key=lambda x: x["submitted_at"], reverse=True)
-         if r["user_id"] == user_id),
-        None,
-    )
+
+def _user_status(user_id: str) -> Dict:
+    user = _users[user_id]
+    req  = _latest_request(user_id)
 
     cred = None
     if req and req.get("privaseal_id"):
         cred = _credentials.get(req["privaseal_id"])
 
-    return JSONResponse(content={
+    return {
         "user_id":      user_id,
         "name":         user["full_name"],
         "docs_uploaded": user.get("docs_uploaded", False),
@@ -524,16 +883,12 @@ async def get_user_status(user_id: str):
             "qr_uri":       cred["qrUri"]        if cred else None,
             "status":       cred["status"]       if cred else None,
         } if cred else None,
-    })
+    }
 
 
 @router.get("/user/{user_id}/credential")
 async def get_user_credential(user_id: str):
-    req = next(
-        (r for r in _requests.values()
-         if r["user_id"] == user_id and r.get("privaseal_id")),
-        None,
-    )
+    req = next((r for r in _requests_for(user_id) if r.get("privaseal_id")), None)
     if not req:
         raise HTTPException(status_code=404, detail="No issued credential found")
 
@@ -542,7 +897,7 @@ async def get_user_credential(user_id: str):
         raise HTTPException(status_code=404, detail="Credential not found")
 
     safe = {k: v for k, v in cred.items() if not k.startswith("_")}
-    return JSONResponse(content={"credential": safe})
+    return FastJSONResponse(content={"credential": safe})
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -551,24 +906,30 @@ async def get_user_credential(user_id: str):
 
 @router.get("/admin/requests")
 async def list_requests(status: Optional[str] = None, page: int = 1, per_page: int = 20):
-    results = list(reversed(list(_requests.values())))
+    everything = list(_requests.values())
+    results = everything[::-1]
     if status and status != "all":
         results = [r for r in results if r["status"] == status]
 
     total = len(results)
     start = (page - 1) * per_page
 
-    # Strip private image keys from list view (images are in detail endpoint only)
+    # Strip private blob keys from list view; rows link to thumbnails only
     def _strip(r: Dict) -> Dict:
-        return {k: v for k, v in r.items() if not k.startswith("_")}
+        row = {k: v for k, v in r.items() if not k.startswith("_")}
+        row["thumbnails"] = {
+            side: f"/api/privaseal/admin/requests/{r['id']}/documents/{side}/thumbnail"
+            for side in DOC_SIDES if r.get(f"_{side}_blob")
+        }
+        return row
 
-    return JSONResponse(content={
+    return FastJSONResponse(content={
         "data":        [_strip(r) for r in results[start: start + per_page]],
         "total":       total,
-        "pending":     sum(1 for r in _requests.values() if r["status"] == "pending"),
-        "approved":    sum(1 for r in _requests.values() if r["status"] == "approved"),
-        "rejected":    sum(1 for r in _requests.values() if r["status"] == "rejected"),
-        "reupload":    sum(1 for r in _requests.values() if r["status"] == "reupload_requested"),
+        "pending":     sum(1 for r in everything if r["status"] == "pending"),
+        "approved":    sum(1 for r in everything if r["status"] == "approved"),
+        "rejected":    sum(1 for r in everything if r["status"] == "rejected"),
+        "reupload":    sum(1 for r in everything if r["status"] == "reupload_requested"),
         "page":        page,
         "per_page":    per_page,
         "total_pages": max(1, -(-total // per_page)),
@@ -581,14 +942,55 @@ async def get_request_detail(request_id: str):
     if not req:
         raise HTTPException(status_code=404, detail="Request not found")
 
-    # Build admin-safe view WITH images (admin only access)
-    detail = {k: v for k, v in req.items() if not k.startswith("_doc")}
-    # Remap image keys to clean names for frontend
-    detail["front_image"]  = req.get("_front_image")
-    detail["back_image"]   = req.get("_back_image")
-    detail["selfie_image"] = req.get("_selfie_image")
+    # Build admin-safe view; thumbnails for review, full images fetched on demand
+    detail = {k: v for k, v in req.items() if not k.startswith("_")}
+    detail.update(_doc_urls(req))
+
+    return FastJSONResponse(content={"request": detail})
+
+
+def _document_digest(request_id: str, side: str) -> str:
+    req = _requests.get(request_id)
+    if not req:
+        raise HTTPException(status_code=404, detail="Request not found")
+    if side not in DOC_SIDES:
+        raise HTTPException(status_code=400, detail=f"side must be one of {', '.join(DOC_SIDES)}")
+
+    digest = req.get(f"_{side}_blob")
+    if not digest or not _blobs.exists(digest):
+        raise HTTPException(status_code=404, detail=f"No {side} image for this request")
+    return digest
+
+
+@router.get("/admin/requests/{request_id}/documents/{side}")
+async def get_request_document(request_id: str, side: str):
+    digest = _document_digest(request_id, side)
 
-    return JSONResponse(content={"request": detail})
+    # Content-addressed, so the bytes behind a digest never change
+    return FileResponse(
+        _blobs.path(digest),
+        media_type=await run_in_threadpool(_blobs.media_type, digest),
+        headers={"Cache-Control": IMMUTABLE, "ETag": f'"{digest}"'},
+    )
+
+
+@router.get("/admin/requests/{request_id}/documents/{side}/thumbnail")
+async def get_request_thumbnail(request_id: str, side: str):
+    digest = _document_digest(request_id, side)
+
+    # Normally already rendered by the worker; otherwise render it now
+    path = _thumbs.path(digest)
+    if not _thumbs.exists(digest):
+        path = await run_in_threadpool(_thumbs.generate, digest)
+    if path is None:
+        # Not a decodable image (e.g. a PDF) — fall back to the original
+        return await get_request_document(request_id, side)
+
+    return FileResponse(
+        path,
+        media_type="image/jpeg",
+        headers={"Cache-Control": IMMUTABLE, "ETag": f'"{digest}-{_thumbs.edge}"'},
+    )
 
 
 @router.post("/admin/approve/{request_id}")
@@ -603,12 +1005,9 @@ async def approve_request(request_id: str, body: AdminDecisionBody):
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    privaseal_id = _privaseal_id()
-    while privaseal_id in _credentials:
-        privaseal_id = _privaseal_id()
-
+    privaseal_id = _new_privaseal_id()
     cred = _make_credential(user, privaseal_id)
-    _credentials[privaseal_id] = cred
+    _refresh_verifier_view(cred)
 
     req.update({
         "status":       "approved",
@@ -616,11 +1015,15 @@ async def approve_request(request_id: str, body: AdminDecisionBody):
         "admin_id":     body.admin_id,
         "privaseal_id": privaseal_id,
     })
+    _persist("credentials", privaseal_id, cred)
+    _index_privaseal_id(privaseal_id)
+    _persist("requests", request_id, req)
 
-    _audit("APPROVE", body.admin_id, request_id, f"issued={privaseal_id}")
+    await _audit("APPROVE", body.admin_id, request_id, f"issued={privaseal_id}")
+    _touch_user(req["user_id"])
 
     safe_cred = {k: v for k, v in cred.items() if not k.startswith("_")}
-    return JSONResponse(content={
+    return FastJSONResponse(content={
         "success":      True,
         "request_id":   request_id,
         "privaseal_id": privaseal_id,
@@ -643,9 +1046,11 @@ async def reject_request(request_id: str, body: AdminDecisionBody):
         "admin_id":     body.admin_id,
         "reject_reason": body.reason or "Does not meet verification requirements",
     })
-    _audit("REJECT", body.admin_id, request_id, f"reason={req['reject_reason']}")
+    _persist("requests", request_id, req)
+    await _audit("REJECT", body.admin_id, request_id, f"reason={req['reject_reason']}")
+    _touch_user(req["user_id"])
 
-    return JSONResponse(content={"success": True, "request_id": request_id, "status": "rejected"})
+    return FastJSONResponse(content={"success": True, "request_id": request_id, "status": "rejected"})
 
 
 @router.post("/admin/request-reupload/{request_id}")
@@ -663,12 +1068,16 @@ async def request_reupload(request_id: str, body: AdminDecisionBody):
         "reupload_reason": body.reason or "Documents are unclear or incomplete",
     })
     # Reset doc uploads so user must re-upload
-    if req["user_id"] in _doc_uploads:
-        _doc_uploads[req["user_id"]]["status"] = "reupload_requested"
+    upload = _doc_uploads.get(req["user_id"])
+    if upload is not None:
+        upload["status"] = "reupload_requested"
+        _persist("doc_uploads", req["user_id"], upload)
+    _persist("requests", request_id, req)
 
-    _audit("REUPLOAD_REQUESTED", body.admin_id, request_id, f"reason={req['reupload_reason']}")
+    await _audit("REUPLOAD_REQUESTED", body.admin_id, request_id, f"reason={req['reupload_reason']}")
+    _touch_user(req["user_id"])
 
-    return JSONResponse(content={
+    return FastJSONResponse(content={
         "success":    True,
         "request_id": request_id,
         "status":     "reupload_requested",
@@ -676,58 +1085,198 @@ async def request_reupload(request_id: str, body: AdminDecisionBody):
     })
 
 
+@router.post("/admin/revoke/{privaseal_id}")
+async def revoke_credential(privaseal_id: str, body: AdminDecisionBody):
+    cred = _credentials.get(privaseal_id.strip().upper())
+    if not cred:
+        raise HTTPException(status_code=404, detail="Credential not found")
+    if cred["status"] == "revoked":
+        raise HTTPException(status_code=409, detail="Already revoked")
+
+    cred.update({
+        "status":       "revoked",
+        "revokedAt":    _now(),
+        "revokeReason": body.reason or "Revoked by administrator",
+    })
+    _persist("credentials", cred["privasealId"], cred)
+    status_lists.get_or_create(STATUS_LIST_ID).set_revoked(cred["statusListIndex"])
+    _refresh_verifier_view(cred)
+    await _audit("REVOKE", body.admin_id, cred["privasealId"], f"reason={cred['revokeReason']}")
+    _touch_user(cred["userId"])
+
+    return FastJSONResponse(content={
+        "success":      True,
+        "privaseal_id": cred["privasealId"],
+        "status":       "revoked",
+    })
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # VERIFIER  (zero PII returned)
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Hot path. Each credential gets a precomputed, read-only verifier view
+# (everything but `privaseal_id` / `checked_at`), rebuilt on approve and
+# revoke; unknown IDs land in a bounded negative cache so repeated probes
+# skip the store and are audited once per TTL rather than on every scan.
+# With a shared store backend both caches are dropped whenever another
+# worker writes (the backend's change token moves).
+
+PRIVASEAL_ID_RE = re.compile(r"PS-[A-Z0-9]{4}-[A-Z0-9]{4}")
+VIEW_CACHE_SIZE     = 200_000
+NEGATIVE_CACHE_SIZE = 100_000
+NEGATIVE_CACHE_TTL  = 60.0
+
+_VerifierView = Tuple[Mapping[str, Any], str]    # (response fields, audit detail)
+
+_verifier_views = LRUCache(VIEW_CACHE_SIZE)
+_unknown_ids    = LRUCache(NEGATIVE_CACHE_SIZE, ttl=NEGATIVE_CACHE_TTL)
+_cache_token    = store.token()
+_suppressed_misses = 0
+
+def _make_verifier_view(cred: Dict) -> _VerifierView:
+    revoked = status_lists.get_or_create(STATUS_LIST_ID).is_revoked(cred["statusListIndex"])
+    # PRIVACY RULE: return only these fields — never name, DOB, images, documents
+    fields = MappingProxyType({
+        "age_verified":      cred["ageVerified"],
+        "credential_type":   "AGE_VERIFICATION",
+        "issued_by":         "PrivaSeal Authority",
+        "credential_status": cred["status"],
+        "valid":             not revoked and cred["status"] == "active",
+    })
+    return fields, f"age_verified={cred['ageVerified']}"
+
+def _refresh_verifier_view(cred: Dict):
+    _verifier_views.put(cred["privasealId"], _make_verifier_view(cred))
+    _unknown_ids.pop(cred["privasealId"])
+
+def _sync_check_caches():
+    global _cache_token
+    if store.shared:
+        token = store.token()
+        if token != _cache_token:
+            _verifier_views.clear()
+            _unknown_ids.clear()
+            _sync_id_filter()
+            _cache_token = token
+
+def _qr_privaseal_id(qr_data: str) -> Optional[str]:
+    """`id` from a privaseal://verify?id=…&v=1 URI without a full urlparse/parse_qs."""
+    start = qr_data.find("?") + 1
+    if not start:
+        return None
+    query = qr_data[start:].split("#", 1)[0]
+    if query.startswith("id="):
+        value = query[3:]
+    else:
+        i = query.find("&id=")
+        if i < 0:
+            return None
+        value = query[i + 4:]
+    end = value.find("&")
+    if end >= 0:
+        value = value[:end]
+    return unquote_plus(value) if "%" in value or "+" in value else value
+
+def _verifier_view(privaseal_id: str) -> Tuple[Optional[_VerifierView], bool]:
+    """
+    (view, first_miss) for a normalized ID. view is None when no such
+    credential exists; first_miss is True only when the ID was not already
+    in the negative cache.
+    """
+    global _suppressed_misses
+    _sync_check_caches()
+    view = _verifier_views.get(privaseal_id)
+    if view is not None:
+        return view, False
+    if _unknown_ids.get(privaseal_id) is not None:
+        _suppressed_misses += 1
+        return None, False
+    # Malformed and never-issued IDs never reach the store
+    if not PRIVASEAL_ID_RE.fullmatch(privaseal_id) or privaseal_id not in _id_filter:
+        _id_filter_counts["filteredMisses"] += 1
+        cred = None
+    else:
+        cred = _credentials.get(privaseal_id)
+        if cred is None:
+            _id_filter_counts["falsePositives"] += 1
+    if cred is None:
+        _unknown_ids.put(privaseal_id, True)
+        return None, True
+    view = _make_verifier_view(cred)
+    _verifier_views.put(privaseal_id, view)
+    return view, False
+
+
 @router.post("/verifier/check")
 async def verifier_check(body: VerifierCheckBody):
     privaseal_id = body.privaseal_id
-
     if not privaseal_id and body.qr_data:
-        try:
-            from urllib.parse import urlparse, parse_qs
-            qs = parse_qs(urlparse(body.qr_data).query)
-            privaseal_id = qs.get("id", [None])[0]
-        except Exception:
-            pass
-
+        privaseal_id = _qr_privaseal_id(body.qr_data)
     if not privaseal_id:
         raise HTTPException(status_code=400, detail="Provide privaseal_id or qr_data")
 
-    cred = _credentials.get(privaseal_id.strip().upper())
-    if not cred:
-        _audit("VERIFIER_MISS", "verifier", privaseal_id)
-        return JSONResponse(content={
+    view, first_miss = _verifier_view(privaseal_id.strip().upper())
+    if view is None:
+        if first_miss:
+            await _audit("VERIFIER_MISS", "verifier", privaseal_id)
+        return FastJSONResponse(content={
             "found":        False,
             "privaseal_id": privaseal_id,
             "age_verified": False,
             "message":      "PrivaSeal ID not found or credential not yet issued",
         })
 
-    _audit("VERIFIER_CHECK", "verifier", privaseal_id, f"age_verified={cred['ageVerified']}")
+    fields, detail = view
+    await _audit("VERIFIER_CHECK", "verifier", privaseal_id, detail)
+    return FastJSONResponse(content={
+        "found":        True,
+        "privaseal_id": privaseal_id,
+        **fields,
+        "checked_at":   _now(),
+    })
+
 
-    # PRIVACY RULE: return only these fields — never name, DOB, images, documents
-    return JSONResponse(content={
-        "found":            True,
-        "privaseal_id":     privaseal_id,
-        "age_verified":     cred["ageVerified"],
-        "credential_type":  "AGE_VERIFICATION",
-        "issued_by":        "PrivaSeal Authority",
-        "credential_status": cred["status"],
-        "valid":            cred["status"] == "active",
-        "checked_at":       _now(),
+@router.get("/verifier/metrics")
+async def verifier_metrics():
+    return FastJSONResponse(content={
+        "views":            _verifier_views.stats(),
+        "unknownIds":       _unknown_ids.stats(),
+        "suppressedMisses": _suppressed_misses,
+        "idFilter":         {**_id_filter.stats(), **_id_filter_counts},
     })
 
 
+@router.get("/verifier/id-filter")
+async def verifier_id_filter(request: Request):
+    """
+    Serialized Bloom filter of every issued PrivaSeal ID (format documented in
+    utils/bloom_filter.py). Terminals can reject IDs it does not contain
+    without calling /verifier/check; unchanged filters answer 304.
+    """
+    _sync_check_caches()
+    data, etag = _id_filter.serialized()
+    headers = {
+        "ETag":           etag,
+        "Cache-Control":  ID_FILTER_CACHE_CONTROL,
+        "X-Filter-Items": str(_id_filter.items),
+    }
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return await precompressed.response(request, data, etag, "application/octet-stream", headers)
+
+
 @router.get("/verifier/stats")
-async def verifier_stats():
-    checks = [a for a in _audit_log if a["action"] == "VERIFIER_CHECK"]
-    return JSONResponse(content={
-        "totalCredentials": len(_credentials),
-        "ageVerifiedCount": sum(1 for c in _credentials.values() if c["ageVerified"]),
-        "totalChecks":      len(checks),
-    })
+async def verifier_stats(request: Request, wait: float = 0):
+    def _build():
+        return {
+            "totalCredentials": len(_credentials),
+            "ageVerifiedCount": sum(1 for c in _credentials.values() if c["ageVerified"]),
+            "totalChecks":      _audit_count("VERIFIER_CHECK"),
+        }
+
+    return await conditional_json(request, "privaseal:stats", _build, wait,
+                                  _audit_token if store.shared else None)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -736,25 +1285,74 @@ async def verifier_stats():
 
 @router.get("/audit")
 async def get_audit_log(page: int = 1, per_page: int = 50):
-    results = list(reversed(_audit_log))
-    total   = len(results)
-    start   = (page - 1) * per_page
-    return JSONResponse(content={"data": results[start: start + per_page], "total": total})
+    # Only the requested page is read from the log, newest first
+    results = _audit_log.read_newest((page - 1) * per_page, per_page)
+    return FastJSONResponse(content={"data": results, "total": len(_audit_log)})
+
+
+@router.get("/audit/metrics")
+async def audit_metrics():
+    return FastJSONResponse(content={
+        "writer": _audit_writer.stats(),
+        "log": {
+            "records": len(_audit_log),
+            "syncs":   _audit_log.syncs_total,
+        },
+    })
+
+
+AUDIT_EXPORT_COLUMNS = ["id", "timestamp", "action", "actor", "target", "detail"]
+
+
+@router.get("/audit/export")
+async def export_audit_log(
+    fmt:    str = Query("ndjson", alias="format"),
+    gzip:   bool = False,
+    since:  Optional[str] = None,
+    until:  Optional[str] = None,
+    action: Optional[str] = None,
+    actor:  Optional[str] = None,
+    target: Optional[str] = None,
+):
+    since_ts, until_ts = parse_time_range(since, until)
+    actions = {a.strip().upper() for a in action.split(",")} if action else None
+
+    def _rows():
+        window = _audit_log.iter_newest(
+            since_ts.timestamp() if since_ts else None,
+            until_ts.timestamp() if until_ts else None,
+        )
+        for entry in window:
+            if actions and entry["action"] not in actions:
+                continue
+            if actor and entry["actor"] != actor:
+                continue
+            if target and entry["target"] != target:
+                continue
+            yield entry
+
+    return stream_export(_rows(), fmt, "privaseal-audit", AUDIT_EXPORT_COLUMNS, gzip)
 
 
 @router.get("/stats")
-async def platform_stats():
-    return JSONResponse(content={
-        "totalUsers":        len(_users),
-        "docsUploaded":      sum(1 for u in _users.values() if u.get("docs_uploaded")),
-        "totalRequests":     len(_requests),
-        "pendingRequests":   sum(1 for r in _requests.values() if r["status"] == "pending"),
-        "approvedRequests":  sum(1 for r in _requests.values() if r["status"] == "approved"),
-        "rejectedRequests":  sum(1 for r in _requests.values() if r["status"] == "rejected"),
-        "reuploadRequests":  sum(1 for r in _requests.values() if r["status"] == "reupload_requested"),
+async def platform_stats(request: Request, wait: float = 0):
+    return await conditional_json(request, "privaseal:stats", _platform_stats, wait,
+                                  _audit_token if store.shared else None)
+
+
+def _platform_stats() -> Dict:
+    users, requests = _users.values(), _requests.values()
+    return {
+        "totalUsers":        len(users),
+        "docsUploaded":      sum(1 for u in users if u.get("docs_uploaded")),
+        "totalRequests":     len(requests),
+        "pendingRequests":   sum(1 for r in requests if r["status"] == "pending"),
+        "approvedRequests":  sum(1 for r in requests if r["status"] == "approved"),
+        "rejectedRequests":  sum(1 for r in requests if r["status"] == "rejected"),
+        "reuploadRequests":  sum(1 for r in requests if r["status"] == "reupload_requested"),
         "issuedCredentials": len(_credentials),
-        "verifierChecks":    sum(1 for a in _audit_log if a["action"] == "VERIFIER_CHECK"),
-    })
+        "verifierChecks":    _audit_count("VERIFIER_CHECK"),
+    }
 
 
 @router.get("/")
@@ -5,27 +5,62 @@ POST /api/verifier/request          — create a verification request
 POST /api/verifier/verify           — submit & verify a ZK proof
 GET  /api/verifier/requests         — list all requests (with pagination)
 GET  /api/verifier/requests/{id}    — poll status of one request
+GET  /api/verifier/requests/{id}/events — SSE push of one request's status transitions
+GET  /api/verifier/events?verifier_id=  — SSE push of every transition for one verifier
 GET  /api/verifier/stats            — aggregate dashboard stats
+GET  /api/verifier/export           — stream request history as NDJSON / CSV
+GET  /api/verifier/predicates       — predicate catalog (ETag-cacheable, precompressed)
+
+Requests expire at `expiresAt`: a min-heap expiry index flips still-open
+requests to `expired`, late proofs are rejected with 410, and once the
+retention window has passed records are archived to disk in bulk.
+
+GET /requests/{id} and /stats carry version ETags: unchanged polls get a
+304, and `?wait=N` long-polls until the version moves.
 """
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timezone, timedelta
 import uuid
 import random
+import asyncio
 import hashlib
 import logging
+import json
+import os
+import time
+
+from app.config import settings
+
+from utils.export import stream_export, parse_time_range, iter_time_window
+from utils.expiry import ExpiryIndex, ExpirySweeper
+from utils.pubsub import broker, sse_response
+from utils.conditional import versions, conditional_json, etag_matches
+from utils.records import Record, record_dict
+from utils.fast_json import FastJSONResponse, dumps
+from utils.compression import precompressed
+from app.store import store
 
 logger = logging.getLogger("verifier")
 router = APIRouter()
 
 # ─────────────────────────────────────────────────────────────────────────────
-# In-memory store (survives requests within the server process)
+# Request store — per process by default, shared by all workers with
+# STORE_BACKEND=sqlite|shm (records are then copies: write them back)
 # ─────────────────────────────────────────────────────────────────────────────
 
-_request_store: List[Dict[str, Any]] = []
+_request_store = store.table("verifier_requests")   # request_id → record (insertion = creation order)
+
+# Deadlines: open requests flip to "expired" at expiresAt; every record leaves
+# the hot store REQUEST_RETENTION_SECONDS after that.
+_expiry_index    = ExpiryIndex()
+_retention_index = ExpiryIndex()
+_counters        = store.table("verifier_counters")   # "archived" → records moved to the archive
+
+ARCHIVE_PATH = os.path.join(settings.DATA_DIR, "archive", "verifier-requests.ndjson")
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Predicate definitions
@@ -58,7 +93,30 @@ PREDICATES = {
     },
 }
 
-STATUS_FLOW = ["pending", "waiting_proof", "proof_received", "verifying", "verified", "failed"]
+# The catalog never changes at runtime: encoded once, served precompressed
+PREDICATES_BODY = dumps({"predicates": [{"key": k, **v} for k, v in PREDICATES.items()]})
+PREDICATES_ETAG = f'"{hashlib.sha256(PREDICATES_BODY).hexdigest()[:20]}"'
+PREDICATES_CACHE_CONTROL = "public, max-age=3600"
+
+EXPORT_COLUMNS = [
+    "id", "predicateKey", "predicateLabel", "credentialType",
+    "verifierId", "verifierName", "verifierType", "status",
+    "createdAt", "expiresAt", "verifiedAt", "proofHash", "revealedAttrs", "errorMsg",
+]
+
+STATUS_FLOW = ["pending", "waiting_proof", "proof_received", "verifying", "verified", "failed", "expired"]
+OPEN_STATUSES = ("pending", "waiting_proof", "proof_received", "verifying")
+FINAL_STATUSES = ("verified", "expired")
+
+STATUS_LABELS = {
+    "pending":        "Pending",
+    "waiting_proof":  "Waiting for proof",
+    "proof_received": "Proof received",
+    "verifying":      "Verifying…",
+    "verified":       "Verified ✅",
+    "failed":         "Verification Failed ❌",
+    "expired":        "Expired ⌛",
+}
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Request / Response models
@@ -78,6 +136,52 @@ class SubmitProofBody(BaseModel):
     issuer_public_key:   Optional[str] = None
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Stored record
+# ─────────────────────────────────────────────────────────────────────────────
+
+class VerificationRequest(Record):
+    """
+    One verification request. Predicate details, statusLabel and qrUri are
+    derived from predicateKey / status / id instead of being stored.
+    """
+    KEYS = (
+        "id", "predicateKey", "predicateLabel", "predicateDesc", "predicateIcon", "credentialType",
+        "verifierId", "verifierName", "verifierType", "status", "statusLabel", "qrUri",
+        "createdAt", "expiresAt", "verifiedAt", "proofHash", "revealedAttrs", "errorMsg",
+    )
+    DEFAULTS = {"verifiedAt": None, "proofHash": None, "revealedAttrs": {}, "errorMsg": None}
+    CODES = ("predicateKey", "verifierId", "verifierName", "verifierType", "status")
+    __slots__ = (
+        "id", "predicateKey", "verifierId", "verifierName", "verifierType", "status",
+        "createdAt", "expiresAt", "verifiedAt", "proofHash", "revealedAttrs", "errorMsg",
+    )
+
+    @property
+    def predicateLabel(self) -> str:
+        return PREDICATES[self.predicateKey]["label"]
+
+    @property
+    def predicateDesc(self) -> str:
+        return PREDICATES[self.predicateKey]["description"]
+
+    @property
+    def predicateIcon(self) -> str:
+        return PREDICATES[self.predicateKey]["icon"]
+
+    @property
+    def credentialType(self) -> str:
+        return PREDICATES[self.predicateKey]["credential_type"]
+
+    @property
+    def statusLabel(self) -> str:
+        return STATUS_LABELS.get(self.status, self.status)
+
+    @property
+    def qrUri(self) -> str:
+        return _make_qr_uri(self.id, self.predicateKey)
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Helpers
 # ─────────────────────────────────────────────────────────────────────────────
@@ -101,6 +205,79 @@ def _simulate_verify(proof: Optional[str]) -> bool:
     return (seed % 20) != 0          # ~95 % pass rate
 
 
+def _publish(record: VerificationRequest) -> None:
+    """Push a status transition to request- and verifier-level subscribers."""
+    versions.bump(f"verifier:request:{record['id']}", "verifier:stats")
+    data = record_dict(record)
+    broker.publish(f"verifier:request:{record['id']}", "status", data)
+    broker.publish(f"verifier:verifier:{record['verifierId']}", "status", data)
+
+
+def _snapshot(request_id: str) -> Optional[Dict[str, Any]]:
+    record = _request_store.get(request_id)
+    return record_dict(record) if record is not None else None
+
+
+def _expire_requests(request_ids: List[str]) -> None:
+    """Expiry sweep: flip still-open requests to `expired`."""
+    for request_id in request_ids:
+        record = _request_store.get(request_id)
+        if record and record["status"] in OPEN_STATUSES:
+            record["status"]      = "expired"
+            record["errorMsg"]    = "Verification request expired before a proof was received"
+            _request_store[request_id] = record
+            _publish(record)
+
+
+def _write_archive(records: List[VerificationRequest]) -> None:
+    os.makedirs(os.path.dirname(ARCHIVE_PATH), exist_ok=True)
+    with open(ARCHIVE_PATH, "a", encoding="utf-8") as fh:
+        fh.write("".join(json.dumps(record_dict(r), ensure_ascii=False) + "\n" for r in records))
+
+
+async def _archive_requests(request_ids: List[str]) -> None:
+    """Retention sweep: move a whole batch out of the hot store with one file write."""
+    batch = [r for r in (_request_store.pop(rid, None) for rid in request_ids) if r is not None]
+    for record in batch:
+        _expiry_index.cancel(record["id"])
+        versions.forget(f"verifier:request:{record['id']}")
+    if not batch:
+        return
+    versions.bump("verifier:stats")
+    _counters.modify("archived", lambda n: (n or 0) + len(batch))
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, _write_archive, batch)
+    except OSError as exc:
+        logger.error(f"Archiving {len(batch)} verification requests failed: {exc}")
+
+
+_expiry_sweeper    = ExpirySweeper("verifier-expiry", _expiry_index, _expire_requests)
+_retention_sweeper = ExpirySweeper("verifier-retention", _retention_index, _archive_requests, max_sleep=5.0)
+
+
+def _schedule_existing():
+    """Index deadlines of requests already in a shared store (created by any worker)."""
+    for record in _request_store.values():
+        expires_at = datetime.fromisoformat(record["expiresAt"]).timestamp()
+        if record["status"] in OPEN_STATUSES:
+            _expiry_index.schedule(record["id"], expires_at)
+        _retention_index.schedule(record["id"], expires_at + settings.REQUEST_RETENTION_SECONDS)
+
+
+@router.on_event("startup")
+async def _start_sweepers():
+    if store.shared:
+        _schedule_existing()
+    _expiry_sweeper.start()
+    _retention_sweeper.start()
+
+
+@router.on_event("shutdown")
+async def _stop_sweepers():
+    await _expiry_sweeper.stop()
+    await _retention_sweeper.stop()
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Routes
 # ─────────────────────────────────────────────────────────────────────────────
@@ -125,31 +302,24 @@ async def create_verification_request(body: CreateRequestBody):
     now = datetime.now(timezone.utc)
     expires_at = now + timedelta(minutes=10)
 
-    record: Dict[str, Any] = {
-        "id":              request_id,
-        "predicateKey":    body.predicate_key,
-        "predicateLabel":  pred["label"],
-        "predicateDesc":   pred["description"],
-        "predicateIcon":   pred["icon"],
-        "credentialType":  pred["credential_type"],
-        "verifierId":      body.verifier_id,
-        "verifierName":    body.verifier_name,
-        "verifierType":    body.verifier_type,
-        "status":          "waiting_proof",
-        "statusLabel":     "Waiting for proof",
-        "qrUri":           _make_qr_uri(request_id, body.predicate_key),
-        "createdAt":       now.isoformat(),
-        "expiresAt":       expires_at.isoformat(),
-        "verifiedAt":      None,
-        "proofHash":       None,
-        "revealedAttrs":   {},
-        "errorMsg":        None,
-    }
-
-    _request_store.append(record)
+    record = VerificationRequest(
+        id           = request_id,
+        predicateKey = body.predicate_key,
+        verifierId   = body.verifier_id,
+        verifierName = body.verifier_name,
+        verifierType = body.verifier_type,
+        status       = "waiting_proof",
+        createdAt    = now.isoformat(),
+        expiresAt    = expires_at.isoformat(),
+    )
+
+    _request_store[request_id] = record
+    _expiry_index.schedule(request_id, expires_at.timestamp())
+    _retention_index.schedule(request_id, expires_at.timestamp() + settings.REQUEST_RETENTION_SECONDS)
+    versions.bump("verifier:stats")
     logger.info(f"Verification request created: {request_id} predicate={body.predicate_key}")
 
-    return JSONResponse(content={"success": True, "request": record})
+    return FastJSONResponse(content={"success": True, "request": record_dict(record)})
 
 
 @router.post("/verify")
@@ -159,16 +329,23 @@ async def submit_and_verify_proof(body: SubmitProofBody):
     Falls back to safe-mode simulation when the ZKP engine is unavailable.
     """
     # Find the request
-    record = next((r for r in _request_store if r["id"] == body.request_id), None)
+    record = _request_store.get(body.request_id)
     if record is None:
         raise HTTPException(status_code=404, detail="Verification request not found")
 
     if record["status"] == "verified":
-        return JSONResponse(content={"success": True, "already_verified": True, "request": record})
+        return FastJSONResponse(content={"success": True, "already_verified": True, "request": record_dict(record)})
+
+    # Late proof: reject from the deadline without waiting for the sweeper (the
+    # record's own expiresAt covers requests indexed by another worker)
+    if (record["status"] == "expired" or _expiry_index.is_expired(body.request_id)
+            or datetime.fromisoformat(record["expiresAt"]) <= datetime.now(timezone.utc)):
+        _expiry_index.cancel(body.request_id)
+        _expire_requests([body.request_id])
+        raise HTTPException(status_code=410, detail="Verification request has expired")
 
     # Mark as verifying
     record["status"]      = "verifying"
-    record["statusLabel"] = "Verifying…"
 
     # Simulate / perform verification
     passed = _simulate_verify(body.proof)
@@ -176,19 +353,20 @@ async def submit_and_verify_proof(body: SubmitProofBody):
 
     if passed:
         record["status"]      = "verified"
-        record["statusLabel"] = "Verified ✅"
         record["verifiedAt"]  = now
         record["proofHash"]   = hashlib.sha256(
             (body.proof or uuid.uuid4().hex).encode()
         ).hexdigest()[:16]
         record["revealedAttrs"] = body.revealed_attributes or {}
+        _expiry_index.cancel(body.request_id)
     else:
         record["status"]      = "failed"
-        record["statusLabel"] = "Verification Failed ❌"
         record["errorMsg"]    = "ZK proof did not satisfy the predicate"
         record["verifiedAt"]  = now
 
+    _request_store[body.request_id] = record
     logger.info(f"Proof verified: {body.request_id} → {record['status']}")
+    _publish(record)
 
     # Nudge the benchmark engine if available (non-blocking)
     try:
@@ -203,7 +381,7 @@ async def submit_and_verify_proof(body: SubmitProofBody):
     except Exception:
         pass
 
-    return JSONResponse(content={"success": True, "verified": passed, "request": record})
+    return FastJSONResponse(content={"success": True, "verified": passed, "request": record_dict(record)})
 
 
 @router.get("/requests")
@@ -214,7 +392,7 @@ async def get_all_requests(
     predicate:   Optional[str] = None,
 ):
     """Return verification history newest-first, with optional status & predicate filters."""
-    results = list(reversed(_request_store))
+    results = list(reversed(_request_store.values()))
 
     if status and status != "all":
         results = [r for r in results if r["status"] == status]
@@ -225,8 +403,8 @@ async def get_all_requests(
     start = (page - 1) * per_page
     page_data = results[start: start + per_page]
 
-    return JSONResponse(content={
-        "data":        page_data,
+    return FastJSONResponse(content={
+        "data":        [record_dict(r) for r in page_data],
         "total":       total,
         "page":        page,
         "per_page":    per_page,
@@ -235,34 +413,102 @@ async def get_all_requests(
 
 
 @router.get("/requests/{request_id}")
-async def get_single_request(request_id: str):
-    """Poll the status of a single verification request."""
-    record = next((r for r in _request_store if r["id"] == request_id), None)
-    if record is None:
+async def get_single_request(request_id: str, request: Request, wait: float = 0):
+    """
+    Poll the status of a single verification request.
+    Send If-None-Match for a 304 on no change; add ?wait=N to long-poll.
+    """
+    if request_id not in _request_store:
         raise HTTPException(status_code=404, detail="Request not found")
-    return JSONResponse(content={"request": record})
+
+    def _build():
+        record = _request_store.get(request_id)
+        if record is None:
+            raise HTTPException(status_code=404, detail="Request not found")
+        return {"request": record_dict(record)}
+
+    return await conditional_json(request, f"verifier:request:{request_id}", _build, wait)
+
+
+@router.get("/requests/{request_id}/events")
+async def stream_request_status(request_id: str):
+    """
+    Server-sent events for one request: the current state first, then every
+    transition, closing once the request is verified or expired.
+    """
+    if request_id not in _request_store:
+        raise HTTPException(status_code=404, detail="Request not found")
+    return sse_response(
+        f"verifier:request:{request_id}",
+        snapshot=lambda: _snapshot(request_id),
+        is_final=lambda r: r["status"] in FINAL_STATUSES,
+    )
+
+
+@router.get("/events")
+async def stream_verifier_events(verifier_id: str = "privaseal-verifier-001"):
+    """Server-sent events for every request transition of one verifier."""
+    return sse_response(f"verifier:verifier:{verifier_id}")
 
 
 @router.get("/stats")
-async def get_verifier_stats():
-    total    = len(_request_store)
-    verified = sum(1 for r in _request_store if r["status"] == "verified")
-    failed   = sum(1 for r in _request_store if r["status"] == "failed")
-    pending  = sum(1 for r in _request_store if r["status"] in ("waiting_proof", "verifying", "proof_received"))
-    return JSONResponse(content={
+async def get_verifier_stats(request: Request, wait: float = 0):
+    return await conditional_json(request, "verifier:stats", _verifier_stats, wait)
+
+
+def _verifier_stats() -> Dict[str, Any]:
+    records  = _request_store.values()
+    total    = len(records)
+    verified = sum(1 for r in records if r["status"] == "verified")
+    failed   = sum(1 for r in records if r["status"] == "failed")
+    expired  = sum(1 for r in records if r["status"] == "expired")
+    pending  = sum(1 for r in records if r["status"] in ("waiting_proof", "verifying", "proof_received"))
+    return {
         "totalRequests":  total,
         "verified":       verified,
         "failed":         failed,
+        "expired":        expired,
         "pending":        pending,
+        "archived":       _counters.get("archived", 0),
         "successRate":    round((verified / total * 100) if total else 0, 1),
-    })
+    }
+
+
+@router.get("/export")
+async def export_requests(
+    fmt:         str = Query("ndjson", alias="format"),
+    gzip:        bool = False,
+    since:       Optional[str] = None,
+    until:       Optional[str] = None,
+    status:      Optional[str] = None,
+    predicate:   Optional[str] = None,
+    verifier_id: Optional[str] = None,
+):
+    """Stream verification history newest-first as NDJSON or CSV."""
+    since_ts, until_ts = parse_time_range(since, until)
+
+    # Read lazily, newest first, a batch at a time: the sweepers and new
+    # requests may resize the store while the response is still streaming,
+    # and shared backends decode only the records actually sent.
+    records = _request_store.iter_newest()
+
+    def _rows():
+        for r in iter_time_window(records, "createdAt", since_ts, until_ts):
+            if status and status != "all" and r["status"] != status:
+                continue
+            if predicate and predicate != "all" and r["predicateKey"] != predicate:
+                continue
+            if verifier_id and r["verifierId"] != verifier_id:
+                continue
+            yield r
+
+    return stream_export(_rows(), fmt, "verification-requests", EXPORT_COLUMNS, gzip)
 
 
 @router.get("/predicates")
-async def list_predicates():
+async def list_predicates(request: Request):
     """Return available predicate definitions for the frontend dropdown."""
-    return JSONResponse(content={
-        "predicates": [
-            {"key": k, **v} for k, v in PREDICATES.items()
-        ]
-    })
+    headers = {"ETag": PREDICATES_ETAG, "Cache-Control": PREDICATES_CACHE_CONTROL}
+    if etag_matches(request, PREDICATES_ETAG):
+        return Response(status_code=304, headers=headers)
+    return await precompressed.response(request, PREDICATES_BODY, PREDICATES_ETAG, "application/json", headers)
@@ -1,10 +1,51 @@
 import os
 
+# Whether DATABASE_URL (default below) is SQLite; the pool defaults depend on it
+_SQLITE = os.getenv("DATABASE_URL", "sqlite").startswith("sqlite")
+
 class Settings:
     PROJECT_NAME: str = "PrivaSeal"
     VERSION: str = "0.1.0"
     API_V1_STR: str = "/api"
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./zkp_credentials.db")
     SECRET_KEY: str = os.getenv("SECRET_KEY", "change_me_in_production")
+    DATA_DIR: str = os.getenv("DATA_DIR", "./data")
+    # How long finished / expired verification requests stay in the hot store
+    REQUEST_RETENTION_SECONDS: int = int(os.getenv("REQUEST_RETENTION_SECONDS", "3600"))
+    # Audit log segments to keep on disk (16 MB each); 0 keeps everything
+    AUDIT_MAX_SEGMENTS: int = int(os.getenv("AUDIT_MAX_SEGMENTS", "0"))
+    # Where the issuer / verifier / PrivaSeal stores live: memory (per process),
+    # sqlite or shm (shared by every `uvicorn --workers N` process)
+    STORE_BACKEND: str = os.getenv("STORE_BACKEND", "memory")
+    # File for the sqlite / shm backends; empty picks a default (see app/store.py)
+    STORE_PATH: str = os.getenv("STORE_PATH", "")
+    # Responses smaller than this are sent uncompressed (gzip / brotli above it)
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    # SQLAlchemy engine for the MediGuard tables (see database/db.py). SQLite
+    # has a single writer: more connections only add lock waits, so the pool
+    # stays small (bench_db_writes.py: 2 beats 4 and 8+8 at every concurrency).
+    # Postgres (postgresql+asyncpg://…) writes concurrently and gets a real pool.
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "2" if _SQLITE else "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "0" if _SQLITE else "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    # Postgres: recycle connections older than this (seconds); pre-ping is always on
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_ECHO: bool = os.getenv("DB_ECHO", "0") == "1"
+    # Prepared statements asyncpg keeps per connection (0 disables, e.g. behind
+    # PgBouncer in transaction mode)
+    PG_STATEMENT_CACHE_SIZE: int = int(os.getenv("PG_STATEMENT_CACHE_SIZE", "256"))
+    # SQLite connection pragmas: NORMAL is crash-safe under WAL; FULL also
+    # survives power loss at the cost of an fsync per commit
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_CACHE_SIZE_KB: int = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_STATEMENT_CACHE: int = int(os.getenv("SQLITE_STATEMENT_CACHE", "256"))
+    # How /api/provider/verify stores its result row (see utils/group_commit.py):
+    # direct (commit per proof), group (shared commit, still durable before the
+    # response) or write_behind (respond once queued)
+    VERIFICATION_WRITE_MODE: str = os.getenv("VERIFICATION_WRITE_MODE", "direct")
+    VERIFICATION_FLUSH_MS: float = float(os.getenv("VERIFICATION_FLUSH_MS", "2"))
+    VERIFICATION_BATCH_SIZE: int = int(os.getenv("VERIFICATION_BATCH_SIZE", "256"))
 
 settings = Settings()
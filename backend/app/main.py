@@ -4,6 +4,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.issuer.routes import router as issuer_router
 from app.api.verifier.routes import router as verifier_router
 from app.api.privaseal.routes import router as privaseal_router
+from app.config import settings
+from utils.fast_json import FastJSONResponse
+from utils.compression import CompressionMiddleware
 
 # Use standard Python logging instead of structlog
 logging.basicConfig(
@@ -17,7 +20,8 @@ app = FastAPI(
     description="Universal Privacy-First Verification Protocol",
     version="0.1.0",
     docs_url="/docs",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    default_response_class=FastJSONResponse,
 )
 
 # CORS — allow all origins for development
@@ -29,19 +33,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip / brotli for responses of at least COMPRESSION_MIN_SIZE bytes
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
 # ── Legacy MediGuard routes (backward compatibility) ─────────────────────────
 try:
     from api.hospital.routes import router as hospital_router
     from api.provider.routes import router as provider_router
-    from database.db import engine as db_engine, Base
+    from database.db import engine as db_engine
+    from database.migrations import migrate
 
     @app.on_event("startup")
     async def startup_db_client():
-        async with db_engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+        await migrate(db_engine)
 
     app.include_router(hospital_router, prefix="/api/hospital", tags=["Hospital (Issuer)"])
     app.include_router(provider_router, prefix="/api/provider", tags=["Provider (Verifier)"])
+
+    # Registered after the routers so their background tasks stop first;
+    # pooled aiosqlite connections each hold a (non-daemon) worker thread
+    @app.on_event("shutdown")
+    async def shutdown_db_client():
+        await db_engine.dispose()
+
     logger.info("Legacy MediGuard routes loaded successfully")
 except ImportError as e:
     logger.warning(f"Legacy routes not loaded: {e}")
@@ -79,7 +93,6 @@ except Exception as e:
     logger.error(f"Benchmark routes failed to load: {e}", exc_info=True)
 
     # ── Safety net: if benchmarks module fails, serve mock data directly ──
-    from fastapi.responses import JSONResponse
     import random
 
     @app.get("/api/benchmarks", tags=["Benchmarks"])
@@ -95,7 +108,7 @@ except Exception as e:
             }
             for _ in range(8)
         ]
-        return JSONResponse({
+        return FastJSONResponse({
             "proofGenTime":     round(random.uniform(115, 140), 1),
             "verificationTime": round(random.uniform(70, 90), 1),
             "proofSize":        random.randint(350, 420),
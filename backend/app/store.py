@@ -0,0 +1,34 @@
+"""
+Backend for the router stores, chosen by STORE_BACKEND
+======================================================
+memory — each worker process keeps its own dicts (single-worker deployments)
+sqlite — <DATA_DIR>/store.sqlite3 in WAL mode, shared by all workers
+shm    — /dev/shm/privaseal-store, a shared mmap log (lost on reboot unless
+         STORE_PATH points at a disk-backed directory)
+
+With a shared backend, ETags and status lists are tied to it here. Server-sent
+event streams and the expiry sweepers stay per process: an SSE subscriber
+only sees transitions made by the worker serving it (long-polling with
+?wait=N sees every worker's writes).
+"""
+
+import os
+
+from app.config import settings
+from utils.kvstore import open_backend
+from utils.conditional import versions
+from utils.status_list import status_lists
+
+
+def _default_path(kind: str) -> str:
+    if kind == "shm" and os.path.isdir("/dev/shm"):
+        return "/dev/shm/privaseal-store"
+    return os.path.join(settings.DATA_DIR, "store.shm" if kind == "shm" else "store.sqlite3")
+
+
+_kind = settings.STORE_BACKEND.strip().lower()
+store = open_backend(_kind, settings.STORE_PATH or _default_path(_kind))
+
+if store.shared:
+    versions.attach(store.token)
+    status_lists.attach(store.table("status_lists"), store.table("status_changes"))
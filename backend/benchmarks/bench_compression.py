@@ -0,0 +1,89 @@
+"""
+Response compression benchmark.
+
+Seeds N issued credentials (default 2000) and N PrivaSeal IDs, then reports
+wire size and time per request through the ASGI app (httpx, in process)
+with Accept-Encoding identity vs gzip (and br when brotli is installed):
+
+  1. GET /api/issuer/issued?per_page=500 — compressed per request
+  2. GET /api/issuer/export               — streamed through one compressor
+  3. GET /api/privaseal/verifier/id-filter — precompressed once per version,
+     compared with compressing the same body on every request
+
+    python benchmarks/bench_compression.py [num_records]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from app.main import app
+from app.api.issuer.routes import IssueCredentialRequest, _make_credential, _credential_store
+from app.api.privaseal.routes import _new_privaseal_id, _index_privaseal_id, _id_filter
+from utils.compression import SUPPORTED, compress, precompressed
+
+NUM_RECORDS = 2_000
+REQUESTS = 50
+
+
+def seed(n: int) -> None:
+    for i in range(n):
+        cred = _make_credential(IssueCredentialRequest(credential_type="vaccination", attributes={
+            "patient_name":      f"Patient {i}",
+            "date_of_birth":     "1990-01-01",
+            "vaccine_type":      "mRNA",
+            "manufacturer":      "Pfizer",
+            "date_administered": "2024-03-01",
+            "dose_number":       "2",
+        }))
+        _credential_store[cred["id"]] = cred
+        _index_privaseal_id(_new_privaseal_id())
+
+
+async def measure(client: httpx.AsyncClient, path: str, encoding: str):
+    """(ms per request, bytes on the wire); the client never decompresses."""
+    headers = {"Accept-Encoding": encoding}
+    await client.get(path, headers=headers)     # first request fills the precompressed cache
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        size = 0
+        async with client.stream("GET", path, headers=headers) as r:
+            async for chunk in r.aiter_raw():
+                size += len(chunk)
+    return (time.perf_counter() - start) / REQUESTS * 1e3, size
+
+
+async def run_benchmarks(num_records: int = NUM_RECORDS):
+    print(f"--- Response Compression Benchmarks ({num_records:,} records, encodings: {', '.join(SUPPORTED)}) ---")
+    seed(num_records)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path in ("/api/issuer/issued?per_page=500", "/api/issuer/export", "/api/privaseal/verifier/id-filter"):
+            print(f"GET {path}:")
+            for encoding in ("identity", *SUPPORTED):
+                ms, size = await measure(client, path, encoding)
+                print(f"  {encoding:<9} {ms:8.3f} ms/request  {size:>10,} bytes")
+
+    body, _ = _id_filter.serialized()
+    for encoding in SUPPORTED:
+        start = time.perf_counter()
+        for _ in range(REQUESTS):
+            compress(body, encoding)
+        per_request = (time.perf_counter() - start) / REQUESTS * 1e3
+        print(f"id-filter compressed per request ({encoding}, on-the-fly level): {per_request:.3f} ms")
+    for encoding in SUPPORTED:
+        start = time.perf_counter()
+        await precompressed.variant(body, "bench", encoding)
+        print(f"id-filter precompression ({encoding}, once per version, worker thread): "
+              f"{(time.perf_counter() - start) * 1e3:.3f} ms")
+    print(f"Precompressed cache: {precompressed.stats()}")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_RECORDS
+    asyncio.run(run_benchmarks(n))
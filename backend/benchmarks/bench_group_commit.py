@@ -0,0 +1,128 @@
+"""
+Group-commit benchmark for verification results.
+
+Runs POST /api/provider/verify through the ASGI app (httpx, in process) at
+increasing concurrency against a scratch database (the working directory's
+zkp_credentials.db is not touched), once per result write mode:
+
+  - direct:       one commit per proof (the previous behaviour)
+  - group:        shared commits, the row is durable before the response
+  - write_behind: the response is sent once the row is queued
+
+For each mode it reports writes/s, p50 / p99 latency, and the writer's
+batches and submit → commit wait. For write_behind it also counts how many
+of the acknowledged rows were not yet visible when the last response
+arrived, i.e. the rows a crash at that moment would have lost.
+
+The linger comes from VERIFICATION_FLUSH_MS (default 2 ms).
+
+    python benchmarks/bench_group_commit.py [writes_per_level]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import func, select
+
+import database.db as db
+from app.config import settings
+from database.models import VerificationResult
+from utils.group_commit import DURABILITY, MODES, GroupCommitWriter
+
+WRITES_PER_LEVEL = 1_000
+CONCURRENCY = (1, 4, 16, 64)
+LINGER = settings.VERIFICATION_FLUSH_MS / 1000
+PREDICATE = {"type": "COMPARISON", "attribute": "age", "operator": ">=", "value": 18}
+
+
+async def _create_requests(client: httpx.AsyncClient, n: int):
+    request_ids = []
+    for _ in range(n):
+        r = await client.post("/api/provider/request", json={
+            "provider_id": "bench-pharmacy", "provider_name": "Bench Pharmacy",
+            "provider_type": "pharmacy", "predicate": PREDICATE,
+        })
+        request_ids.append(r.json()["request_id"])
+    return request_ids
+
+
+async def _drive(concurrency: int, calls):
+    """(writes/s, errors, p50 ms, p99 ms) for the coroutine factories in `calls`."""
+    queue = list(reversed(calls))
+    latencies = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        while queue:
+            call = queue.pop()
+            start = time.perf_counter()
+            response = await call()
+            latencies.append(time.perf_counter() - start)
+            errors += response.status_code != 200
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return (len(calls) / elapsed, errors,
+            latencies[len(latencies) // 2] * 1e3, latencies[int(len(latencies) * 0.99)] * 1e3)
+
+
+async def _count_results() -> int:
+    async with db.AsyncSessionLocal() as session:
+        return (await session.execute(select(func.count()).select_from(VerificationResult))).scalar()
+
+
+async def run_benchmarks(writes: int = WRITES_PER_LEVEL):
+    print(f"--- Verification Result Group-Commit Benchmarks ({writes:,} writes per level, "
+          f"linger {LINGER * 1000:g} ms) ---")
+    from app.main import app
+    import api.provider.routes as provider_routes
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = db.create_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        db.AsyncSessionLocal.configure(bind=engine)
+        async with engine.begin() as conn:
+            await conn.run_sync(db.Base.metadata.create_all)
+
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            for mode in MODES:
+                for concurrency in CONCURRENCY:
+                    writer = GroupCommitWriter("bench-results", db.AsyncSessionLocal, mode=mode, linger=LINGER)
+                    provider_routes._result_writer = writer
+                    if mode != "direct":
+                        writer.start()
+                    request_ids = await _create_requests(client, writes)
+                    calls = [
+                        (lambda rid: lambda: client.post("/api/provider/verify", json={
+                            "request_id": rid, "proof": "bench", "revealed_attributes": {}, "issuer_public_key": "bench",
+                        }))(rid)
+                        for rid in request_ids
+                    ]
+                    before = await _count_results()
+                    rate, errors, p50, p99 = await _drive(concurrency, calls)
+                    pending = writes - (await _count_results() - before)
+                    await writer.stop()
+                    stats = writer.stats()
+                    line = (f"  {mode:<12} c={concurrency:<3} {rate:8,.0f} writes/s  p50 {p50:7.2f} ms  "
+                            f"p99 {p99:8.2f} ms  errors {errors}  commits {stats['batches'] + stats['direct']:>5}  "
+                            f"wait avg {stats['avgCommitWaitMs']:6.2f} ms")
+                    if mode == "write_behind":
+                        line += f"  unflushed at last ack {pending}"
+                    print(line)
+        for mode in MODES:
+            print(f"Durability, {mode}: {DURABILITY[mode]}")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else WRITES_PER_LEVEL
+    asyncio.run(run_benchmarks(n))
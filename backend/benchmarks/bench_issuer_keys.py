@@ -0,0 +1,116 @@
+"""
+Hospital issuer key registry benchmark.
+
+Against a scratch SQLite database (the working directory's zkp_credentials.db
+is not touched):
+
+  1. Key lookup: the previous per-issuance SELECT on `hospitals` vs a
+     registry hit, and signing with the raw key vs the registry's signer.
+  2. POST /api/hospital/issue through the ASGI app (httpx, in process),
+     with the SQL statements each issuance runs.
+  3. Concurrent first-time auto-init: N new hospital_ids, each hit by
+     10 simultaneous issuances, reporting errors and rows created.
+
+    python benchmarks/bench_issuer_keys.py [num_issuances]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import event, func
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.future import select
+
+import database.db as db
+from database.models import Hospital
+from crypto.bbs_mock import BbsMock
+
+NUM_ISSUANCES = 2_000
+LOOKUPS = 2_000
+NEW_HOSPITALS = 20
+CONCURRENCY = 10
+ATTRIBUTES = {"patient_name": "Jane Doe", "vaccine_type": "mRNA", "dose_number": 2, "date_administered": "2024-03-01"}
+
+
+def _use_scratch_db(path: str):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", connect_args={"check_same_thread": False})
+    db.engine = engine
+    db.AsyncSessionLocal.configure(bind=engine)
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return engine, statements
+
+
+async def run_benchmarks(num_issuances: int = NUM_ISSUANCES):
+    print(f"--- Issuer Key Registry Benchmarks ({num_issuances:,} issuances) ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, statements = _use_scratch_db(os.path.join(tmp, "bench.db"))
+        async with engine.begin() as conn:
+            await conn.run_sync(db.Base.metadata.create_all)
+
+        from app.main import app
+        from api.hospital.key_registry import key_registry
+
+        # 1. Key lookup
+        keys = await key_registry.get_or_create("bench-hospital", "Bench Hospital")
+        start = time.perf_counter()
+        async with db.AsyncSessionLocal() as session:
+            for _ in range(LOOKUPS):
+                result = await session.execute(select(Hospital).where(Hospital.hospital_id == "bench-hospital"))
+                row = result.scalars().first()
+        legacy = (time.perf_counter() - start) / LOOKUPS
+        start = time.perf_counter()
+        for _ in range(LOOKUPS):
+            await key_registry.get("bench-hospital")
+        cached = (time.perf_counter() - start) / LOOKUPS
+        print("Key lookup:")
+        print(f"  SELECT hospitals per issuance (before)  {legacy * 1e6:10.1f} µs")
+        print(f"  registry hit                            {cached * 1e6:10.3f} µs")
+        start = time.perf_counter()
+        for _ in range(LOOKUPS):
+            BbsMock.sign(ATTRIBUTES, row.private_key_encrypted)
+        raw = (time.perf_counter() - start) / LOOKUPS
+        start = time.perf_counter()
+        for _ in range(LOOKUPS):
+            keys.sign(ATTRIBUTES)
+        bound = (time.perf_counter() - start) / LOOKUPS
+        print(f"  sign with raw key / registry signer     {raw * 1e6:10.2f} / {bound * 1e6:.2f} µs")
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            # 2. Issuance end to end
+            body = {"hospital_id": "bench-hospital", "credential_type": "vaccination", "attributes": ATTRIBUTES}
+            statements.clear()
+            start = time.perf_counter()
+            for _ in range(num_issuances):
+                await client.post("/api/hospital/issue", json=body)
+            elapsed = time.perf_counter() - start
+            key_reads = sum("FROM hospitals" in s for s in statements)
+            print(f"Issuance (httpx, in process): {num_issuances / elapsed:,.0f} /s, "
+                  f"{len(statements) / num_issuances:.1f} SQL statements each, {key_reads} key reads in total")
+
+            # 3. Concurrent first-time auto-init
+            errors = 0
+            for i in range(NEW_HOSPITALS):
+                body = {"hospital_id": f"new-hospital-{i}", "credential_type": "vaccination", "attributes": ATTRIBUTES}
+                responses = await asyncio.gather(*[client.post("/api/hospital/issue", json=body) for _ in range(CONCURRENCY)])
+                errors += sum(r.status_code != 200 for r in responses)
+        async with db.AsyncSessionLocal() as session:
+            rows = (await session.execute(
+                select(func.count()).select_from(Hospital).where(Hospital.hospital_id.like("new-hospital-%"))
+            )).scalar()
+        print(f"Concurrent auto-init ({NEW_HOSPITALS} hospitals x {CONCURRENCY} requests): "
+              f"{errors} errors, {rows} rows created")
+        print(f"Registry: {key_registry.stats()}")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_ISSUANCES
+    asyncio.run(run_benchmarks(n))
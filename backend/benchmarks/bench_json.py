@@ -0,0 +1,110 @@
+"""
+API response serialization benchmark.
+
+Measures how much of a list response goes into JSON encoding, before
+(stdlib JSONResponse, records copied to dicts) and after (FastJSONResponse,
+pre-encoded fragments spliced in):
+
+  1. GET /api/issuer/issued?per_page=N over N issued credentials
+     (default 1000), with the fragment cache warm.
+  2. GET /api/benchmarks with the full rolling history.
+
+For each, "build" is the time to assemble the response content and
+"render" the time to encode it; the share is render / (build + render).
+
+    python benchmarks/bench_json.py [num_credentials]
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+
+from app.api.issuer.routes import (
+    IssueCredentialRequest, _make_credential, _credential_store, _credential_json,
+)
+from benchmarks.benchmark_service import BenchmarkEngine
+from utils.fast_json import FastJSONResponse, orjson
+from utils.records import record_dict
+
+NUM_CREDENTIALS = 1_000
+ROUNDS = 200
+
+
+def seed(n: int):
+    creds = []
+    for i in range(n):
+        cred = _make_credential(IssueCredentialRequest(credential_type="vaccination", attributes={
+            "patient_name":      f"Patient {i}",
+            "date_of_birth":     "1990-01-01",
+            "vaccine_type":      "mRNA",
+            "manufacturer":      "Pfizer",
+            "date_administered": "2024-03-01",
+            "dose_number":       "2",
+        }))
+        _credential_store[cred["id"]] = cred
+        creds.append(cred)
+    return creds
+
+
+def timed(fn, rounds: int = ROUNDS):
+    """(mean seconds per call, last result)"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = fn()
+    return (time.perf_counter() - start) / rounds, result
+
+
+async def timed_async(fn, rounds: int = ROUNDS):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = await fn()
+    return (time.perf_counter() - start) / rounds, result
+
+
+def report(label: str, build: float, content, response_cls):
+    render, response = timed(lambda: response_cls(content=content))
+    total = build + render
+    print(f"  {label:<36} build {build * 1e3:8.3f} ms  render {render * 1e3:8.3f} ms  "
+          f"share {render / total:6.1%}  ({len(response.body):,} bytes)")
+    return response.body
+
+
+def page(data):
+    return {"data": data, "total": len(data), "page": 1, "per_page": len(data), "total_pages": 1}
+
+
+async def run_benchmarks(num_credentials: int = NUM_CREDENTIALS):
+    encoder = f"orjson {orjson.__version__}" if orjson else "stdlib json (orjson not installed)"
+    print(f"--- Response Serialization Benchmarks ({encoder}) ---")
+
+    # 1. Issued credential list
+    creds = list(reversed(seed(num_credentials)))
+    print(f"GET /api/issuer/issued?per_page={num_credentials}:")
+    as_dicts     = timed(lambda: page([record_dict(c) for c in creds]))
+    as_fragments = timed(lambda: page([_credential_json(c) for c in creds]))
+    before = report("before: dicts + JSONResponse", *as_dicts, JSONResponse)
+    report("FastJSONResponse, dicts", *as_dicts, FastJSONResponse)
+    after = report("FastJSONResponse, fragments", *as_fragments, FastJSONResponse)
+    assert before == after, "fragment output differs"
+
+    # 2. Benchmark snapshot with a full history
+    engine = BenchmarkEngine()
+    for _ in range(engine.HISTORY_LIMIT):
+        await engine._run_benchmark_round()
+    print(f"GET /api/benchmarks ({engine.HISTORY_LIMIT} history entries):")
+    before = report("before: dicts + JSONResponse", *await timed_async(engine.get_snapshot), JSONResponse)
+    after = report("FastJSONResponse, fragments",
+                   *await timed_async(lambda: engine.get_snapshot(encoded=True)), FastJSONResponse)
+    # entropyScore is re-sampled per snapshot; the history must match exactly
+    assert json.loads(before)["history"] == json.loads(after)["history"], "fragment output differs"
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_CREDENTIALS
+    asyncio.run(run_benchmarks(n))
@@ -0,0 +1,129 @@
+"""
+Multi-worker store benchmark.
+
+Starts `uvicorn app.main:app --workers N` once per store backend and worker
+count, then drives it from several client processes. Each client loop
+creates a verification request, polls it back and reads the issuer stats,
+each over a fresh connection, so the kernel spreads the three calls over
+the workers and the poll is usually served by a different process than the
+write. (Fresh connections also sidestep a ~40 ms delayed-ACK stall that
+keep-alive connections hit under multi-worker uvicorn here.)
+
+Reported per run: requests/second and "misses" — polls answered 404
+because the worker that served them never saw the write. Misses are
+expected with the per-process memory backend and must be 0 with the shared
+sqlite and shm backends.
+
+    python benchmarks/bench_multiworker.py [seconds_per_run]
+"""
+
+import http.client
+import json
+import multiprocessing
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BACKENDS = ["memory", "sqlite", "shm"]
+WORKER_COUNTS = [1, 2, 4]
+CLIENTS = 8
+SECONDS = 5.0
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(backend: str, workers: int, port: int, data_dir: str) -> subprocess.Popen:
+    env = dict(os.environ, STORE_BACKEND=backend, DATA_DIR=data_dir,
+               STORE_PATH=os.path.join(data_dir, f"store.{backend}"), PYTHONPATH=BACKEND_DIR)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            if call(port, "GET", "/api/verifier/")[0] == 200:
+                # Give the remaining workers a moment to finish their startup hooks
+                time.sleep(1.0 + 0.5 * workers)
+                return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("uvicorn did not come up")
+
+
+def call(port: int, method: str, path: str, body: Optional[bytes] = None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    try:
+        conn.request(method, path, body, {"Content-Type": "application/json"} if body else {})
+        resp = conn.getresponse()
+        return resp.status, resp.read()
+    finally:
+        conn.close()
+
+
+def client(port: int, seconds: float, results) -> None:
+    body = json.dumps({"predicate_key": "age_gt_18"}).encode()
+    ops = misses = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        _, data = call(port, "POST", "/api/verifier/request", body)
+        request_id = json.loads(data)["request"]["id"]
+        status, _ = call(port, "GET", f"/api/verifier/requests/{request_id}")
+        if status == 404:
+            misses += 1
+        call(port, "GET", "/api/issuer/stats")
+        ops += 3
+    results.put((ops, misses))
+
+
+def run(backend: str, workers: int, seconds: float):
+    data_dir = tempfile.mkdtemp(prefix="bench-multiworker-")
+    port = free_port()
+    proc = start_server(backend, workers, port, data_dir)
+    try:
+        results = multiprocessing.Queue()
+        clients = [multiprocessing.Process(target=client, args=(port, seconds, results))
+                   for _ in range(CLIENTS)]
+        start = time.perf_counter()
+        for p in clients:
+            p.start()
+        totals = [results.get() for _ in clients]
+        elapsed = time.perf_counter() - start
+        for p in clients:
+            p.join()
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+        shutil.rmtree(data_dir, ignore_errors=True)
+    ops = sum(t[0] for t in totals)
+    misses = sum(t[1] for t in totals)
+    polls = ops // 3
+    return ops / elapsed, misses, polls
+
+
+def run_benchmarks(seconds: float = SECONDS):
+    print(f"--- Multi-worker Store Benchmarks ({CLIENTS} clients, {seconds:.0f} s per run, "
+          f"{os.cpu_count()} CPUs) ---")
+    print(f"{'backend':<8} {'workers':>7} {'req/s':>9} {'cross-worker misses':>22}")
+    for backend in BACKENDS:
+        for workers in WORKER_COUNTS:
+            rate, misses, polls = run(backend, workers, seconds)
+            print(f"{backend:<8} {workers:>7} {rate:>9.0f} {misses:>12} / {polls:<8}")
+
+
+if __name__ == "__main__":
+    s = float(sys.argv[1]) if len(sys.argv) > 1 else SECONDS
+    run_benchmarks(s)
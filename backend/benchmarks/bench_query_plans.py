@@ -0,0 +1,136 @@
+"""
+Query-plan check for the legacy hospital / provider tables.
+
+Builds a scratch SQLite database at the migration baseline (0001), seeds
+N verification results (default 100,000) spread over providers and
+requests, then for each hot query prints EXPLAIN QUERY PLAN and the time
+per execution, first at the baseline and again after `upgrade head`.
+
+At head every query must use an index. Full scans of the big tables and
+temp B-trees for ORDER BY count as failures (except for sorting the rows
+of a GROUP BY, which are few), and the script exits 1 when any query
+fails, so CI can run it as a check.
+
+    python benchmarks/bench_query_plans.py [num_results]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import exists, insert, select
+
+import database.db as db
+from database.migrations import migrate
+from database.models import Hospital, VerificationRequest, VerificationResult
+from api.provider.routes import _audit_query, _audit_summary_queries, _encode_cursor
+
+NUM_RESULTS = 100_000
+PROVIDERS = 200
+RESULTS_PER_REQUEST = 2
+RUNS = 20
+# Plan lines that mean a query is not served by an index
+BAD_PLAN = ("SCAN verification_results", "SCAN verification_requests", "SCAN hospitals", "USE TEMP B-TREE FOR ORDER BY")
+
+
+def hot_queries(dialect: str):
+    unanswered = ~exists().where(VerificationResult.request_id == VerificationRequest.id)
+    cursor = _encode_cursor(datetime.now() - timedelta(hours=12), "8")
+    totals, per_bucket = _audit_summary_queries("provider-7", dialect)
+    return {
+        "audit page 1":        _audit_query("provider-7"),
+        "audit page (cursor)": _audit_query("provider-7", cursor),
+        "audit summary":       totals,
+        "audit buckets":       per_bucket,
+        "request by id":       select(VerificationRequest).where(VerificationRequest.request_id == "req_00000042"),
+        "hospital by id":      select(Hospital).where(Hospital.hospital_id == "hospital-3"),
+        "request events":      select(VerificationRequest, VerificationResult)
+                               .outerjoin(VerificationResult, VerificationResult.request_id == VerificationRequest.id)
+                               .where(VerificationRequest.request_id == "req_00000042")
+                               .order_by(VerificationResult.verified_at.desc()).limit(1),
+        "purge backfill":      select(VerificationRequest.request_id)
+                               .where(VerificationRequest.expires_at < datetime(2020, 1, 1)).where(unanswered),
+    }
+
+
+def seed(connection, num_results: int) -> None:
+    now = datetime.now()
+    num_requests = num_results // RESULTS_PER_REQUEST
+    connection.execute(insert(Hospital), [
+        {"id": str(uuid.uuid4()), "hospital_id": f"hospital-{i}", "hospital_name": f"Hospital {i}",
+         "public_key": "pk", "private_key_encrypted": "sk"}
+        for i in range(10)
+    ])
+    requests = [
+        {"id": str(uuid.uuid4()), "request_id": f"req_{i:08d}", "provider_id": f"provider-{i % PROVIDERS}",
+         "provider_name": "Bench", "provider_type": "pharmacy", "predicate": {"type": "COMPARISON"},
+         "predicate_human_readable": "Verify age is 18", "expires_at": now + timedelta(minutes=i % 60)}
+        for i in range(num_requests)
+    ]
+    connection.execute(insert(VerificationRequest), requests)
+    connection.execute(insert(VerificationResult), [
+        {"id": str(uuid.uuid4()), "verification_id": f"ver_{i:08d}", "request_id": requests[i % num_requests]["id"],
+         "provider_id": requests[i % num_requests]["provider_id"], "verified": i % 3 != 0,
+         "proof_hash": uuid.uuid4().hex, "verified_at": now - timedelta(seconds=i)}
+        for i in range(num_results)
+    ])
+
+
+def explain(connection, statement):
+    compiled = statement.compile(dialect=connection.dialect)
+    params = tuple(compiled.params[name] for name in compiled.positiontup or ())
+    plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled.string}", params).all()
+    return [row[-1] for row in plan]
+
+
+def measure(connection, statement) -> float:
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        connection.execute(statement).all()
+    return (time.perf_counter() - start) / RUNS * 1e3
+
+
+def report(connection, label: str):
+    print(f"{label}:")
+    failures = []
+    for name, statement in hot_queries(connection.dialect.name).items():
+        plan = explain(connection, statement)
+        ms = measure(connection, statement)
+        bad = [line for line in plan if line.startswith(BAD_PLAN)]
+        if any(line.endswith("FOR GROUP BY") for line in plan):
+            bad = [line for line in bad if not line.endswith("FOR ORDER BY")]
+        print(f"  {name:<19} {ms:9.3f} ms  {'FULL SCAN / SORT' if bad else 'index'}")
+        for line in plan:
+            print(f"      {line}")
+        if bad:
+            failures.append(name)
+    return failures
+
+
+async def run_benchmarks(num_results: int = NUM_RESULTS) -> bool:
+    print(f"--- Query Plan Check ({num_results:,} verification results, {PROVIDERS} providers) ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = db.create_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'plans.db')}")
+        await migrate(engine, "0001")
+        async with engine.begin() as conn:
+            await conn.run_sync(seed, num_results)
+            await conn.exec_driver_sql("ANALYZE")
+        async with engine.connect() as conn:
+            await conn.run_sync(report, "Baseline (0001)")
+        await migrate(engine)
+        async with engine.connect() as conn:
+            failures = await conn.run_sync(report, "Head")
+        await engine.dispose()
+    print("Query plans OK" if not failures else f"Query plans FAILED at head: {', '.join(failures)}")
+    return not failures
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_RESULTS
+    sys.exit(0 if asyncio.run(run_benchmarks(n)) else 1)
@@ -0,0 +1,161 @@
+"""
+Stored-record memory benchmark.
+
+For each stored record type, builds N records (default 1M) in a fresh child
+process and reports the RSS they occupy, scaled to one million records:
+
+  dict     — the record as the plain dict the stores used to hold
+             (Record.to_dict(): same keys, same values)
+  slotted  — the utils.records Record subclass now stored
+
+"built" is the RSS right after creation. "reloaded" is the RSS after a
+pickle round trip, the state after a journal replay or a read from a shared
+store. There every status/type string is a fresh copy unless it is interned.
+
+    python benchmarks/bench_records.py [num_records]
+"""
+
+import gc
+import multiprocessing
+import os
+import pickle
+import sys
+import tempfile
+import uuid
+from datetime import datetime, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+NUM_RECORDS = 1_000_000
+_PAGE = os.sysconf("SC_PAGE_SIZE")
+
+
+def rss() -> int:
+    with open("/proc/self/statm") as fh:
+        return int(fh.read().split()[1]) * _PAGE
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def issuer_credential(i: int):
+    from app.api.issuer.routes import _make_credential, IssueCredentialRequest
+    return _make_credential(IssueCredentialRequest(credential_type="vaccination", attributes={
+        "patient_name":      f"Patient {i}",
+        "date_of_birth":     "1990-01-01",
+        "vaccine_type":      "mRNA",
+        "manufacturer":      "Pfizer",
+        "date_administered": "2024-03-01",
+        "dose_number":       "2",
+    }))
+
+
+def verification_request(i: int):
+    from app.api.verifier.routes import VerificationRequest
+    return VerificationRequest(
+        id           = str(uuid.uuid4()),
+        predicateKey = "age_gt_18",
+        verifierId   = "privaseal-verifier-001",
+        verifierName = "PrivaSeal Verifier",
+        verifierType = "general",
+        status       = "verified",
+        createdAt    = _now(),
+        expiresAt    = _now(),
+        verifiedAt   = _now(),
+        proofHash    = uuid.uuid4().hex[:16],
+    )
+
+
+def privaseal_request(i: int):
+    from app.api.privaseal.routes import PrivaSealRequest
+    return PrivaSealRequest({
+        "id":           str(uuid.uuid4()),
+        "user_id":      str(uuid.uuid4()),
+        "user_name":    f"User {i}",
+        "user_email":   f"user{i}@example.com",
+        "doc_type":     "PASSPORT",
+        "_doc_hash":    uuid.uuid4().hex[:16],
+        "_front_blob":  uuid.uuid4().hex * 2,
+        "_selfie_blob": uuid.uuid4().hex * 2,
+        "status":       "approved",
+        "submitted_at": _now(),
+        "reviewed_at":  _now(),
+        "admin_id":     "admin-root",
+        "privaseal_id": f"PS-{i % 10000:04d}-{i // 10000:04d}",
+    })
+
+
+def privaseal_credential(i: int):
+    from app.api.privaseal.routes import _make_credential
+    user = {"id": str(uuid.uuid4()), "full_name": f"User {i}", "dob": "1990-01-01"}
+    return _make_credential(user, f"PS-{i % 10000:04d}-{i // 10000:04d}")
+
+
+RECORD_TYPES = {
+    "issuer credential":    issuer_credential,
+    "verifier request":     verification_request,
+    "privaseal request":    privaseal_request,
+    "privaseal credential": privaseal_credential,
+}
+
+
+def build(kind: str, form: str, n: int, path: str, results) -> None:
+    make = RECORD_TYPES[kind]
+    make(0)     # imports and one-off allocations outside the measurement
+    gc.collect()
+    base = rss()
+    if form == "dict":
+        records = [make(i).to_dict() for i in range(n)]
+    else:
+        records = [make(i) for i in range(n)]
+    gc.collect()
+    results.put(rss() - base)
+    with open(path, "wb") as fh:
+        pickle.dump(records, fh, protocol=5)
+
+
+def reload(path: str, results) -> None:
+    import app.api.issuer.routes, app.api.verifier.routes, app.api.privaseal.routes   # noqa: F401
+    with open(path, "rb") as fh:
+        data = fh.read()
+    gc.collect()
+    base = rss()
+    records = pickle.loads(data)
+    gc.collect()
+    results.put(rss() - base)
+
+
+def _child(target, *args) -> int:
+    results = multiprocessing.Queue()
+    p = multiprocessing.Process(target=target, args=(*args, results))
+    p.start()
+    out = results.get()
+    p.join()
+    return out
+
+
+def run(kind: str, form: str, n: int):
+    """(built, reloaded) bytes — each in a fresh process, so freed memory is never reused."""
+    fd, path = tempfile.mkstemp(prefix="bench-records-")
+    os.close(fd)
+    try:
+        return _child(build, kind, form, n, path), _child(reload, path)
+    finally:
+        os.unlink(path)
+
+
+def run_benchmarks(num_records: int = NUM_RECORDS):
+    scale = 1_000_000 / num_records
+    print(f"--- Stored Record Memory ({num_records:,} records per run, MB per million) ---")
+    print(f"{'record':<22} {'dict built':>11} {'slotted':>9} {'dict reloaded':>14} {'slotted':>9}")
+    for kind in RECORD_TYPES:
+        d_built, d_reloaded = run(kind, "dict", num_records)
+        s_built, s_reloaded = run(kind, "slotted", num_records)
+        print(f"{kind:<22} {d_built * scale / 1e6:>11.0f} {s_built * scale / 1e6:>9.0f} "
+              f"{d_reloaded * scale / 1e6:>14.0f} {s_reloaded * scale / 1e6:>9.0f}")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_RECORDS
+    run_benchmarks(n)
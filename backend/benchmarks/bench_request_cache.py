@@ -0,0 +1,94 @@
+"""
+Provider request cache benchmark.
+
+Replays the wallet flow through the ASGI app (httpx, in process) against
+a scratch database: a provider creates N requests, then for each one the
+wallet calls GET /api/provider/request/{id} and POST /api/provider/verify.
+It runs once with the request cache disabled (every lookup is a SELECT)
+and once with it on, and reports flows/s, p50 / p99 per flow and the
+number of verification_requests SELECTs issued.
+
+    python benchmarks/bench_request_cache.py [num_requests]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import event
+
+import database.db as db
+from utils.lookup_cache import LRUCache
+
+NUM_REQUESTS = 1_000
+CONCURRENCY = 16
+PREDICATE = {"type": "COMPARISON", "attribute": "age", "operator": "GTE", "value": "18"}
+
+
+async def _flows(client: httpx.AsyncClient, request_ids):
+    latencies = []
+    queue = list(request_ids)
+
+    async def worker():
+        while queue:
+            rid = queue.pop()
+            start = time.perf_counter()
+            await client.get(f"/api/provider/request/{rid}")
+            await client.post("/api/provider/verify", json={
+                "request_id": rid, "proof": "mock_zkp", "revealed_attributes": {"age": 30}, "issuer_public_key": "bench",
+            })
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(CONCURRENCY)])
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return (len(request_ids) / elapsed,
+            latencies[len(latencies) // 2] * 1e3, latencies[int(len(latencies) * 0.99)] * 1e3)
+
+
+async def run_benchmarks(num_requests: int = NUM_REQUESTS):
+    print(f"--- Provider Request Cache Benchmarks ({num_requests:,} GET + verify flows, c={CONCURRENCY}) ---")
+    from app.main import app
+    import api.provider.routes as provider_routes
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = db.create_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        db.AsyncSessionLocal.configure(bind=engine)
+        async with engine.begin() as conn:
+            await conn.run_sync(db.Base.metadata.create_all)
+
+        selects = 0
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            nonlocal selects
+            selects += statement.startswith("SELECT") and "FROM verification_requests" in statement
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            for name, cache in (("uncached", LRUCache(0)), ("cached", LRUCache(provider_routes.REQUEST_CACHE_SIZE,
+                                                                                 ttl=provider_routes.REQUEST_CACHE_TTL))):
+                provider_routes._request_cache = cache
+                request_ids = []
+                for _ in range(num_requests):
+                    r = await client.post("/api/provider/request", json={
+                        "provider_id": "bench-bar", "provider_name": "Bench Bar",
+                        "provider_type": "verifier", "predicate": PREDICATE,
+                    })
+                    request_ids.append(r.json()["request_id"])
+                selects = 0
+                rate, p50, p99 = await _flows(client, request_ids)
+                print(f"  {name:<9} {rate:8,.0f} flows/s  p50 {p50:7.2f} ms  p99 {p99:8.2f} ms  "
+                      f"request SELECTs {selects:>6}  hit rate {cache.stats()['hitRate']:.2f}")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_REQUESTS
+    asyncio.run(run_benchmarks(n))
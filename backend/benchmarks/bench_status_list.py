@@ -0,0 +1,92 @@
+"""
+Revocation status-list benchmark.
+
+Compares a per-record revocation lookup (the old `cred["status"] == "Revoked"`
+path) against a single bit test on a 10M-entry status list, and reports the
+size / encode cost of the published gzip artifact and of an incremental diff.
+
+    python benchmarks/bench_status_list.py [num_credentials]
+"""
+
+import time
+import random
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.status_list import StatusList
+
+NUM_CREDENTIALS = 10_000_000
+REVOKED_FRACTION = 0.01
+NUM_CHECKS = 1_000_000
+
+
+def run_benchmarks(num_credentials: int = NUM_CREDENTIALS):
+    print(f"--- Revocation Status List Benchmarks ({num_credentials:,} credentials) ---")
+    rng = random.Random(42)
+
+    # 1. Allocation
+    sl = StatusList("bench-issuer")
+    start = time.perf_counter()
+    for _ in range(num_credentials):
+        sl.allocate()
+    elapsed = time.perf_counter() - start
+    print(f"Allocate indices: {elapsed:.2f} s ({elapsed / num_credentials * 1e9:.0f} ns/credential)")
+    print(f"Bitstring size: {len(sl.bits) / 1024:.0f} KB")
+
+    # 2. Revoke 1 %
+    revoked = rng.sample(range(num_credentials), int(num_credentials * REVOKED_FRACTION))
+    start = time.perf_counter()
+    for idx in revoked:
+        sl.set_revoked(idx)
+    elapsed = time.perf_counter() - start
+    print(f"Revoke {len(revoked):,}: {elapsed / len(revoked) * 1e9:.0f} ns/revocation")
+
+    # 3. Checks: bit test vs record lookup
+    probes = [rng.randrange(num_credentials) for _ in range(NUM_CHECKS)]
+
+    start = time.perf_counter()
+    hits = 0
+    for idx in probes:
+        hits += sl.is_revoked(idx)
+    bit_ns = (time.perf_counter() - start) / NUM_CHECKS * 1e9
+    print(f"Bit test: {bit_ns:.0f} ns/check ({hits:,} revoked of {NUM_CHECKS:,})")
+
+    # Record lookup baseline on a 1M-record dict store (10M dicts would need ~10 GB)
+    record_count = min(num_credentials, 1_000_000)
+    revoked_set = set(revoked)
+    store = {
+        f"cred-{i}": {"id": f"cred-{i}", "status": "Revoked" if i in revoked_set else "Active"}
+        for i in range(record_count)
+    }
+    keys = [f"cred-{idx % record_count}" for idx in probes]
+    start = time.perf_counter()
+    for key in keys:
+        _ = store[key]["status"] == "Revoked"
+    dict_ns = (time.perf_counter() - start) / NUM_CHECKS * 1e9
+    print(f"Record lookup ({record_count:,} dict store): {dict_ns:.0f} ns/check")
+    del store
+
+    # 4. Publication
+    start = time.perf_counter()
+    gz, etag = sl.encoded()
+    encode_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    sl.encoded()
+    cached_us = (time.perf_counter() - start) * 1e6
+    print(f"Encode gzip artifact: {encode_ms:.1f} ms → {len(gz) / 1024:.0f} KB (etag {etag})")
+    print(f"Cached artifact fetch: {cached_us:.1f} µs")
+
+    # 5. Incremental diff for a verifier 100 revocations behind
+    base = sl.version
+    for idx in rng.sample(range(num_credentials), 100):
+        sl.set_revoked(idx)
+    start = time.perf_counter()
+    changes = sl.diff(base)
+    diff_us = (time.perf_counter() - start) * 1e6
+    print(f"Diff of {len(changes)} changes: {diff_us:.0f} µs (vs {len(gz) / 1024:.0f} KB full download)")
+
+
+if __name__ == "__main__":
+    run_benchmarks(int(sys.argv[1]) if len(sys.argv) > 1 else NUM_CREDENTIALS)
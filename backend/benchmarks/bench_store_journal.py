@@ -0,0 +1,101 @@
+"""
+PrivaSeal store persistence benchmark.
+
+Journals N user records (default 1M), then measures restart time two ways:
+replaying the whole WAL, and loading a snapshot plus a short WAL tail —
+the state a running service is normally in.
+
+    python benchmarks/bench_store_journal.py [num_users]
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.store_journal import StoreJournal
+
+NUM_USERS = 1_000_000
+TAIL_MUTATIONS = 10_000
+
+
+def make_user(i: int):
+    user_id = str(uuid.UUID(int=i))
+    return user_id, {
+        "id":            user_id,
+        "full_name":     f"User {i}",
+        "email":         f"user{i}@example.com",
+        "_pw_hash":      "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08",
+        "dob":           "1990-01-01",
+        "role":          "user",
+        "created_at":    "2024-01-01T00:00:00+00:00",
+        "status":        "active",
+        "docs_uploaded": False,
+    }
+
+
+def restart(directory: str) -> float:
+    users = {}
+    journal = StoreJournal(directory, {"users": users})
+    start = time.perf_counter()
+    journal.load()
+    elapsed = time.perf_counter() - start
+    journal._close_wal(journal._wal)
+    return elapsed, len(users)
+
+
+def dir_size(directory: str) -> int:
+    return sum(os.path.getsize(os.path.join(directory, n)) for n in os.listdir(directory))
+
+
+async def run_benchmarks(num_users: int = NUM_USERS):
+    print(f"--- Store Journal Benchmarks ({num_users:,} users) ---")
+    directory = tempfile.mkdtemp(prefix="bench-journal-")
+    try:
+        users = {}
+        journal = StoreJournal(directory, {"users": users}, snapshot_every=10 ** 12)
+        journal.load()
+
+        # 1. Journal every insert
+        start = time.perf_counter()
+        for i in range(num_users):
+            key, user = make_user(i)
+            users[key] = user
+            journal.put("users", key, user)
+        journal.sync()
+        elapsed = time.perf_counter() - start
+        print(f"Insert + WAL append: {elapsed:.2f} s ({elapsed / num_users * 1e6:.2f} µs/mutation), "
+              f"WAL {dir_size(directory) / 1e6:.0f} MB")
+
+        # 2. Restart from the WAL alone
+        elapsed, count = restart(directory)
+        print(f"Restart, full WAL replay: {elapsed:.2f} s ({count:,} users)")
+
+        # 3. Snapshot, then a short tail of updates
+        start = time.perf_counter()
+        await journal.snapshot()
+        print(f"Snapshot (pickle protocol 5): {time.perf_counter() - start:.2f} s, "
+              f"{dir_size(directory) / 1e6:.0f} MB on disk")
+        for i in range(TAIL_MUTATIONS):
+            key, user = make_user(i)
+            user["status"] = "updated"
+            users[key] = user
+            journal.put("users", key, user)
+        journal.sync()
+
+        # 4. Restart from snapshot + tail
+        elapsed, count = restart(directory)
+        print(f"Restart, snapshot + {TAIL_MUTATIONS:,}-entry WAL tail: {elapsed:.2f} s ({count:,} users)")
+        await journal.stop()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_USERS
+    asyncio.run(run_benchmarks(n))
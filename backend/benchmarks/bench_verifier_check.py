@@ -0,0 +1,140 @@
+"""
+PrivaSeal verifier/check benchmark.
+
+Issues N credentials (default 10k) straight into the store, then measures
+the check path three ways:
+
+  1. Lookup core — ID normalisation + view lookup, QR parsing — against the
+     previous per-request path (urlparse/parse_qs, store get, status-list
+     probe, response dict built from the record).
+  2. The route coroutine itself (audit writer running, no HTTP stack), for
+     a mix of hits, repeated unknown IDs and QR payloads.
+  3. End to end through the ASGI app with httpx, for reference.
+
+    python benchmarks/bench_verifier_check.py [num_credentials]
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+from urllib.parse import urlparse, parse_qs
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from app.main import app
+from app.api.privaseal import routes
+from app.api.privaseal.routes import (
+    VerifierCheckBody, verifier_check, _verifier_view, _qr_privaseal_id,
+    _make_credential, _new_privaseal_id, _persist, _index_privaseal_id, _refresh_verifier_view,
+    _credentials, status_lists, STATUS_LIST_ID,
+)
+
+NUM_CREDENTIALS = 10_000
+LOOKUPS = 200_000
+ROUTE_CALLS = 50_000
+HTTP_CALLS = 2_000
+
+
+def seed(n: int):
+    ids = []
+    for i in range(n):
+        user = {"id": f"bench-user-{i}", "dob": "1990-01-01"}
+        cred = _make_credential(user, _new_privaseal_id())
+        _persist("credentials", cred["privasealId"], cred)
+        _index_privaseal_id(cred["privasealId"])
+        if i % 10 == 0:
+            cred["status"] = "revoked"
+            status_lists.get_or_create(STATUS_LIST_ID).set_revoked(cred["statusListIndex"])
+        _refresh_verifier_view(cred)
+        ids.append(cred["privasealId"])
+    return ids
+
+
+def legacy_check(privaseal_id: str):
+    cred = _credentials.get(privaseal_id.strip().upper())
+    if not cred:
+        return None
+    revoked = status_lists.get_or_create(STATUS_LIST_ID).is_revoked(cred["statusListIndex"])
+    return {
+        "found":             True,
+        "privaseal_id":      privaseal_id,
+        "age_verified":      cred["ageVerified"],
+        "credential_type":   "AGE_VERIFICATION",
+        "issued_by":         "PrivaSeal Authority",
+        "credential_status": cred["status"],
+        "valid":             not revoked and cred["status"] == "active",
+    }
+
+
+def cached_check(privaseal_id: str):
+    view, _ = _verifier_view(privaseal_id.strip().upper())
+    if view is None:
+        return None
+    return {"found": True, "privaseal_id": privaseal_id, **view[0]}
+
+
+def rate(label: str, fn, items) -> float:
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    elapsed = time.perf_counter() - start
+    per_sec = len(items) / elapsed
+    print(f"  {label:<44} {per_sec:>12,.0f} /s  ({elapsed / len(items) * 1e6:.2f} µs)")
+    return per_sec
+
+
+async def run_benchmarks(num_credentials: int = NUM_CREDENTIALS):
+    print(f"--- Verifier Check Benchmarks ({num_credentials:,} credentials) ---")
+    ids = seed(num_credentials)
+    rng = random.Random(7)
+    probes = [rng.choice(ids) for _ in range(LOOKUPS)]
+    qrs = [f"privaseal://verify?id={pid}&v=1" for pid in probes]
+    unknown = [f"PS-ZZZZ-{i % 1000:04d}" for i in range(LOOKUPS)]
+
+    # 1. Lookup core
+    print("Lookup core:")
+    rate("legacy: store get + status list + dict", legacy_check, probes)
+    rate("cached: view lookup + dict", cached_check, probes)
+    rate("legacy: urlparse + parse_qs", lambda q: parse_qs(urlparse(q).query).get("id", [None])[0], qrs)
+    rate("fast QR parser", _qr_privaseal_id, qrs)
+    rate("legacy: unknown ID (store miss)", legacy_check, unknown)
+    rate("cached: unknown ID (negative cache)", cached_check, unknown)
+
+    # 2. Route coroutine, audit writer running
+    routes._audit_writer.start()
+    mix = []
+    for i in range(ROUTE_CALLS):
+        kind = i % 10
+        if kind < 7:
+            mix.append(VerifierCheckBody(privaseal_id=probes[i]))
+        elif kind < 9:
+            mix.append(VerifierCheckBody(qr_data=qrs[i]))
+        else:
+            mix.append(VerifierCheckBody(privaseal_id=unknown[i]))
+    start = time.perf_counter()
+    for body in mix:
+        await verifier_check(body)
+    elapsed = time.perf_counter() - start
+    print(f"Route handler (70% ID, 20% QR, 10% unknown): {ROUTE_CALLS / elapsed:,.0f} checks/s")
+
+    # 3. Full ASGI stack
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        for i in range(HTTP_CALLS):
+            await client.post("/api/privaseal/verifier/check", json={"privaseal_id": probes[i]})
+        elapsed = time.perf_counter() - start
+    print(f"ASGI end to end (httpx, in process): {HTTP_CALLS / elapsed:,.0f} checks/s")
+    await routes._audit_writer.stop()
+
+    stats = (await routes.verifier_metrics()).body.decode()
+    print(f"Cache metrics: {stats}")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_CREDENTIALS
+    asyncio.run(run_benchmarks(n))
@@ -21,6 +21,8 @@ from dataclasses import dataclass, asdict
 from typing import List, Optional, Tuple, Dict, Any
 import logging
 
+from utils.fast_json import encode
+
 logger = logging.getLogger("benchmarks")
 
 
@@ -182,6 +184,7 @@ class BenchmarkEngine:
 
     def __init__(self) -> None:
         self._history: deque = deque(maxlen=self.HISTORY_LIMIT)
+        self._history_json: deque = deque(maxlen=self.HISTORY_LIMIT)   # entries never change: encoded once
         self._throughput: deque = deque(maxlen=self.THROUGHPUT_LIMIT)
         self._lock: Optional[asyncio.Lock] = None   # ← lazy init
         self._running = False
@@ -264,6 +267,7 @@ class BenchmarkEngine:
         lock = self._get_lock()
         async with lock:
             self._history.append(entry)
+            self._history_json.append(encode(asdict(entry)))
             self._throughput.append({
                 "time": now_str,
                 "value": throughput_val,
@@ -298,11 +302,16 @@ class BenchmarkEngine:
     # Public snapshot (NEVER raises — always returns valid data)
     # ------------------------------------------------------------------
 
-    async def get_snapshot(self) -> Dict[str, Any]:
+    async def get_snapshot(self, encoded: bool = False) -> Dict[str, Any]:
+        """
+        Aggregate the rolling history. With `encoded`, history entries are
+        pre-encoded utils.fast_json Fragments for FastJSONResponse.
+        """
         try:
             lock = self._get_lock()
             async with lock:
                 history_list = list(self._history)
+                history_json = list(self._history_json) if encoded else None
                 throughput_list = list(self._throughput)
                 users = self._concurrent_users
 
@@ -328,7 +337,7 @@ class BenchmarkEngine:
                 "p95LatencyMs":     self._p95(total_times),
                 "avgLatencyMs":     round(sum(total_times) / len(total_times), 2),
                 "concurrentUsers":  users,
-                "history":          [asdict(e) for e in history_list],
+                "history":          history_json if encoded else [asdict(e) for e in history_list],
             }
 
         except Exception as exc:
@@ -0,0 +1,79 @@
+"""
+Migration check: every database layout the app may find at startup.
+
+Builds scratch SQLite databases in each layout, runs migrate() on them
+(what the startup hook does) and then `alembic check` (the upgraded schema
+must match the models):
+
+  - empty:           a new database
+  - pre-series:      create_all() from before the audit writer, i.e. the
+                     baseline tables without verifier_audits, no alembic_version
+  - pre-migrations:  create_all() with verifier_audits, no alembic_version
+  - models:          create_all() from the current models, no alembic_version
+
+Exits 1 when any layout fails, so CI can run it.
+
+    python benchmarks/check_migrations.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alembic import command
+
+import database.db as db
+from database.migrations import alembic_config, migrate, upgrade
+
+
+def _pre_migrations(connection) -> None:
+    upgrade(connection, "0001")
+    connection.exec_driver_sql("DROP TABLE alembic_version")
+
+
+def _pre_series(connection) -> None:
+    _pre_migrations(connection)
+    connection.exec_driver_sql("DROP TABLE verifier_audits")
+
+
+LAYOUTS = {
+    "empty":          None,
+    "pre-series":     _pre_series,
+    "pre-migrations": _pre_migrations,
+    "models":         db.Base.metadata.create_all,
+}
+
+
+async def _check(url: str, build) -> None:
+    engine = db.create_engine(url)
+    try:
+        if build is not None:
+            async with engine.begin() as conn:
+                await conn.run_sync(build)
+        await migrate(engine)
+        async with engine.connect() as conn:
+            await conn.run_sync(lambda sync_conn: command.check(alembic_config(sync_conn)))
+    finally:
+        await engine.dispose()
+
+
+async def run_checks() -> bool:
+    print("--- Migration Check ---")
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, build in LAYOUTS.items():
+            try:
+                await _check(f"sqlite+aiosqlite:///{os.path.join(tmp, name + '.db')}", build)
+                print(f"  {name:<15} OK")
+            except Exception as exc:
+                print(f"  {name:<15} FAILED: {exc}")
+                failures.append(name)
+    print("Migrations OK" if not failures else f"Migrations FAILED: {', '.join(failures)}")
+    return not failures
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(run_checks()) else 1)
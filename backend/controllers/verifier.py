@@ -1,29 +1,46 @@
 from fastapi import APIRouter, HTTPException, Depends
 from typing import Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from database.database import get_db
+from database.database import get_db, SessionLocal
 from database.models import VerifierAudit
 from utils.crypto import BBSPlusCrypto
+from utils.audit_writer import AuditWriter
 # Assuming schemas are in the parent directory or accessible via path
 from schemas import ProofSubmission, VerificationResult
 
 router = APIRouter()
 
+
+async def _write_audits(batch):
+    # One transaction per batch instead of one commit per verification
+    async with SessionLocal() as session:
+        session.add_all([VerifierAudit(**entry) for entry in batch])
+        await session.commit()
+
+_audit_writer = AuditWriter("verifier-audit", _write_audits)
+
+@router.on_event("startup")
+async def _start_audit_writer():
+    _audit_writer.start()
+
+@router.on_event("shutdown")
+async def _stop_audit_writer():
+    await _audit_writer.stop()
+
+
 @router.post("/verify", response_model=VerificationResult)
-async def verify_proof(proof_submission: ProofSubmission, db: AsyncSession = Depends(get_db)):
+async def verify_proof(proof_submission: ProofSubmission):
     # In a real implementation, we would fetch the issuer's public key from a trusted registry or the proof itself if it contains a reference
     # For this demo, we assume the proof is self-contained or use a fixed known key (mocked in crypto)
     
     is_valid = BBSPlusCrypto.verify_proof(proof_submission.proof, "mock_public_key", proof_submission.nonce)
     
-    # Log the verification attempt
-    audit_entry = VerifierAudit(
+    # Log the verification attempt (written in batches by the audit writer)
+    await _audit_writer.submit(dict(
         verifier_id=proof_submission.verifier_id,
         predicate_hash=str(hash(str(proof_submission.proof))),  # Simple hash for demo
         verification_result="success" if is_valid else "fail"
-    )
-    db.add(audit_entry)
-    await db.commit()
+    ))
     
     return VerificationResult(
         verified=is_valid,
@@ -34,4 +51,4 @@ async def verify_proof(proof_submission: ProofSubmission, db: AsyncSession = Dep
 async def get_audits(db: AsyncSession = Depends(get_db)):
     # This endpoint is for demo purposes to show the verifier logs
     # Implement query logic if needed
-    return {"message": "Audit logs not implemented yet"}
+    return {"message": "Audit logs not implemented yet", "writer": _audit_writer.stats()}
@@ -1,4 +1,4 @@
-from typing import Dict, Any, Tuple
+from typing import Callable, Dict, Any, Tuple
 import json
 import base64
 
@@ -25,6 +25,18 @@ class BbsMock:
         # Mock signature: sk + payload
         sig_data = f"{sk}:{payload}"
         return base64.b64encode(sig_data.encode()).decode()
+
+    @staticmethod
+    def signer(sk: str) -> Callable[[Dict[str, Any]], str]:
+        # sign() bound to one key: the key material is encoded once, so
+        # callers that keep the signer (the key registry) skip that per call
+        prefix = f"{sk}:".encode()
+
+        def sign(messages: Dict[str, Any]) -> str:
+            payload = json.dumps(messages, sort_keys=True)
+            return base64.b64encode(prefix + payload.encode()).decode()
+
+        return sign
     
     @staticmethod
     def verify_proof(proof: str, pk: str, revealed: Dict[str, Any]) -> bool:
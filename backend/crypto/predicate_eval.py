@@ -1,4 +1,39 @@
 from datetime import datetime
+import operator
+
+# COMPARISON predicates (the form the provider / verifier APIs send) name the
+# check in "operator"; compile() maps them onto the evaluator's types.
+COMPARISON_OPERATORS = {
+    "GT": "GREATER_THAN",   ">":  "GREATER_THAN",
+    "GTE": "GREATER_EQUAL", ">=": "GREATER_EQUAL",
+    "LT": "LESS_THAN",      "<":  "LESS_THAN",
+    "LTE": "LESS_EQUAL",    "<=": "LESS_EQUAL",
+    "EQ": "EQUAL",          "==": "EQUAL",  "=": "EQUAL",
+    "NE": "NOT_EQUAL",      "!=": "NOT_EQUAL",
+}
+
+_COMPARE = {
+    "EQUAL":         operator.eq,
+    "NOT_EQUAL":     operator.ne,
+    "GREATER_THAN":  operator.gt,
+    "LESS_THAN":     operator.lt,
+    "GREATER_EQUAL": operator.ge,
+    "LESS_EQUAL":    operator.le,
+}
+
+class CompiledPredicate:
+    """
+    A predicate turned into nested closures by PredicateEvaluator.compile().
+    Call it with the attributes; `attributes` names the ones it reads.
+    """
+    __slots__ = ("attributes", "_fn")
+
+    def __init__(self, fn, attributes: frozenset):
+        self._fn = fn
+        self.attributes = attributes
+
+    def __call__(self, attributes: dict) -> bool:
+        return self._fn(attributes)
 
 class PredicateEvaluator:
     """
@@ -136,3 +171,84 @@ class PredicateEvaluator:
             return (value_str.lower() == "true"), target_val
         # Date handling could be added here (ISO 8601 string comparison works lexicographically usually)
         return str(value_str), str(target_val)
+
+    @staticmethod
+    def compile(predicate: dict) -> CompiledPredicate:
+        """
+        Compile a predicate once for repeated evaluation: the type dispatch
+        and operator lookup happen here, not on every call. Results match
+        evaluate(); COMPARISON predicates are accepted as well. Raises
+        ValueError for predicates it cannot evaluate.
+        """
+        attributes = set()
+        fn = PredicateEvaluator._compile(predicate, attributes)
+        return CompiledPredicate(fn, frozenset(attributes))
+
+    @staticmethod
+    def _compile(predicate: dict, attributes: set):
+        if not isinstance(predicate, dict):
+            raise ValueError("Predicate must be a dictionary")
+        p_type = str(predicate.get("type", "")).upper()
+        comparison = p_type == "COMPARISON"
+        if comparison:
+            op = str(predicate.get("operator", "")).upper()
+            if op not in COMPARISON_OPERATORS:
+                raise ValueError(f"Unknown comparison operator: {op}")
+            p_type = COMPARISON_OPERATORS[op]
+
+        if p_type in ["AND", "OR"]:
+            subs = [PredicateEvaluator._compile(sub, attributes) for sub in predicate.get("predicates", [])]
+            combine = all if p_type == "AND" else any
+            return lambda attrs: combine(sub(attrs) for sub in subs)
+
+        if p_type == "NOT":
+            sub = PredicateEvaluator._compile(predicate.get("predicate", {}), attributes)
+            return lambda attrs: not sub(attrs)
+
+        attr_name = predicate.get("attribute")
+        if not attr_name:
+            raise ValueError(f"{p_type} requires 'attribute'")
+        target = predicate.get("value")
+        if comparison and isinstance(target, str):
+            # The APIs send numbers as strings ("21"); compare them as numbers
+            target = PredicateEvaluator._parse_number(target)
+
+        coerce = PredicateEvaluator._coerce_types
+        if p_type in _COMPARE:
+            compare = _COMPARE[p_type]
+            def check(value):
+                val_typed, target_typed = coerce(value, target)
+                return compare(val_typed, target_typed)
+        elif p_type == "BETWEEN":
+            min_val, max_val = predicate.get("min"), predicate.get("max")
+            def check(value):
+                val_typed, min_typed = coerce(value, min_val)
+                _, max_typed = coerce(value, max_val)
+                return min_typed <= val_typed <= max_typed
+        elif p_type in ["IN", "NOT_IN"]:
+            if not isinstance(target, list):
+                raise ValueError(f"{p_type} requires 'value' list")
+            negate = p_type == "NOT_IN"
+            def check(value):
+                return (coerce(value, target)[0] in target) != negate
+        else:
+            raise ValueError(f"Unknown predicate type: {p_type}")
+
+        attributes.add(attr_name)
+        def leaf(attrs):
+            if attr_name not in attrs:
+                return False # Attribute missing = fail
+            try:
+                return check(attrs[attr_name])
+            except (ValueError, TypeError):
+                return False
+        return leaf
+
+    @staticmethod
+    def _parse_number(text: str):
+        for parse in (int, float):
+            try:
+                return parse(text)
+            except ValueError:
+                pass
+        return text
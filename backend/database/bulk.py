@@ -0,0 +1,57 @@
+"""
+Bulk inserts
+============
+`bulk_insert(session, Model, rows)` writes many rows in one round trip:
+
+  - Postgres (asyncpg): COPY ... FROM STDIN in binary format, which skips
+    per-row parsing and planning. It joins the session's transaction when
+    one is open on the connection; otherwise the COPY is a single atomic
+    statement on its own.
+  - Anything else: one executemany INSERT (sqlite3 reuses the prepared
+    statement for every row).
+
+Rows are plain dicts with the same keys. Column defaults are applied here
+for the columns a row leaves out, but server defaults are not (COPY does
+not return rows), so callers fill ids and timestamps themselves.
+"""
+
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def _with_defaults(model, rows: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    defaults = {
+        column.key: column.default
+        for column in model.__table__.columns
+        if column.default is not None and column.key not in rows[0]
+    }
+    if not defaults:
+        return list(rows)
+    filled = []
+    for row in rows:
+        row = dict(row)
+        for key, default in defaults.items():
+            row[key] = default.arg(None) if default.is_callable else default.arg
+        filled.append(row)
+    return filled
+
+
+async def bulk_insert(session: AsyncSession, model, rows: Sequence[Dict[str, Any]]) -> int:
+    """Insert `rows` into `model`'s table; returns the number of rows written."""
+    if not rows:
+        return 0
+    rows = _with_defaults(model, rows)
+    connection = await session.connection()
+    if connection.dialect.driver == "asyncpg":
+        columns = list(rows[0])
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            model.__tablename__,
+            records=[tuple(row[c] for c in columns) for row in rows],
+            columns=columns,
+        )
+    else:
+        await session.execute(insert(model), rows)
+    return len(rows)
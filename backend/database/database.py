@@ -1,15 +1,5 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker, declarative_base
+# Kept for the modules that still import `database.database`. It used to
+# open a second engine on ./test.db; everything now shares database/db.py.
+from database.db import engine, AsyncSessionLocal as SessionLocal, Base, get_db
 
-SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
-
-engine = create_async_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=AsyncSession)
-
-Base = declarative_base()
-
-async def get_db():
-    async with SessionLocal() as session:
-        yield session
+__all__ = ["engine", "SessionLocal", "Base", "get_db"]
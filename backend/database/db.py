@@ -1,11 +1,112 @@
+"""
+Database engine and sessions
+============================
+One async engine for the MediGuard tables, built from app.config settings
+(DATABASE_URL and the DB_* / SQLITE_* knobs). database/database.py used to
+create a second engine on its own file and now re-exports this module.
+
+  - Connections are pooled (DB_POOL_SIZE + DB_MAX_OVERFLOW). SQLAlchemy's
+    default for aiosqlite files is NullPool, which opened a new connection
+    and worker thread per session. Each pooled aiosqlite connection keeps
+    its (non-daemon) thread, so scripts that use the engine outside the
+    app's lifespan must `await engine.dispose()` before exiting.
+  - Every new SQLite connection gets the performance pragmas: WAL journal
+    (readers never block the writer), synchronous=NORMAL (fsync only at
+    checkpoints, still crash-safe under WAL), mmap_size, a larger page
+    cache, an in-memory temp store and a busy timeout, so concurrent
+    writers wait instead of failing with "database is locked".
+  - Prepared statements are reused: sqlite3 keeps a per-connection
+    statement cache (SQLITE_STATEMENT_CACHE), and pooled connections keep
+    it warm. SQLAlchemy caches compiled SQL (query_cache_size).
+  - Postgres is first-class: a postgres:// or postgresql:// DATABASE_URL
+    runs on asyncpg with a larger pool, pre-ping, recycling and
+    PG_STATEMENT_CACHE_SIZE prepared statements per connection.
+"""
+
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
-SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./zkp_credentials.db"
+from app.config import settings
 
-engine = create_async_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}, echo=False
-)
+
+def async_url(url: str) -> str:
+    """Route plain postgres:// / postgresql:// URLs to the asyncpg driver."""
+    parsed = make_url(url)
+    if parsed.drivername in ("postgres", "postgresql"):
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+    return parsed.render_as_string(hide_password=False)
+
+
+SQLALCHEMY_DATABASE_URL = async_url(settings.DATABASE_URL)
+
+
+def sqlite_pragmas() -> Dict[str, Any]:
+    return {
+        "journal_mode": "WAL",
+        "synchronous":  settings.SQLITE_SYNCHRONOUS,
+        "mmap_size":    settings.SQLITE_MMAP_SIZE,
+        "cache_size":   -settings.SQLITE_CACHE_SIZE_KB,   # negative: KiB, not pages
+        "temp_store":   "MEMORY",
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+    }
+
+
+def _engine_options(url: str) -> Dict[str, Any]:
+    options: Dict[str, Any] = {
+        "echo":             settings.DB_ECHO,
+        "query_cache_size": 1200,
+    }
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite":
+        options.update(pool_size=settings.DB_POOL_SIZE, max_overflow=settings.DB_MAX_OVERFLOW,
+                       pool_timeout=settings.DB_POOL_TIMEOUT, pool_recycle=settings.DB_POOL_RECYCLE,
+                       pool_pre_ping=True)
+        if parsed.get_driver_name() == "asyncpg":
+            options["connect_args"] = {
+                "statement_cache_size": settings.PG_STATEMENT_CACHE_SIZE,
+                # Short OLTP queries: JIT compilation costs more than it saves
+                "server_settings":      {"application_name": settings.PROJECT_NAME, "jit": "off"},
+            }
+        return options
+    options["connect_args"] = {
+        "check_same_thread": False,
+        "timeout":           settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        "cached_statements": settings.SQLITE_STATEMENT_CACHE,
+    }
+    if parsed.database not in (None, "", ":memory:"):
+        options.update(poolclass=AsyncAdaptedQueuePool, pool_size=settings.DB_POOL_SIZE,
+                       max_overflow=settings.DB_MAX_OVERFLOW, pool_timeout=settings.DB_POOL_TIMEOUT)
+    return options
+
+
+def create_engine(url: str = SQLALCHEMY_DATABASE_URL):
+    """Engine for `url` with the pool and (for SQLite) pragma setup above."""
+    url = async_url(url)
+    if make_url(url).get_driver_name() == "asyncpg":
+        # SQLAlchemy's own prepared-statement LRU in front of asyncpg
+        url = make_url(url).update_query_dict(
+            {"prepared_statement_cache_size": str(settings.PG_STATEMENT_CACHE_SIZE)}
+        ).render_as_string(hide_password=False)
+    engine = create_async_engine(url, **_engine_options(url))
+    if engine.dialect.name == "sqlite":
+        pragmas = sqlite_pragmas()
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def _set_sqlite_pragmas(dbapi_connection, _record):
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
+    return engine
+
+
+engine = create_engine()
 
 AsyncSessionLocal = sessionmaker(
     bind=engine,
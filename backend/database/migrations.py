@@ -0,0 +1,49 @@
+"""
+Schema migrations at startup
+============================
+migrate() brings the database to the newest Alembic revision
+(migrations/versions) over one of the app's own connections.
+
+A database built before migrations existed has the tables but no
+alembic_version row. It is stamped first: at the baseline when it still
+has the old create_all() layout (ix_hospitals_id), at head when
+create_all() built it from the current models.
+"""
+
+import os
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+BASELINE = "0001"
+
+
+def alembic_config(connection: Connection = None) -> Config:
+    config = Config(ALEMBIC_INI)
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+def upgrade(connection: Connection, revision: str = "head") -> None:
+    """Synchronous; run it with AsyncConnection.run_sync."""
+    config = alembic_config(connection)
+    if MigrationContext.configure(connection).get_current_revision() is None:
+        inspector = inspect(connection)
+        if inspector.has_table("hospitals"):
+            legacy = any(ix["name"] == "ix_hospitals_id" for ix in inspector.get_indexes("hospitals"))
+            command.stamp(config, BASELINE if legacy else "head")
+    command.upgrade(config, revision)
+
+
+def downgrade(connection: Connection, revision: str) -> None:
+    command.downgrade(alembic_config(connection), revision)
+
+
+async def migrate(engine, revision: str = "head") -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(upgrade, revision)
@@ -6,15 +6,33 @@ import uuid
 # Using string for UUID in SQLite
 from .db import Base
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, JSON, Index
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.sql import func
 import uuid
 from .db import Base
 
+# SQLite's CURRENT_TIMESTAMP writes whole seconds ("2024-03-01 12:00:00"),
+# while bound datetimes get ".000000" appended. Comparing the two as text
+# puts a stored value *below* an equal bound one, which breaks keyset
+# cursors and since/until filters. Timestamps compared in queries bind in
+# the stored format.
+ServerTimestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"),
+    "sqlite",
+)
+
+# Predicates are JSONB on Postgres (binary, indexable with GIN), JSON text elsewhere
+PredicateJSON = JSON().with_variant(postgresql.JSONB(), "postgresql")
+
+# Indexes are declared here (for create_all) and created by the Alembic
+# migrations in migrations/versions; keep both in step. Primary keys and
+# unique columns are already indexed by the database itself.
+
 class Hospital(Base):
     __tablename__ = "hospitals"
     
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     hospital_id = Column(String, unique=True, nullable=False)
     hospital_name = Column(String, nullable=False)
     public_key = Column(Text, nullable=False)
@@ -24,7 +42,7 @@ class Hospital(Base):
 class IssuedCredential(Base):
     __tablename__ = "issued_credentials"
     
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     credential_id = Column(String, unique=True, nullable=False)
     hospital_id = Column(String, ForeignKey("hospitals.id"))
     credential_type = Column(String(50), nullable=False) # 'vaccination', 'prescription', 'blood_type'
@@ -34,36 +52,57 @@ class IssuedCredential(Base):
 
 class VerificationRequest(Base):
     __tablename__ = "verification_requests"
+    __table_args__ = (
+        Index("ix_verification_requests_expires_at", "expires_at"),   # purge of unanswered requests
+        # Containment queries on predicates (predicate @> '{"attribute": "age"}'), Postgres only
+        Index("ix_verification_requests_predicate", "predicate", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
     
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     request_id = Column(String, unique=True, nullable=False)
     provider_id = Column(String, nullable=False)
     provider_name = Column(String, nullable=False)
     provider_type = Column(String(50)) # 'pharmacy', 'insurance', 'lab'
-    predicate = Column(JSON, nullable=False) # Store complex predicate as JSON
+    predicate = Column(PredicateJSON, nullable=False) # Store complex predicate as JSON
     predicate_human_readable = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     expires_at = Column(DateTime(timezone=True))
 
 class VerificationResult(Base):
     __tablename__ = "verification_results"
+    __table_args__ = (
+        # Provider audit / export / summary: range scan in (verified_at, id)
+        # order, which is also the keyset pagination order; no sort
+        Index("ix_verification_results_provider_id_verified_at_id", "provider_id", "verified_at", "id"),
+        # Join from requests (events, purge NOT EXISTS), newest first
+        Index("ix_verification_results_request_id_verified_at", "request_id", "verified_at"),
+    )
     
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     verification_id = Column(String, unique=True, nullable=False)
     request_id = Column(String, ForeignKey("verification_requests.id"))
     provider_id = Column(String, nullable=False)
     verified = Column(Boolean, nullable=False)
     error_code = Column(String(50))
     proof_hash = Column(String(64))
-    verified_at = Column(DateTime(timezone=True), server_default=func.now())
+    verified_at = Column(ServerTimestamp, server_default=func.now())
 
 class PerformanceMetric(Base):
     __tablename__ = "performance_metrics"
     
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     operation_type = Column(String(50))  # 'issue', 'prove', 'verify'
     duration_ms = Column(Integer)
     proof_size_bytes = Column(Integer)
     attribute_count = Column(Integer)
     predicate_complexity = Column(Integer)
     recorded_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class VerifierAudit(Base):
+    __tablename__ = "verifier_audits"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    verifier_id = Column(String, nullable=False)
+    predicate_hash = Column(String(64))
+    verification_result = Column(String(20))  # 'success', 'fail'
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from database.db import engine, Base
+from database.db import engine
+from database.migrations import migrate
 from api.hospital.routes import router as hospital_router
 from api.provider.routes import router as provider_router
 from api.benchmarks.routes import router as benchmarks_router
@@ -18,14 +19,14 @@ app.add_middleware(
 
 @app.on_event("startup")
 async def startup_db_client():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    await migrate(engine)
     # Start the background benchmark simulation engine
     benchmark_engine.start()
 
 @app.on_event("shutdown")
 async def shutdown_benchmark_engine():
     await benchmark_engine.stop()
+    await engine.dispose()
 
 # MediGuard API Routes
 app.include_router(hospital_router, prefix="/api/hospital", tags=["Hospital (Issuer)"])
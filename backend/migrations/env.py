@@ -0,0 +1,79 @@
+"""
+Alembic environment for the MediGuard tables.
+
+Two ways in:
+  - the `alembic` CLI: connects to settings.DATABASE_URL with its own engine;
+  - database/migrations.py: the app passes the connection it already holds
+    in config.attributes["connection"], so migrations run inside that
+    transaction and the app's logging is left alone.
+"""
+
+import asyncio
+from logging.config import fileConfig
+
+from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from alembic import context
+
+from app.config import settings
+from database.db import Base, async_url
+import database.models  # noqa: F401  (registers the tables on Base.metadata)
+
+config = context.config
+target_metadata = Base.metadata
+
+
+def _include_object(obj, name, type_, reflected, compare_to) -> bool:
+    """Skip dialect-only DDL (e.g. the Postgres GIN index) on other backends."""
+    ddl_if = getattr(obj, "_ddl_if", None)
+    if ddl_if is None or ddl_if.dialect is None:
+        return True
+    dialect = context.get_context().dialect.name
+    return dialect in ((ddl_if.dialect,) if isinstance(ddl_if.dialect, str) else ddl_if.dialect)
+
+
+def _configure(**kwargs) -> None:
+    context.configure(
+        target_metadata=target_metadata,
+        render_as_batch=True,       # SQLite cannot ALTER most things in place
+        compare_type=True,
+        include_object=_include_object,
+        **kwargs,
+    )
+
+
+def run_migrations_offline() -> None:
+    _configure(url=async_url(settings.DATABASE_URL), literal_binds=True, dialect_opts={"paramstyle": "named"})
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection) -> None:
+    _configure(connection=connection)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_async_migrations() -> None:
+    connectable = create_async_engine(async_url(settings.DATABASE_URL), poolclass=pool.NullPool)
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+    await connectable.dispose()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        do_run_migrations(connection)
+        return
+    if config.config_file_name is not None:
+        fileConfig(config.config_file_name)
+    asyncio.run(run_async_migrations())
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
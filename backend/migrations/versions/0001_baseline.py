@@ -0,0 +1,94 @@
+"""Baseline: the tables as create_all() built them before migrations
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+
+Databases created by earlier versions are stamped at this revision on
+first startup (database/migrations.py) instead of being re-created.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("hospitals", "issued_credentials", "verification_requests",
+          "verification_results", "performance_metrics", "verifier_audits")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "hospitals",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("hospital_id", sa.String(), nullable=False, unique=True),
+        sa.Column("hospital_name", sa.String(), nullable=False),
+        sa.Column("public_key", sa.Text(), nullable=False),
+        sa.Column("private_key_encrypted", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_table(
+        "issued_credentials",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("credential_id", sa.String(), nullable=False, unique=True),
+        sa.Column("hospital_id", sa.String(), sa.ForeignKey("hospitals.id")),
+        sa.Column("credential_type", sa.String(50), nullable=False),
+        sa.Column("credential_hash", sa.String(64), nullable=False),
+        sa.Column("attributes_count", sa.Integer()),
+        sa.Column("issued_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_table(
+        "verification_requests",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("request_id", sa.String(), nullable=False, unique=True),
+        sa.Column("provider_id", sa.String(), nullable=False),
+        sa.Column("provider_name", sa.String(), nullable=False),
+        sa.Column("provider_type", sa.String(50)),
+        sa.Column("predicate", sa.JSON(), nullable=False),
+        sa.Column("predicate_human_readable", sa.Text()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("expires_at", sa.DateTime(timezone=True)),
+    )
+    op.create_table(
+        "verification_results",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("verification_id", sa.String(), nullable=False, unique=True),
+        sa.Column("request_id", sa.String(), sa.ForeignKey("verification_requests.id")),
+        sa.Column("provider_id", sa.String(), nullable=False),
+        sa.Column("verified", sa.Boolean(), nullable=False),
+        sa.Column("error_code", sa.String(50)),
+        sa.Column("proof_hash", sa.String(64)),
+        sa.Column("verified_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_table(
+        "performance_metrics",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("operation_type", sa.String(50)),
+        sa.Column("duration_ms", sa.Integer()),
+        sa.Column("proof_size_bytes", sa.Integer()),
+        sa.Column("attribute_count", sa.Integer()),
+        sa.Column("predicate_complexity", sa.Integer()),
+        sa.Column("recorded_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_table(
+        "verifier_audits",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("verifier_id", sa.String(), nullable=False),
+        sa.Column("predicate_hash", sa.String(64)),
+        sa.Column("verification_result", sa.String(20)),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    # `index=True` on every primary key (dropped again in 0002)
+    for table in TABLES:
+        op.create_index(f"ix_{table}_id", table, ["id"])
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.drop_table(table)
@@ -0,0 +1,68 @@
+"""Indexes for provider audit and request lookups
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+
+  - verification_results (provider_id, verified_at): the provider audit and
+    export become an index range scan in verified_at order (no full scan,
+    no sort).
+  - verification_results (request_id, verified_at): the join from a request
+    to its results (request events, the purge's NOT EXISTS).
+  - verification_requests (expires_at): the startup purge of unanswered
+    requests.
+  - The ix_<table>_id indexes duplicated the primary keys' own index; every
+    insert paid for both.
+
+request_id, hospital_id, verification_id and credential_id are already
+indexed by their UNIQUE constraints.
+
+Databases stamped at 0001 may predate verifier_audits (the audit writer
+added it shortly before migrations existed), so it is created here when
+missing and only the ix_<table>_id indexes that exist are dropped.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PRIMARY_KEY_INDEXES = ("hospitals", "issued_credentials", "verification_requests",
+                       "verification_results", "performance_metrics", "verifier_audits")
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("verifier_audits"):
+        op.create_table(
+            "verifier_audits",
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column("verifier_id", sa.String(), nullable=False),
+            sa.Column("predicate_hash", sa.String(64)),
+            sa.Column("verification_result", sa.String(20)),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+    op.create_index("ix_verification_results_provider_id_verified_at",
+                    "verification_results", ["provider_id", "verified_at"])
+    op.create_index("ix_verification_results_request_id_verified_at",
+                    "verification_results", ["request_id", "verified_at"])
+    op.create_index("ix_verification_requests_expires_at", "verification_requests", ["expires_at"])
+    for table in PRIMARY_KEY_INDEXES:
+        if any(ix["name"] == f"ix_{table}_id" for ix in inspector.get_indexes(table)):
+            op.drop_index(f"ix_{table}_id", table_name=table)
+    # Fresh statistics so the planner prefers the new indexes right away
+    op.execute("ANALYZE")
+
+
+def downgrade() -> None:
+    for table in PRIMARY_KEY_INDEXES:
+        op.create_index(f"ix_{table}_id", table, ["id"])
+    op.drop_index("ix_verification_requests_expires_at", table_name="verification_requests")
+    op.drop_index("ix_verification_results_request_id_verified_at", table_name="verification_results")
+    op.drop_index("ix_verification_results_provider_id_verified_at", table_name="verification_results")
@@ -0,0 +1,33 @@
+"""Keyset index for the provider audit
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+
+The provider audit pages by (verified_at, id) and verified_at has
+one-second resolution, so id breaks the ties. With id in the index the
+cursor condition is part of the index range, and page queries never sort.
+The new index replaces (provider_id, verified_at), which it covers.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_verification_results_provider_id_verified_at_id",
+                    "verification_results", ["provider_id", "verified_at", "id"])
+    op.drop_index("ix_verification_results_provider_id_verified_at", table_name="verification_results")
+
+
+def downgrade() -> None:
+    op.create_index("ix_verification_results_provider_id_verified_at",
+                    "verification_results", ["provider_id", "verified_at"])
+    op.drop_index("ix_verification_results_provider_id_verified_at_id", table_name="verification_results")
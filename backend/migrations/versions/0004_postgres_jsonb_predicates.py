@@ -0,0 +1,40 @@
+"""Postgres: JSONB predicates with a GIN index
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+
+On Postgres, verification_requests.predicate becomes JSONB. JSONB is
+stored parsed, so reads skip re-parsing, and it can be GIN-indexed for
+containment queries (predicate @> '{"attribute": "age"}'). SQLite keeps
+JSON text, so this revision does nothing there.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.alter_column("verification_requests", "predicate", type_=postgresql.JSONB(),
+                    existing_type=sa.JSON(), existing_nullable=False, postgresql_using="predicate::jsonb")
+    op.create_index("ix_verification_requests_predicate", "verification_requests", ["predicate"],
+                    postgresql_using="gin")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.drop_index("ix_verification_requests_predicate", table_name="verification_requests")
+    op.alter_column("verification_requests", "predicate", type_=sa.JSON(),
+                    existing_type=postgresql.JSONB(), existing_nullable=False, postgresql_using="predicate::json")
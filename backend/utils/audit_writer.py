@@ -0,0 +1,171 @@
+"""
+Asynchronous batched audit writer
+=================================
+Handlers hand audit entries to a bounded asyncio.Queue and return; one
+background task drains the queue and passes whole batches to a sink
+(segment-log append, DB insert + single commit, ...).
+
+  - Fast path: put_nowait, no I/O on the request path.
+  - Backpressure: when the queue is full the producer waits (up to
+    `max_wait` seconds) for the writer to catch up instead of growing memory
+    without bound; each such wait is counted as an overflow.
+  - An entry that still finds the queue full after `max_wait` is dropped and
+    counted, and a warning is logged.
+  - Entries are written in submission order; stop() drains what is queued.
+  - With `linger` > 0 the writer waits up to that long after the first entry
+    of a batch for more to arrive (or for `batch_size`), trading a little
+    latency for fewer, larger writes.
+
+A sink may be sync (run in the threadpool) or async (awaited on the loop).
+"""
+
+from fastapi.concurrency import run_in_threadpool
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+import asyncio
+import inspect
+import logging
+import time
+
+logger = logging.getLogger("audit_writer")
+
+_STOP = object()
+
+AuditSink = Callable[[List[Any]], Union[None, Awaitable[None]]]
+
+
+class AuditWriter:
+    """
+    Like ExpirySweeper, start() must be called from inside the running loop.
+    """
+
+    def __init__(
+        self,
+        name:           str,
+        sink:           AuditSink,
+        queue_size:     int = 10_000,
+        batch_size:     int = 500,
+        max_wait:       float = 1.0,
+        linger:         float = 0.0,
+    ) -> None:
+        self.name       = name
+        self.sink       = sink
+        self.batch_size = batch_size
+        self.max_wait   = max_wait
+        self.linger     = linger
+        self.queue: "asyncio.Queue[Any]" = asyncio.Queue(queue_size)
+        self._async_sink = inspect.iscoroutinefunction(sink)
+        self._running = False
+        self._task: Optional[asyncio.Task] = None   # type: ignore[type-arg]
+        # Metrics
+        self.submitted_total = 0
+        self.written_total   = 0
+        self.batches_total   = 0
+        self.overflow_total  = 0
+        self.dropped_total   = 0
+        self.failed_total    = 0
+        self.max_batch       = 0
+        self.last_write_ms   = 0.0
+
+    async def submit(self, entry: Any) -> bool:
+        """Queue one entry. Returns False if it had to be dropped."""
+        try:
+            self.queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            self.overflow_total += 1
+            try:
+                await asyncio.wait_for(self.queue.put(entry), self.max_wait)
+            except asyncio.TimeoutError:
+                self.dropped_total += 1
+                logger.warning(f"AuditWriter[{self.name}] queue full for {self.max_wait}s — entry dropped")
+                return False
+        self.submitted_total += 1
+        return True
+
+    def start(self) -> None:
+        if not self._running:
+            self._running = True
+            self._task = asyncio.create_task(self._run_loop())
+            logger.info(f"AuditWriter[{self.name}] started.")
+
+    async def stop(self) -> None:
+        """Write everything submitted so far, then stop the task."""
+        if self._running and self._task:
+            # The sentinel queues behind pending entries, so nothing is cut off mid-batch
+            await self.queue.put(_STOP)
+            await self._task
+        self._running = False
+        await self.flush()
+
+    async def flush(self) -> int:
+        """Write everything queued right now; returns the number of entries written."""
+        written = 0
+        while not self.queue.empty():
+            written += await self._write(self._take_batch([]))
+        return written
+
+    def _take_batch(self, batch: List[Any]) -> List[Any]:
+        while len(batch) < self.batch_size and (not batch or batch[-1] is not _STOP):
+            try:
+                batch.append(self.queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def _fill(self, batch: List[Any]) -> List[Any]:
+        """Keep taking entries until the batch is full or `linger` has passed."""
+        deadline = time.monotonic() + self.linger
+        while len(batch) < self.batch_size and batch[-1] is not _STOP:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+            self._take_batch(batch)
+        return batch
+
+    async def _write(self, batch: List[Any]) -> int:
+        if not batch:
+            return 0
+        start = time.perf_counter()
+        try:
+            if self._async_sink:
+                await self.sink(batch)
+            else:
+                await run_in_threadpool(self.sink, batch)
+        except Exception as exc:
+            self.failed_total += len(batch)
+            logger.error(f"AuditWriter[{self.name}] failed to write {len(batch)} entries: {exc}", exc_info=True)
+            return 0
+        self.last_write_ms = (time.perf_counter() - start) * 1000
+        self.written_total += len(batch)
+        self.batches_total += 1
+        self.max_batch = max(self.max_batch, len(batch))
+        return len(batch)
+
+    async def _run_loop(self) -> None:
+        while True:
+            batch = self._take_batch([await self.queue.get()])
+            if self.linger > 0:
+                batch = await self._fill(batch)
+            stopping = batch[-1] is _STOP
+            if stopping:
+                batch.pop()
+            await self._write(batch)
+            if stopping:
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued":      self.queue.qsize(),
+            "capacity":    self.queue.maxsize,
+            "submitted":   self.submitted_total,
+            "written":     self.written_total,
+            "batches":     self.batches_total,
+            "maxBatch":    self.max_batch,
+            "overflows":   self.overflow_total,
+            "dropped":     self.dropped_total,
+            "failed":      self.failed_total,
+            "lastWriteMs": round(self.last_write_ms, 3),
+        }
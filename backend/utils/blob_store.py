@@ -0,0 +1,111 @@
+"""
+Content-addressed blob store
+============================
+Binary payloads (identity-document images) live on disk under their sha256
+digest instead of as base64 text in the in-memory stores:
+
+    <root>/ab/cd/abcdef…   (two levels of fan-out keep directories small)
+
+Identical uploads are stored once. Writes go to a temp file in the same
+directory and are renamed into place, so a crashed write never leaves a
+half-written blob under a valid digest.
+"""
+
+from typing import Optional
+import hashlib
+import os
+import re
+import tempfile
+
+_DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+
+# Magic-byte prefixes → media type, for serving blobs without a metadata file
+_MAGIC = (
+    (b"\xff\xd8\xff",      "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a",            "image/gif"),
+    (b"GIF89a",            "image/gif"),
+    (b"%PDF",              "application/pdf"),
+)
+
+
+def sniff_media_type(head: bytes) -> str:
+    for magic, media_type in _MAGIC:
+        if head.startswith(magic):
+            return media_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return "application/octet-stream"
+
+
+class BlobStore:
+    def __init__(self, root: str) -> None:
+        self.root = root
+
+    def path(self, digest: str) -> str:
+        if not _DIGEST_RE.match(digest or ""):
+            raise ValueError(f"invalid blob digest: {digest!r}")
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def exists(self, digest: str) -> bool:
+        try:
+            return os.path.exists(self.path(digest))
+        except ValueError:
+            return False
+
+    def size(self, digest: str) -> int:
+        return os.path.getsize(self.path(digest))
+
+    def media_type(self, digest: str) -> str:
+        with open(self.path(digest), "rb") as fh:
+            return sniff_media_type(fh.read(16))
+
+    def put_bytes(self, data: bytes) -> str:
+        """Store `data` and return its digest; an existing identical blob is reused."""
+        digest = hashlib.sha256(data).hexdigest()
+        target = self.path(digest)
+        if os.path.exists(target):
+            return digest
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, target)
+        except BaseException:
+            _silent_unlink(tmp)
+            raise
+        return digest
+
+    def adopt_file(self, tmp_path: str, digest: str) -> str:
+        """
+        Move an already-hashed temp file into place under `digest`.
+        The temp file should live on the same filesystem (see temp_dir()).
+        """
+        target = self.path(digest)
+        if os.path.exists(target):
+            _silent_unlink(tmp_path)
+            return digest
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(tmp_path, target)
+        return digest
+
+    def temp_dir(self) -> str:
+        """Scratch directory on the blob filesystem, so adopt_file is a rename."""
+        path = os.path.join(self.root, ".incoming")
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def read(self, digest: str) -> Optional[bytes]:
+        try:
+            with open(self.path(digest), "rb") as fh:
+                return fh.read()
+        except (OSError, ValueError):
+            return None
+
+
+def _silent_unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
@@ -0,0 +1,147 @@
+"""
+Bloom filter for ID existence pre-checks
+========================================
+A fixed-size bit array with k probe positions per key. Membership answers
+are "definitely absent" or "possibly present": there are no false
+negatives, and false positives stay near `fp_rate` while the filter holds
+at most `capacity` keys.
+
+  - Probe positions use double hashing over one blake2b digest:
+        d = blake2b(key.encode("utf-8"), digest_size=16)
+        h1 = u64le(d[0:8]), h2 = u64le(d[8:16]) | 1
+        bit_i = (h1 + i * h2) mod m        for i in 0 .. k-1
+    Bit ordering follows the status lists: bit 0 is the most significant
+    bit of the first byte.
+  - The serialized form is a 24-byte header followed by the bit array:
+        "PSBF" | u8 format (1) | u8 k | u16 reserved | u64 m | u64 items
+    (little-endian), so terminals and edge proxies can reproduce the probes
+    above and reject unknown IDs offline.
+  - serialized() is cached per version and tagged with a content ETag, so
+    every process holding the same keys publishes the same ETag.
+
+Keys cannot be removed; callers rebuild a larger filter from the source of
+truth once `items` exceeds `capacity`.
+"""
+
+from typing import Any, Dict, Iterable, Optional, Tuple
+import hashlib
+import math
+import struct
+import threading
+
+HEADER = struct.Struct("<4sBBHQQ")
+MAGIC = b"PSBF"
+FORMAT = 1
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, fp_rate: float = 0.001) -> None:
+        capacity = max(1, capacity)
+        bits = math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2)
+        self.capacity = capacity
+        self.fp_rate  = fp_rate
+        self.m        = max(64, -(-bits // 8) * 8)
+        self.k        = max(1, round(self.m / capacity * math.log(2)))
+        self.bits     = bytearray(self.m // 8)
+        self.items    = 0       # keys that set at least one new bit (≈ distinct keys)
+        self.bits_set = 0
+        self.version  = 0
+        self._encoded: Optional[Tuple[int, bytes, str]] = None   # (version, data, etag)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_keys(cls, keys: Iterable[str], capacity: int, fp_rate: float = 0.001) -> "BloomFilter":
+        bf = cls(capacity, fp_rate)
+        for key in keys:
+            bf.add(key)
+        return bf
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BloomFilter":
+        """Rebuild a filter from serialized() output (as a terminal would)."""
+        magic, fmt, k, _, m, items = HEADER.unpack_from(data)
+        if magic != MAGIC or fmt != FORMAT or len(data) != HEADER.size + m // 8:
+            raise ValueError("not a serialized BloomFilter")
+        bf = cls.__new__(cls)
+        bf.m, bf.k, bf.items = m, k, items
+        bf.bits = bytearray(data[HEADER.size:])
+        bf.bits_set = sum(bin(b).count("1") for b in bf.bits)
+        bf.capacity = max(1, round(m * math.log(2) / k))
+        bf.fp_rate = 0.5 ** k
+        bf.version = 0
+        bf._encoded = None
+        bf._lock = threading.Lock()
+        return bf
+
+    # ------------------------------------------------------------------
+    # Membership
+    # ------------------------------------------------------------------
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        m = self.m
+        return [(h1 + i * h2) % m for i in range(self.k)]
+
+    def add(self, key: str) -> bool:
+        """Insert `key`. Returns False if it was (possibly) present already."""
+        added = 0
+        with self._lock:
+            bits = self.bits
+            for pos in self._positions(key):
+                mask = 0x80 >> (pos & 7)
+                if not bits[pos >> 3] & mask:
+                    bits[pos >> 3] |= mask
+                    added += 1
+            if added:
+                self.bits_set += added
+                self.items += 1
+                self.version += 1
+        return bool(added)
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        bits = self.bits
+        for pos in self._positions(key):
+            if not bits[pos >> 3] & (0x80 >> (pos & 7)):
+                return False
+        return True
+
+    @property
+    def full(self) -> bool:
+        """More keys than the filter was sized for — false positives climb past fp_rate."""
+        return self.items > self.capacity
+
+    def estimated_fp_rate(self) -> float:
+        """False-positive probability implied by the current fill ratio."""
+        return (self.bits_set / self.m) ** self.k
+
+    # ------------------------------------------------------------------
+    # Publication
+    # ------------------------------------------------------------------
+
+    def serialized(self) -> Tuple[bytes, str]:
+        """Return (header + bit array, ETag), re-encoding only when the filter changed."""
+        cached = self._encoded
+        if cached and cached[0] == self.version:
+            return cached[1], cached[2]
+        with self._lock:
+            version = self.version
+            data = HEADER.pack(MAGIC, FORMAT, self.k, 0, self.m, self.items) + bytes(self.bits)
+        etag = f'"{hashlib.sha256(data).hexdigest()[:20]}"'
+        self._encoded = (version, data, etag)
+        return data, etag
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "items":           self.items,
+            "capacity":        self.capacity,
+            "bits":            self.m,
+            "bytes":           HEADER.size + self.m // 8,
+            "hashes":          self.k,
+            "fillRatio":       round(self.bits_set / self.m, 4),
+            "targetFpRate":    self.fp_rate,
+            "estimatedFpRate": round(self.estimated_fp_rate(), 8),
+        }
@@ -0,0 +1,272 @@
+"""
+Negotiated response compression
+===============================
+CompressionMiddleware compresses responses with brotli or gzip, whichever
+the client's Accept-Encoding prefers. brotli is optional and only offered
+when the `brotli` package is installed.
+
+  - Complete bodies are compressed only when they are at least
+    `minimum_size` bytes and the result is smaller.
+  - A StreamingResponse (exports, large pages) goes through one
+    compressor. Each chunk is flushed as it is produced, so memory stays
+    flat and the client sees data as soon as the route yields it.
+  - Some responses are left alone: bodies that already carry a
+    Content-Encoding, formats that are already compressed (images,
+    gzip/zip), Server-Sent Events and Cache-Control: no-transform.
+  - A compressed response gets a weak ETag (W/"…"). Its bytes differ from
+    the identity representation, and etag_matches() compares weakly, so
+    If-None-Match keeps answering 304.
+
+PrecompressedCache serves payloads that rarely change, such as catalogs,
+revocation lists and filters. Each (ETag, encoding) is compressed once at
+PRECOMPRESS_LEVELS in a worker thread, so repeated requests cost a cache
+lookup. Those responses are marked on the request scope, so the
+middleware does not compress them again.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Optional
+import zlib
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from utils.lookup_cache import LRUCache
+
+try:
+    import brotli
+except ImportError:     # optional — gzip only
+    brotli = None
+
+MINIMUM_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+# Precompressed variants are built once per version, off the event loop.
+# gzip stays at 6: level 9 buys ~10% on sparse bitmaps (Bloom filters) but
+# takes 20x longer there, and those change on every issue.
+PRECOMPRESS_LEVELS = {"gzip": 6, "br": 9}
+SUPPORTED = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# Scope key set by PrecompressedCache: the body is already in its final encoding
+ENCODED_SCOPE_KEY = "privaseal.encoded"
+
+INCOMPRESSIBLE_TYPES = (
+    "image/", "video/", "audio/", "font/woff",
+    "application/gzip", "application/x-gzip", "application/zip", "application/x-brotli",
+    "text/event-stream",
+)
+
+
+@lru_cache(maxsize=256)
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Best supported coding in an Accept-Encoding header, or None for identity."""
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                continue
+        weights[coding.strip()] = q
+    best, best_q = None, 0.0
+    for coding in SUPPORTED:        # server preference breaks ties
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY if level is None else level)
+    return zlib.compress(data, GZIP_LEVEL if level is None else level, wbits=16 + zlib.MAX_WBITS)
+
+
+def _compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    if "no-transform" in headers.get("cache-control", ""):
+        return False
+    content_type = headers.get("content-type", "")
+    return not content_type.startswith(INCOMPRESSIBLE_TYPES)
+
+
+def _weak(etag: str) -> str:
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+def _add_vary(headers: MutableHeaders) -> None:
+    vary = headers.get("vary")
+    if not vary:
+        headers["Vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower():
+        headers["Vary"] = f"{vary}, Accept-Encoding"
+
+
+class _StreamCompressor:
+    """One compressor per streamed response; every chunk is flushed."""
+
+    def __init__(self, encoding: str) -> None:
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=BROTLI_QUALITY)
+            self._gz = None
+        else:
+            self._br = None
+            self._gz = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        if self._br is not None:
+            return self._br.process(data) + self._br.flush()
+        return self._gz.compress(data) + self._gz.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self._br is not None:
+            return self._br.finish()
+        return self._gz.flush()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Middleware
+# ─────────────────────────────────────────────────────────────────────────────
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = MINIMUM_SIZE) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        await self.app(scope, receive, _Responder(send, scope, encoding, self.minimum_size).send)
+
+
+class _Responder:
+    def __init__(self, send: Send, scope: Scope, encoding: Optional[str], minimum_size: int) -> None:
+        self._send = send
+        self._scope = scope
+        self._encoding = encoding
+        self._minimum_size = minimum_size
+        self._start: Optional[Message] = None
+        self._stream: Optional[_StreamCompressor] = None
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        kind = message["type"]
+        if kind == "http.response.start":
+            self._start = message
+            return
+        if kind != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+        if self._stream is not None:
+            await self._stream_body(message)
+            return
+
+        # First body message: decide for the whole response
+        start, self._start = self._start, None
+        headers = MutableHeaders(raw=start["headers"])
+        body, more = message.get("body", b""), message.get("more_body", False)
+        if self._scope.get(ENCODED_SCOPE_KEY) or not _compressible(headers) or start["status"] in (204, 304):
+            self._passthrough = True
+            await self._send(start)
+            await self._send(message)
+            return
+
+        _add_vary(headers)
+        if self._encoding is None or (not more and len(body) < self._minimum_size):
+            self._passthrough = True
+            await self._send(start)
+            await self._send(message)
+            return
+
+        if not more:
+            data = compress(body, self._encoding)
+            if len(data) < len(body):
+                self._set_encoding(headers)
+                headers["Content-Length"] = str(len(data))
+                message = {**message, "body": data}
+            self._passthrough = True
+            await self._send(start)
+            await self._send(message)
+            return
+
+        self._set_encoding(headers)
+        del headers["Content-Length"]
+        self._stream = _StreamCompressor(self._encoding)
+        await self._send(start)
+        await self._stream_body(message)
+
+    def _set_encoding(self, headers: MutableHeaders) -> None:
+        headers["Content-Encoding"] = self._encoding
+        if "etag" in headers:
+            headers["ETag"] = _weak(headers["etag"])
+
+    async def _stream_body(self, message: Message) -> None:
+        more = message.get("more_body", False)
+        data = self._stream.chunk(message.get("body", b""))
+        if not more:
+            data += self._stream.finish()
+        if data or not more:
+            await self._send({"type": "http.response.body", "body": data, "more_body": more})
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Precompressed payloads
+# ─────────────────────────────────────────────────────────────────────────────
+
+class PrecompressedCache:
+    """
+    Compressed variants of rarely changing payloads, keyed by (ETag, encoding).
+    The ETag must identify the body bytes, e.g. a version or content hash.
+    """
+
+    def __init__(self, max_entries: int = 64, minimum_size: int = MINIMUM_SIZE) -> None:
+        self.minimum_size = minimum_size
+        self._variants = LRUCache(max_entries)
+        # Metrics
+        self.compressions = 0
+
+    async def variant(self, body: bytes, etag: str, encoding: str) -> Optional[bytes]:
+        """Compressed body, or None when compression does not pay off."""
+        key = (etag, encoding)
+        cached = self._variants.get(key)
+        if cached is None:
+            data = await run_in_threadpool(compress, body, encoding, PRECOMPRESS_LEVELS[encoding])
+            cached = (data if len(data) < len(body) else None,)
+            self._variants.put(key, cached)
+            self.compressions += 1
+        return cached[0]
+
+    async def response(
+        self,
+        request:    Request,
+        body:       bytes,
+        etag:       str,
+        media_type: str,
+        headers:    Optional[Dict[str, str]] = None,
+    ) -> Response:
+        request.scope[ENCODED_SCOPE_KEY] = True
+        headers = {**(headers or {}), "ETag": etag, "Vary": "Accept-Encoding"}
+        encoding = negotiate(request.headers.get("accept-encoding", ""))
+        if encoding and len(body) >= self.minimum_size:
+            data = await self.variant(body, etag, encoding)
+            if data is not None:
+                headers["Content-Encoding"] = encoding
+                headers["ETag"] = _weak(etag)
+                return Response(content=data, media_type=media_type, headers=headers)
+        return Response(content=body, media_type=media_type, headers=headers)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._variants.stats(), "compressions": self.compressions}
+
+
+# Module-level singleton shared by all routers
+precompressed = PrecompressedCache()
@@ -0,0 +1,150 @@
+"""
+Conditional GET and long-poll support
+=====================================
+Handlers bump a version counter whenever the data behind a resource changes.
+The version becomes the ETag, so a poll with a matching If-None-Match gets a
+bodyless 304 without the payload ever being built or serialised.
+
+With `?wait=N` a matching poll is parked (one asyncio.Event per watched key,
+created only while someone waits) until the version moves or N seconds pass,
+so idle clients cost no CPU and almost no bandwidth.
+
+Counters live in one process. When the stores are shared between worker
+processes (utils.kvstore), the backend's change token is attached and
+folded into every ETag, and parked polls re-check it every
+SHARED_POLL_INTERVAL seconds, so a write made by another worker is never
+answered with a stale 304. A resource built from shared data outside the
+store (e.g. the shared audit log) passes its own `token` as well.
+"""
+
+from fastapi import Request
+from fastapi.responses import Response
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import os
+
+from utils.fast_json import FastJSONResponse
+
+MAX_WAIT_SECONDS = 30.0
+SHARED_POLL_INTERVAL = 0.25
+CACHE_CONTROL = "no-cache"
+
+# Versions restart at 0 with the process; the epoch keeps old ETags from
+# matching new data after a restart.
+_EPOCH = os.urandom(4).hex()
+
+
+class VersionClock:
+    """Per-key version counters with async change notification."""
+
+    def __init__(self) -> None:
+        self._versions: Dict[str, int] = {}
+        self._events:   Dict[str, asyncio.Event] = {}
+        self._shared:   Optional[Callable[[], Any]] = None
+
+    def attach(self, token: Callable[[], Any]) -> None:
+        """Fold a cross-process change token (e.g. KVBackend.token) into every ETag."""
+        self._shared = token
+
+    def token(self, extra: Optional[Callable[[], Any]] = None) -> Any:
+        shared = self._shared() if self._shared is not None else None
+        if extra is None:
+            return shared
+        return f"{shared}.{extra()}" if shared is not None else extra()
+
+    def get(self, key: str) -> int:
+        return self._versions.get(key, 0)
+
+    def bump(self, *keys: str) -> None:
+        for key in keys:
+            self._versions[key] = self._versions.get(key, 0) + 1
+            event = self._events.pop(key, None)
+            if event is not None:
+                event.set()
+
+    def forget(self, key: str) -> None:
+        """Drop the counter of a record that left the store."""
+        self._versions.pop(key, None)
+        event = self._events.pop(key, None)
+        if event is not None:
+            event.set()
+
+    async def wait_for_change(
+        self,
+        key:        str,
+        seen:       int,
+        timeout:    float,
+        seen_token: Any = None,
+        extra:      Optional[Callable[[], Any]] = None,
+    ) -> int:
+        """Park until `key` moves past version `seen`, the shared token moves, or `timeout` elapses."""
+        polled = self._shared is not None or extra is not None
+        if self.get(key) != seen:
+            return self.get(key)
+        event = self._events.get(key)
+        if event is None:
+            event = self._events[key] = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            if polled:
+                remaining = min(remaining, SHARED_POLL_INTERVAL)
+            try:
+                await asyncio.wait_for(event.wait(), remaining)
+                break
+            except asyncio.TimeoutError:
+                if polled and self.token(extra) != seen_token:
+                    break
+        return self.get(key)
+
+
+# Module-level singleton shared by all routers
+versions = VersionClock()
+
+
+def make_etag(version: int, token: Any = None) -> str:
+    if token is not None:
+        return f'"{_EPOCH}.{version}.{token}"'
+    return f'"{_EPOCH}.{version}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {t.strip()[2:] if t.strip().startswith("W/") else t.strip() for t in header.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+async def conditional_json(
+    request: Request,
+    key:     str,
+    build:   Callable[[], Any],
+    wait:    float = 0.0,
+    token:   Optional[Callable[[], Any]] = None,
+) -> Response:
+    """
+    Serve `build()` as JSON tagged with the version of `key`.
+
+    If the client already holds the current version it gets a 304; with
+    `wait` > 0 the request is parked first and only answers 304 if nothing
+    changed before the timeout. `token`, when given, is a change token of
+    data the response reads from outside the store; it is folded into the
+    ETag like the store's.
+    """
+    extra = token
+    version, token = versions.get(key), versions.token(extra)
+    etag = make_etag(version, token)
+    if etag_matches(request, etag):
+        if wait > 0:
+            version = await versions.wait_for_change(key, version, min(wait, MAX_WAIT_SECONDS), token, extra)
+            token = versions.token(extra)
+            etag = make_etag(version, token)
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+    content = build()
+    return FastJSONResponse(content=content, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
@@ -0,0 +1,141 @@
+"""
+TTL expiry index
+================
+A min-heap of (deadline, key) pairs with lazy cancellation, plus a small
+background sweeper that sleeps until the earliest deadline and hands every
+due key to a callback in one batch.
+
+  - schedule / cancel / deadline lookups are O(log n) / O(1) / O(1)
+  - the sweeper does no work between deadlines, and each wake-up pops only
+    the keys that are actually due
+  - deadlines are wall-clock epoch seconds, matching the ISO `expiresAt`
+    timestamps stored on the records
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple, Union
+import asyncio
+import heapq
+import inspect
+import logging
+import time
+
+logger = logging.getLogger("expiry")
+
+ExpiryCallback = Callable[[List[Hashable]], Union[None, Awaitable[None]]]
+
+
+class ExpiryIndex:
+    """Min-heap keyed by deadline; cancelled or rescheduled entries are skipped on pop."""
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._deadlines: Dict[Hashable, float] = {}
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._deadlines
+
+    def schedule(self, key: Hashable, deadline: float) -> None:
+        self._deadlines[key] = deadline
+        self._seq += 1
+        heapq.heappush(self._heap, (deadline, self._seq, key))
+
+    def cancel(self, key: Hashable) -> bool:
+        return self._deadlines.pop(key, None) is not None
+
+    def deadline(self, key: Hashable) -> Optional[float]:
+        return self._deadlines.get(key)
+
+    def is_expired(self, key: Hashable, now: Optional[float] = None) -> bool:
+        deadline = self._deadlines.get(key)
+        return deadline is not None and deadline <= (time.time() if now is None else now)
+
+    def next_deadline(self) -> Optional[float]:
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: Optional[float] = None, limit: Optional[int] = None) -> List[Hashable]:
+        """Remove and return keys whose deadline is <= now, earliest first."""
+        now = time.time() if now is None else now
+        due: List[Hashable] = []
+        heap = self._heap
+        while heap and heap[0][0] <= now and (limit is None or len(due) < limit):
+            deadline, _, key = heapq.heappop(heap)
+            if self._deadlines.get(key) == deadline:
+                del self._deadlines[key]
+                due.append(key)
+        return due
+
+    def _drop_stale(self) -> None:
+        heap = self._heap
+        while heap and self._deadlines.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
+        # Compact if cancellations left the heap mostly garbage
+        if len(heap) > 1024 and len(heap) > 4 * len(self._deadlines):
+            self._heap = [e for e in heap if self._deadlines.get(e[2]) == e[0]]
+            heapq.heapify(self._heap)
+
+
+class ExpirySweeper:
+    """
+    Background task that drains an ExpiryIndex.
+    Like BenchmarkEngine, start() must be called from inside the running loop.
+    """
+
+    def __init__(
+        self,
+        name:       str,
+        index:      ExpiryIndex,
+        on_expired: ExpiryCallback,
+        max_sleep:  float = 1.0,
+        batch_size: int = 1000,
+    ) -> None:
+        self.name       = name
+        self.index      = index
+        self.on_expired = on_expired
+        self.max_sleep  = max_sleep
+        self.batch_size = batch_size
+        self.expired_total = 0
+        self._running = False
+        self._task: Optional[asyncio.Task] = None   # type: ignore[type-arg]
+
+    def start(self) -> None:
+        if not self._running:
+            self._running = True
+            self._task = asyncio.create_task(self._run_loop())
+            logger.info(f"ExpirySweeper[{self.name}] started.")
+
+    async def stop(self) -> None:
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def sweep(self, now: Optional[float] = None) -> int:
+        """Process every due key in batches; returns how many expired."""
+        count = 0
+        while True:
+            due = self.index.pop_due(now, self.batch_size)
+            if not due:
+                return count
+            result: Any = self.on_expired(due)
+            if inspect.isawaitable(result):
+                await result
+            count += len(due)
+            self.expired_total += len(due)
+
+    async def _run_loop(self) -> None:
+        while self._running:
+            try:
+                await self.sweep()
+            except Exception as exc:
+                logger.error(f"ExpirySweeper[{self.name}] error: {exc}", exc_info=True)
+            nxt = self.index.next_deadline()
+            delay = self.max_sleep if nxt is None else min(self.max_sleep, max(0.0, nxt - time.time()))
+            await asyncio.sleep(delay)
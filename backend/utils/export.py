@@ -0,0 +1,197 @@
+"""
+Streaming export helpers
+========================
+Turns any row iterator (sync or async) into an NDJSON or CSV StreamingResponse.
+
+Rows are encoded one at a time and flushed in ~64 KB chunks, so memory stays
+flat no matter how large the export is. In gzip mode a single zlib stream
+compresses each chunk as it is produced.
+"""
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from datetime import datetime, timezone
+import csv
+import io
+import json
+import zlib
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv":    "text/csv",
+}
+
+FLUSH_BYTES = 64 * 1024
+
+Rows = Union[Iterable[Dict[str, Any]], AsyncIterator[Dict[str, Any]]]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Time-range helpers
+# ─────────────────────────────────────────────────────────────────────────────
+
+def parse_timestamp(value: Optional[str], field: str = "timestamp") -> Optional[datetime]:
+    """Parse an ISO-8601 query parameter; naive values are treated as UTC."""
+    if not value:
+        return None
+    try:
+        ts = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {field}: {value!r} (expected ISO-8601)")
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def parse_time_range(since: Optional[str], until: Optional[str]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    return parse_timestamp(since, "since"), parse_timestamp(until, "until")
+
+
+def iter_time_window(
+    records_newest_first: Iterable[Dict[str, Any]],
+    key:   str,
+    since: Optional[datetime],
+    until: Optional[datetime],
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield records whose `key` timestamp lies in [since, until].
+
+    The in-memory stores are append-only in time order, so when walking them
+    newest-first we can stop at the first record older than `since` instead
+    of scanning the rest of the store.
+    """
+    for record in records_newest_first:
+        if since is None and until is None:
+            yield record
+            continue
+        ts = parse_timestamp(record.get(key))
+        if ts is None:
+            continue
+        if until is not None and ts > until:
+            continue
+        if since is not None and ts < since:
+            return
+        yield record
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Encoders
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _ndjson_encoder(columns: Optional[List[str]]) -> Tuple[Optional[str], Callable[[Dict[str, Any]], str]]:
+    def encode(row: Dict[str, Any]) -> str:
+        if columns is not None:
+            row = {c: row.get(c) for c in columns}
+        return json.dumps(row, default=_json_default, ensure_ascii=False) + "\n"
+    return None, encode
+
+
+def _csv_encoder(columns: List[str]) -> Tuple[Optional[str], Callable[[Dict[str, Any]], str]]:
+    buf    = io.StringIO()
+    writer = csv.writer(buf)
+
+    def _cell(value: Any) -> Any:
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, default=_json_default, ensure_ascii=False)
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value
+
+    def encode(row: Dict[str, Any]) -> str:
+        buf.seek(0)
+        buf.truncate()
+        writer.writerow([_cell(row.get(c)) for c in columns])
+        return buf.getvalue()
+
+    writer.writerow(columns)
+    header = buf.getvalue()
+    return header, encode
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Response builder
+# ─────────────────────────────────────────────────────────────────────────────
+
+async def _encode_stream(
+    rows:    Rows,
+    encode:  Callable[[Dict[str, Any]], str],
+    header:  Optional[str],
+    gzipped: bool,
+) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if gzipped else None
+    pending: List[str] = [header] if header else []
+    size = len(header) if header else 0
+
+    def _drain() -> bytes:
+        data = "".join(pending).encode()
+        pending.clear()
+        return compressor.compress(data) if compressor else data
+
+    async def _rows() -> AsyncIterator[Dict[str, Any]]:
+        if hasattr(rows, "__aiter__"):
+            async for r in rows:  # type: ignore[union-attr]
+                yield r
+        else:
+            for r in rows:  # type: ignore[union-attr]
+                yield r
+
+    async for row in _rows():
+        line = encode(row)
+        pending.append(line)
+        size += len(line)
+        if size >= FLUSH_BYTES:
+            chunk = _drain()
+            size  = 0
+            if chunk:
+                yield chunk
+
+    chunk = _drain()
+    if compressor:
+        chunk += compressor.flush()
+    if chunk:
+        yield chunk
+
+
+def stream_export(
+    rows:     Rows,
+    fmt:      str,
+    filename: str,
+    columns:  Optional[List[str]] = None,
+    gzipped:  bool = False,
+) -> StreamingResponse:
+    """
+    Build a StreamingResponse that encodes `rows` lazily.
+
+    `columns` fixes the CSV header (required for CSV) and, when given, also
+    projects NDJSON rows so both formats carry the same fields.
+    """
+    fmt = (fmt or "ndjson").lower()
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {fmt} (use ndjson or csv)")
+    if fmt == "csv":
+        if not columns:
+            raise HTTPException(status_code=400, detail="CSV export requires a column list")
+        header, encode = _csv_encoder(columns)
+    else:
+        header, encode = _ndjson_encoder(columns)
+
+    name = f"{filename}.{fmt}"
+    if gzipped:
+        name += ".gz"
+        media_type = "application/gzip"
+    else:
+        media_type = EXPORT_FORMATS[fmt]
+
+    return StreamingResponse(
+        _encode_stream(rows, encode, header, gzipped),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{name}"',
+            "Cache-Control":       "no-store",
+        },
+    )
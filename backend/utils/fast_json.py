@@ -0,0 +1,120 @@
+"""
+Fast JSON encoding for API responses
+====================================
+FastJSONResponse replaces starlette's JSONResponse, whose render() runs
+the stdlib json.dumps on every response. dumps() encodes with orjson when
+it is installed and falls back to the stdlib encoder otherwise. Both paths
+produce compact UTF-8 JSON, so clients see the same documents.
+
+  - Records (utils.records) and other read-only mappings are encoded as
+    their dict shape. Routes can return them without copying to a dict.
+  - A Fragment is JSON that was encoded once. It is written into the
+    enclosing document as-is, so immutable entries (benchmark history
+    points, unchanged credentials) are never re-encoded for list
+    responses.
+
+Fragments are spliced lazily. The document is first encoded in one pass,
+and only the containers on the path to a Fragment are assembled piecewise.
+"""
+
+from collections.abc import Mapping
+from typing import Any
+import json
+import threading
+
+from fastapi.responses import JSONResponse
+
+from utils.records import Record
+
+try:
+    import orjson
+except ImportError:     # optional — the stdlib encoder is the fallback
+    orjson = None
+
+
+class Fragment:
+    """Pre-encoded JSON value. `raw` must be one complete JSON document."""
+    __slots__ = ("raw",)
+
+    def __init__(self, raw: bytes) -> None:
+        self.raw = raw
+
+    def __repr__(self) -> str:
+        return f"Fragment({self.raw[:40]!r}{'…' if len(self.raw) > 40 else ''})"
+
+
+class _Splice(Exception):
+    """Raised from the encoder's default hook when it reaches a Fragment."""
+
+
+# orjson turns any exception from the default hook into its own TypeError,
+# so the hook also leaves a per-thread mark that a Fragment was the cause
+_hook = threading.local()
+
+
+def _default(obj: Any) -> Any:
+    if type(obj) is Fragment:
+        _hook.fragment = True
+        raise _Splice
+    if isinstance(obj, Record):
+        return obj.to_dict()
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def _encode(obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, default=_default, option=_OPTIONS)
+        except TypeError:
+            if getattr(_hook, "fragment", False):
+                _hook.fragment = False
+                raise _Splice from None
+            raise
+else:
+    _stdlib = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_default)
+
+    def _encode(obj: Any) -> bytes:
+        return _stdlib.encode(obj).encode("utf-8")
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode `obj` as compact UTF-8 JSON, splicing in any Fragments."""
+    if type(obj) is Fragment:
+        return obj.raw
+    try:
+        return _encode(obj)
+    except _Splice:
+        return _splice(obj)
+
+
+def encode(obj: Any) -> Fragment:
+    """Encode `obj` once for later splicing into responses."""
+    return Fragment(dumps(obj))
+
+
+def _splice(obj: Any) -> bytes:
+    if isinstance(obj, (list, tuple)):
+        return b"[" + b",".join(
+            item.raw if type(item) is Fragment else dumps(item) for item in obj
+        ) + b"]"
+    if isinstance(obj, Record):
+        obj = obj.to_dict()
+    if isinstance(obj, Mapping):
+        return b"{" + b",".join(
+            _encode(key if isinstance(key, str) else str(key)) + b":"
+            + (value.raw if type(value) is Fragment else dumps(value))
+            for key, value in obj.items()
+        ) + b"}"
+    # Only containers reach the default hook with a Fragment inside
+    raise TypeError(f"cannot splice a Fragment into {type(obj).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with dumps(); a drop-in for every route."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,143 @@
+"""
+Group-commit row writer
+=======================
+GroupCommitWriter inserts ORM rows coming from many requests in shared
+transactions: an AuditWriter whose sink is "add_all + one commit". With
+SQLite the commit (WAL append + fsync) is most of a write's cost, so N
+rows per commit cost little more than one.
+
+Modes (`mode`), from the strongest guarantee to the lowest latency:
+
+  - "direct":       write() commits the row in its own transaction before
+                    returning. No queue; same guarantee as a plain commit.
+  - "group":        write() waits until the batch holding the row has
+                    committed. A response still means the row is durable;
+                    latency grows by at most `linger` plus the wait for the
+                    batch in flight.
+  - "write_behind": write() returns once the row is queued. The row is
+                    committed within about `linger` plus one batch. Until
+                    then readers do not see it, and a crash loses it.
+
+A batch is written when `batch_size` rows are queued or `linger` seconds
+after its first row, whichever comes first. Rows that cannot be queued
+(the writer is not running, or the queue stayed full for `max_wait`) are
+committed directly instead of being dropped. When a batch fails (e.g.
+one row violates a constraint), its rows are retried one transaction
+each, so only the bad row fails: in "group" mode its write() raises, in
+"write_behind" mode it is logged and counted as `failed`.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import time
+
+from utils.audit_writer import AuditWriter
+
+logger = logging.getLogger("group_commit")
+
+MODES = ("direct", "group", "write_behind")
+
+DURABILITY = {
+    "direct":       "committed before the response",
+    "group":        "committed before the response (shared transaction)",
+    "write_behind": "queued before the response; committed within ~linger",
+}
+
+# (row, future resolved on commit or None, perf_counter at submit)
+_Entry = Tuple[Any, Optional["asyncio.Future[None]"], float]
+
+
+class GroupCommitWriter(AuditWriter):
+    def __init__(
+        self,
+        name:            str,
+        session_factory: Callable[[], Any],
+        mode:            str = "group",
+        batch_size:      int = 256,
+        linger:          float = 0.002,
+        queue_size:      int = 10_000,
+        max_wait:        float = 1.0,
+    ) -> None:
+        if mode not in MODES:
+            raise ValueError(f"Unknown write mode {mode!r}; expected one of {', '.join(MODES)}")
+        super().__init__(name, self._commit_batch, queue_size, batch_size, max_wait, linger)
+        self.session_factory = session_factory
+        self.mode = mode
+        # Metrics: submit → commit, per row
+        self.direct_total  = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms   = 0.0
+
+    async def write(self, row: Any) -> None:
+        if self.mode == "direct" or not self._running:
+            await self._commit_direct(row)
+            return
+        future = asyncio.get_running_loop().create_future() if self.mode == "group" else None
+        if not await self.submit((row, future, time.perf_counter())):
+            await self._commit_direct(row)
+            return
+        if future is not None:
+            await future
+
+    async def _commit_direct(self, row: Any) -> None:
+        start = time.perf_counter()
+        async with self.session_factory() as session:
+            session.add(row)
+            await session.commit()
+        self.direct_total += 1
+        self._record_wait((time.perf_counter() - start) * 1000)
+
+    async def _commit_batch(self, batch: List[_Entry]) -> None:
+        try:
+            async with self.session_factory() as session:
+                session.add_all([row for row, _, _ in batch])
+                await session.commit()
+        except Exception as exc:
+            logger.warning(f"GroupCommitWriter[{self.name}] batch of {len(batch)} failed ({exc}); retrying row by row")
+            await self._commit_rows(batch)
+            return
+        now = time.perf_counter()
+        for _, future, submitted in batch:
+            self._record_wait((now - submitted) * 1000)
+            if future is not None and not future.done():
+                future.set_result(None)
+
+    async def _commit_rows(self, batch: List[_Entry]) -> None:
+        """One transaction per row, after the batch's shared one failed."""
+        failed = 0
+        for row, future, submitted in batch:
+            try:
+                # The rollback left the row transient, so it can be added again
+                async with self.session_factory() as session:
+                    session.add(row)
+                    await session.commit()
+            except Exception as exc:
+                failed += 1
+                logger.error(f"GroupCommitWriter[{self.name}] row rejected: {exc}")
+                if future is not None and not future.done():
+                    future.set_exception(exc)
+                continue
+            self._record_wait((time.perf_counter() - submitted) * 1000)
+            if future is not None and not future.done():
+                future.set_result(None)
+        # AuditWriter counts the whole batch as written once the sink returns
+        self.written_total -= failed
+        self.failed_total  += failed
+
+    def _record_wait(self, ms: float) -> None:
+        self.wait_total_ms += ms
+        self.wait_max_ms = max(self.wait_max_ms, ms)
+
+    def stats(self) -> Dict[str, Any]:
+        committed = self.written_total + self.direct_total
+        return {
+            "mode":            self.mode,
+            "durability":      DURABILITY[self.mode],
+            "batchSize":       self.batch_size,
+            "lingerMs":        round(self.linger * 1000, 3),
+            **super().stats(),
+            "direct":          self.direct_total,
+            "avgCommitWaitMs": round(self.wait_total_ms / committed, 3) if committed else 0.0,
+            "maxCommitWaitMs": round(self.wait_max_ms, 3),
+        }
@@ -0,0 +1,73 @@
+"""
+Bounded LRU cache for hot-path lookups
+======================================
+A small OrderedDict-backed LRU with an optional per-entry TTL, used for
+precomputed read views and negative ("known not to exist") entries in
+front of the stores. Single-threaded use from the event loop; no locking.
+
+  - get() on a hit moves the entry to the young end (O(1)).
+  - put() beyond `max_entries` evicts the least recently used entry, so
+    memory stays bounded no matter how many distinct keys are probed.
+  - With `ttl` set, entries older than `ttl` seconds count as misses.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+import time
+
+_MISSING = object()
+
+
+class LRUCache:
+    def __init__(self, max_entries: int, ttl: Optional[float] = None) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        # Metrics
+        self.hits      = 0
+        self.misses    = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        if self.ttl is not None:
+            expires, entry = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.ttl is not None:
+            value = (time.monotonic() + self.ttl, value)
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries":   len(self._entries),
+            "capacity":  self.max_entries,
+            "hits":      self.hits,
+            "misses":    self.misses,
+            "evictions": self.evictions,
+            "hitRate":   round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,153 @@
+"""
+In-process pub/sub for status push
+==================================
+Topics are plain strings (e.g. "verifier:request:<id>"). Every subscriber
+owns a bounded asyncio.Queue; publish() serialises the event once into an
+SSE frame and hands the same frame to every subscriber without awaiting.
+
+A slow subscriber never blocks the publisher: when its queue is full the
+oldest event is dropped (the newest status is the one that matters) and
+the drop is counted.
+
+Idle subscribers cost one parked coroutine each — nothing runs between
+events except a heartbeat comment every HEARTBEAT_SECONDS to keep proxies
+from closing the connection.
+"""
+
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Set, Tuple
+import asyncio
+import json
+
+DEFAULT_QUEUE_SIZE = 16
+HEARTBEAT_SECONDS = 15.0
+
+Event = Tuple[Dict[str, Any], str]   # (payload, pre-encoded SSE frame)
+
+
+def sse_frame(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str, ensure_ascii=False)}\n\n"
+
+
+class Subscription:
+    def __init__(self, broker: "Broker", topic: str, maxsize: int) -> None:
+        self.broker  = broker
+        self.topic   = topic
+        self.queue: "asyncio.Queue[Event]" = asyncio.Queue(maxsize)
+        self.dropped = 0
+
+    def offer(self, event: Event) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.queue.get_nowait()
+            self.queue.put_nowait(event)
+            self.dropped += 1
+            self.broker.dropped_total += 1
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class Broker:
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE) -> None:
+        self.queue_size = queue_size
+        self._topics: Dict[str, Set[Subscription]] = {}
+        self.published_total = 0
+        self.delivered_total = 0
+        self.dropped_total   = 0
+
+    def subscribe(self, topic: str) -> Subscription:
+        sub = Subscription(self, topic, self.queue_size)
+        self._topics.setdefault(topic, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        subs = self._topics.get(sub.topic)
+        if subs is not None:
+            subs.discard(sub)
+            if not subs:
+                del self._topics[sub.topic]
+
+    def has_subscribers(self, topic: str) -> bool:
+        return topic in self._topics
+
+    def publish(self, topic: str, event: str, data: Dict[str, Any]) -> int:
+        """Fan an event out to the topic's subscribers. Returns the delivery count."""
+        self.published_total += 1
+        subs = self._topics.get(topic)
+        if not subs:
+            return 0
+        item: Event = (data, sse_frame(event, data))
+        for sub in list(subs):
+            sub.offer(item)
+        self.delivered_total += len(subs)
+        return len(subs)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "topics":      len(self._topics),
+            "subscribers": sum(len(s) for s in self._topics.values()),
+            "published":   self.published_total,
+            "delivered":   self.delivered_total,
+            "dropped":     self.dropped_total,
+        }
+
+
+# Module-level singleton shared by all routers
+broker = Broker()
+
+
+async def _sse_events(
+    topic:    str,
+    event:    str,
+    snapshot: Optional[Callable[[], Optional[Dict[str, Any]]]],
+    is_final: Optional[Callable[[Dict[str, Any]], bool]],
+) -> AsyncIterator[str]:
+    # Subscribe before taking the snapshot (no await in between), so no
+    # transition can slip through the gap. Doing both inside the generator
+    # also guarantees the finally-block runs for every subscription made.
+    sub = broker.subscribe(topic)
+    try:
+        yield "retry: 3000\n\n"
+        current = snapshot() if snapshot else None
+        if current is not None:
+            yield sse_frame(event, current)
+            if is_final and is_final(current):
+                return
+        while True:
+            item = await sub.get(HEARTBEAT_SECONDS)
+            if item is None:
+                yield ": keep-alive\n\n"
+                continue
+            data, frame = item
+            yield frame
+            if is_final and is_final(data):
+                return
+    finally:
+        sub.close()
+
+
+def sse_response(
+    topic:    str,
+    event:    str = "status",
+    snapshot: Optional[Callable[[], Optional[Dict[str, Any]]]] = None,
+    is_final: Optional[Callable[[Dict[str, Any]], bool]] = None,
+) -> StreamingResponse:
+    """
+    Stream `topic` as text/event-stream.
+    `snapshot()` supplies the current state, sent first so clients never miss
+    the state they connected in; the stream ends after an event for which
+    `is_final(data)` is true.
+    """
+    return StreamingResponse(
+        _sse_events(topic, event, snapshot, is_final),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,211 @@
+"""
+Compact record types for the stores
+===================================
+Stored records used to be dicts with 15–25 string keys each. At millions
+of records the per-dict hash table, not the data, dominated RSS. A Record
+subclass keeps the same mapping interface (record["status"], .get(),
+.update(), .items(), `in`), but its fields live in __slots__:
+
+  - KEYS lists every key in output (JSON) order. Keys that are properties
+    on the class are derived lazily (e.g. a label computed from a status
+    code) and are not stored. All other keys are slots.
+  - DEFAULTS are returned for unset slots without being stored. Display
+    placeholders and None-until-reviewed fields therefore cost one empty
+    pointer. A key that is neither set nor defaulted is absent, as it was
+    in the dict.
+  - CODES fields (status, type, action…) are interned, so the few
+    distinct values are shared by every record, including records
+    unpickled from a journal or a shared store.
+  - Pickling stores the slot values as one tuple plus a layout tag (a
+    CRC of the slot names), not the field names. Changing KEYS changes the
+    tag. Add the old slot order to the class's LAYOUTS so records pickled
+    before the change are still loaded field by field. An unknown tag
+    fails the load instead of shifting values into the wrong fields.
+
+Records are not JSON-serialisable themselves. record_dict() turns one
+(or a legacy dict record) into today's dict shape for a response.
+"""
+
+from collections import deque
+from collections.abc import MutableMapping
+from itertools import repeat
+from operator import attrgetter
+from typing import Any, Callable, Dict, FrozenSet, Iterator, Mapping, Optional, Tuple
+import pickle
+import sys
+import zlib
+
+class _Unset:
+    """Value of a slot that holds nothing. Every slot is always bound (to
+    this when unset), so lookups never go through an AttributeError."""
+    __slots__ = ()
+
+    def __reduce__(self) -> str:
+        return "_UNSET"      # pickled by reference: unpickles to the same singleton
+
+    def __repr__(self) -> str:
+        return "<unset>"
+
+
+_UNSET = _Unset()
+_bind = object.__setattr__
+_drain = deque(maxlen=0).extend
+
+
+class Record(MutableMapping):
+    __slots__ = ()
+
+    KEYS:     Tuple[str, ...] = ()
+    DEFAULTS: Dict[str, Any] = {}
+    CODES:    Tuple[str, ...] = ()
+    # Earlier slot orders (oldest first), so pickles written before a KEYS change still load
+    LAYOUTS:  Tuple[Tuple[str, ...], ...] = ()
+
+    _layout:  int = 0
+    _past:    Dict[int, Tuple[str, ...]] = {}
+    _keyset: FrozenSet[str] = frozenset()
+    _codes:  FrozenSet[str] = frozenset()
+    _values: Callable[["Record"], Tuple[Any, ...]]
+    _output: Tuple[Tuple[str, Optional[int], Any], ...] = ()   # (key, slot index or None, default)
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        slots = tuple(cls.__slots__)
+        for key in slots:
+            if key not in cls.KEYS:
+                raise TypeError(f"{cls.__name__}: slot {key!r} is missing from KEYS")
+        for key in cls.KEYS:
+            if key not in slots and not isinstance(getattr(cls, key, None), property):
+                raise TypeError(f"{cls.__name__}: key {key!r} is neither a slot nor a property")
+        cls._layout = _layout_tag(slots)
+        cls._past   = {_layout_tag(layout): tuple(layout) for layout in cls.LAYOUTS}
+        cls._keyset = frozenset(cls.KEYS)
+        cls._codes  = frozenset(cls.CODES)
+        getter = attrgetter(*slots)
+        cls._values = getter if len(slots) > 1 else (lambda record: (getter(record),))
+        cls._output = tuple(
+            (key, slots.index(key) if key in slots else None, cls.DEFAULTS.get(key, _UNSET))
+            for key in cls.KEYS
+        )
+
+    def __init__(self, fields: Optional[Mapping[str, Any]] = None, **kwargs: Any) -> None:
+        _drain(map(_bind, repeat(self), self.__slots__, repeat(_UNSET)))
+        for source in (fields or {}, kwargs):
+            for key, value in source.items():
+                self[key] = value
+
+    # ------------------------------------------------------------------
+    # Mapping interface
+    # ------------------------------------------------------------------
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._keyset:
+            value = getattr(self, key)
+            if value is not _UNSET:
+                return value
+            if key in self.DEFAULTS:
+                return self.DEFAULTS[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._keyset:
+            value = getattr(self, key)
+            if value is not _UNSET:
+                return value
+            return self.DEFAULTS.get(key, default)
+        return default
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keyset and (key in self.DEFAULTS or getattr(self, key) is not _UNSET)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._keyset:
+            raise KeyError(f"{type(self).__name__} has no field {key!r}")
+        if key in self._codes and type(value) is str:
+            value = sys.intern(value)
+        try:
+            setattr(self, key, value)
+        except AttributeError:
+            raise KeyError(f"{type(self).__name__}.{key} is derived and read-only") from None
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self.__slots__ or getattr(self, key) is _UNSET:
+            raise KeyError(key)
+        _bind(self, key, _UNSET)
+
+    def __iter__(self) -> Iterator[str]:
+        values = self._values(self)
+        for key, index, default in self._output:
+            if index is None or values[index] is not _UNSET or default is not _UNSET:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The record in its JSON shape (derived fields and defaults filled in)."""
+        values = self._values(self)
+        out: Dict[str, Any] = {}
+        for key, index, default in self._output:
+            if index is None:
+                out[key] = getattr(self, key)
+                continue
+            value = values[index]
+            if value is _UNSET:
+                if default is _UNSET:
+                    continue
+                value = default
+            out[key] = value
+        return out
+
+    def copy(self) -> "Record":
+        return _restore(*self.__reduce__()[1])
+
+    # ------------------------------------------------------------------
+    # Pickling
+    # ------------------------------------------------------------------
+
+    def __reduce__(self):
+        return _restore, (type(self), self._values(self), self._layout)
+
+
+def _layout_tag(slots: Tuple[str, ...]) -> int:
+    return zlib.crc32(",".join(slots).encode())
+
+
+def _remap(cls: type, values: Tuple[Any, ...], layout: Optional[int]) -> Tuple[Any, ...]:
+    """Slot values pickled under another layout, reordered by field name."""
+    slots = cls.__slots__
+    if layout is None and len(values) == len(slots):
+        return values       # pickled before layouts were tagged
+    old = cls._past.get(layout)
+    if old is None or len(old) != len(values):
+        raise pickle.UnpicklingError(
+            f"{cls.__name__}: record pickled with unknown layout {layout!r}; add its slot order to LAYOUTS"
+        )
+    by_name = dict(zip(old, values))
+    return tuple(by_name.get(key, _UNSET) for key in slots)
+
+
+def _restore(cls: type, values: Tuple[Any, ...], layout: Optional[int] = None) -> Record:
+    if layout != cls._layout:
+        values = _remap(cls, values, layout)
+    record = cls.__new__(cls)
+    # Bind every slot in one C-level loop — this runs once per record on a
+    # journal replay, so it is kept out of the interpreter
+    _drain(map(_bind, repeat(record), cls.__slots__, values))
+    for key in cls._codes:
+        value = getattr(record, key)
+        if type(value) is str:
+            _bind(record, key, sys.intern(value))
+    return record
+
+
+def record_dict(record: Mapping[str, Any]) -> Dict[str, Any]:
+    """JSON-ready dict for a Record, or a copy of a legacy dict record."""
+    if isinstance(record, Record):
+        return record.to_dict()
+    return dict(record)
@@ -0,0 +1,445 @@
+"""
+Append-only segment log
+=======================
+A durable, length-prefixed record log split into fixed-size segment files:
+
+    <dir>/00000000000000000000.seg   first_seq = 0
+    <dir>/00000000000000051234.seg   first_seq = 51234
+    ...
+
+Record layout (little-endian):
+
+    u32 payload length | u32 crc32(payload) | i64 timestamp µs | payload (JSON)
+
+  - The active segment is preallocated and memory-mapped; an append is a
+    slice copy into the map. A background flusher msyncs the dirty range
+    every `sync_interval` seconds (batched fsync); rotation and close sync
+    synchronously.
+  - Reads go through the same maps. A sparse index (offset and timestamp of
+    every `index_interval`-th record, kept in compact arrays) gives direct
+    access by sequence number for newest-first paging, and lets time-range
+    queries skip whole blocks by timestamp.
+  - Sealed segments are trusted; on open only the active segment is
+    CRC-checked and a torn tail from a crash is zeroed out.
+  - With `max_segments` set, the oldest segments are deleted on rotation, so
+    disk use is bounded as well; RAM is the sparse index only.
+
+Stored timestamps are non-decreasing, which is what makes the time-range
+block skipping valid: an append whose timestamp is older than the log's
+newest record (another process stamped it later but committed first) is
+stored with the newest record's timestamp instead.
+
+With `shared=True` several processes may append to the same directory:
+appends hold an exclusive flock on <dir>/.lock, and every append or read
+first picks up records and segments that other processes added since
+(usually a single stat). Sequence numbers are then global across processes.
+"""
+
+from array import array
+from bisect import bisect_right
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import asyncio
+import fcntl
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+
+logger = logging.getLogger("segment_log")
+
+HEADER = struct.Struct("<IIq")
+SEGMENT_SUFFIX = ".seg"
+DEFAULT_SEGMENT_BYTES = 16 * 1024 * 1024
+DEFAULT_INDEX_INTERVAL = 64
+
+_PAGE = mmap.PAGESIZE
+
+
+def _to_us(ts: float) -> int:
+    return int(ts * 1_000_000)
+
+
+class _Segment:
+    def __init__(self, path: str, first_seq: int) -> None:
+        self.path      = path
+        self.first_seq = first_seq
+        self.count     = 0
+        self.end       = 0                 # bytes used
+        self.synced    = 0                 # bytes known to be on disk
+        self.last_ts   = 0
+        self.offsets   = array("Q")        # offset of record first_seq + i * interval
+        self.block_ts  = array("q")        # timestamp of that record
+        self.mm: Optional[mmap.mmap] = None
+
+    def open(self, size: int) -> None:
+        with open(self.path, "r+b") as fh:
+            if os.fstat(fh.fileno()).st_size < size:
+                fh.truncate(size)
+            self.mm = mmap.mmap(fh.fileno(), 0)
+
+    def headers(self, offset: int, count: int) -> List[Tuple[int, int, int]]:
+        """(timestamp µs, payload start, payload end) of `count` records from `offset`."""
+        mm, out = self.mm, []
+        for _ in range(count):
+            length, _, ts = HEADER.unpack_from(mm, offset)
+            start = offset + HEADER.size
+            out.append((ts, start, start + length))
+            offset = start + length
+        return out
+
+
+class SegmentLog:
+    def __init__(
+        self,
+        directory:      str,
+        segment_bytes:  int = DEFAULT_SEGMENT_BYTES,
+        index_interval: int = DEFAULT_INDEX_INTERVAL,
+        max_segments:   Optional[int] = None,
+        sync_interval:  float = 0.2,
+        shared:         bool = False,
+    ) -> None:
+        self.directory      = directory
+        self.segment_bytes  = segment_bytes
+        self.index_interval = index_interval
+        self.max_segments   = max_segments
+        self.sync_interval  = sync_interval
+        self.shared         = shared
+        self._lock_fd: Optional[int] = None
+        self._segments: List[_Segment] = []
+        self._firsts:   List[int] = []            # first_seq per segment, for bisect
+        self._lock = threading.Lock()
+        self._opened = False
+        self._running = False
+        self._task: Optional[asyncio.Task] = None   # type: ignore[type-arg]
+        self.syncs_total = 0
+
+    # ------------------------------------------------------------------
+    # Open / recovery
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _flock(self, exclusive: bool) -> Iterator[None]:
+        """Inter-process lock around appends / refreshes (no-op unless shared)."""
+        if not self.shared:
+            yield
+            return
+        if self._lock_fd is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._lock_fd = os.open(os.path.join(self.directory, ".lock"), os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _ensure_open(self) -> None:
+        if self._opened:
+            return
+        with self._lock, self._flock(exclusive=True):
+            if self._opened:
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            names = sorted(n for n in os.listdir(self.directory) if n.endswith(SEGMENT_SUFFIX))
+            for i, name in enumerate(names):
+                seg = _Segment(os.path.join(self.directory, name), int(name[:-len(SEGMENT_SUFFIX)]))
+                active = i == len(names) - 1
+                if not active and os.path.getsize(seg.path) == 0:
+                    os.unlink(seg.path)
+                    continue
+                seg.open(self.segment_bytes if active else 0)
+                self._recover(seg, verify=active)
+                self._segments.append(seg)
+                self._firsts.append(seg.first_seq)
+            if not self._segments:
+                self._new_segment(0)
+            self._opened = True
+
+    def _scan(self, seg: _Segment, limit: int, verify: bool = False) -> int:
+        """Index the records from seg.end up to `limit` bytes; returns the new end."""
+        mm, offset = seg.mm, seg.end
+        while offset + HEADER.size <= limit:
+            length, crc, ts = HEADER.unpack_from(mm, offset)
+            end = offset + HEADER.size + length
+            if length == 0 or end > limit:
+                break
+            if verify and zlib.crc32(mm[offset + HEADER.size:end]) != crc:
+                break
+            self._index(seg, offset, ts)
+            offset = end
+        seg.end = offset
+        return offset
+
+    def _recover(self, seg: _Segment, verify: bool) -> None:
+        mm, size = seg.mm, len(seg.mm)
+        offset = self._scan(seg, size, verify)
+        seg.synced = offset
+        if verify and offset + HEADER.size <= size and mm[offset:offset + HEADER.size] != bytes(HEADER.size):
+            # Torn tail from a crash: cut the file back and re-extend, which
+            # zero-fills everything after the last good record
+            logger.warning(f"SegmentLog {seg.path}: truncating torn tail at offset {offset}")
+            mm.close()
+            os.truncate(seg.path, offset)
+            seg.open(size)
+
+    def _index(self, seg: _Segment, offset: int, ts: int) -> None:
+        if seg.count % self.index_interval == 0:
+            seg.offsets.append(offset)
+            seg.block_ts.append(ts)
+        seg.count += 1
+        seg.last_ts = ts
+
+    def _segment_path(self, first_seq: int) -> str:
+        return os.path.join(self.directory, f"{first_seq:020d}{SEGMENT_SUFFIX}")
+
+    def _new_segment(self, first_seq: int) -> _Segment:
+        path = self._segment_path(first_seq)
+        open(path, "wb").close()
+        seg = _Segment(path, first_seq)
+        seg.open(self.segment_bytes)
+        self._segments.append(seg)
+        self._firsts.append(first_seq)
+        return seg
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def append(self, record: Dict[str, Any], ts: Optional[float] = None) -> int:
+        """Append one record; returns its sequence number. Durable after the next sync."""
+        self._ensure_open()
+        payload = json.dumps(record, separators=(",", ":"), default=str).encode()
+        size = HEADER.size + len(payload)
+        if size > self.segment_bytes:
+            raise ValueError(f"record of {size} bytes exceeds segment size {self.segment_bytes}")
+        ts_us = _to_us(time.time() if ts is None else ts)
+
+        with self._lock, self._flock(exclusive=True):
+            if self.shared:
+                self._refresh()
+            ts_us = max(ts_us, self._last_ts())
+            seg = self._segments[-1]
+            if seg.end + size > self.segment_bytes:
+                seg = self._rotate()
+            offset = seg.end
+            mm = seg.mm
+            HEADER.pack_into(mm, offset, len(payload), zlib.crc32(payload), ts_us)
+            mm[offset + HEADER.size:offset + size] = payload
+            self._index(seg, offset, ts_us)
+            seg.end = offset + size
+            return seg.first_seq + seg.count - 1
+
+    def _last_ts(self) -> int:
+        for seg in reversed(self._segments):
+            if seg.count:
+                return seg.last_ts
+        return 0
+
+    def _rotate(self) -> _Segment:
+        sealed = self._segments[-1]
+        self._sync_segment(sealed)
+        # Trim the preallocated tail; readers never look past `end`
+        os.truncate(sealed.path, sealed.end)
+        seg = self._new_segment(sealed.first_seq + sealed.count)
+        if self.max_segments and len(self._segments) > self.max_segments:
+            self._drop_oldest(len(self._segments) - self.max_segments)
+        return seg
+
+    def _refresh(self) -> None:
+        """Catch up with appends and rotations by other processes (lock held)."""
+        seg = self._segments[-1]
+        try:
+            size = os.path.getsize(seg.path)
+        except FileNotFoundError:
+            # Rotated and retention-dropped while we were idle: re-list
+            newer = sorted(n for n in os.listdir(self.directory) if n.endswith(SEGMENT_SUFFIX))
+            firsts = [int(n[:-len(SEGMENT_SUFFIX)]) for n in newer]
+            for first_seq in firsts:
+                if first_seq > seg.first_seq:
+                    seg = self._adopt(first_seq)
+            if self.max_segments and len(self._segments) > self.max_segments:
+                self._drop_oldest(len(self._segments) - self.max_segments)
+            return
+        # A segment sealed elsewhere has been truncated to its end: never
+        # touch the map past the file's current size
+        self._scan(seg, min(size, len(seg.mm)))
+        added = False
+        while seg.count and os.path.exists(self._segment_path(seg.first_seq + seg.count)):
+            seg = self._adopt(seg.first_seq + seg.count)
+            added = True
+        if added and self.max_segments and len(self._segments) > self.max_segments:
+            self._drop_oldest(len(self._segments) - self.max_segments)
+
+    def _adopt(self, first_seq: int) -> _Segment:
+        """Map a segment another process created."""
+        seg = _Segment(self._segment_path(first_seq), first_seq)
+        seg.open(0)
+        self._recover(seg, verify=False)
+        self._segments.append(seg)
+        self._firsts.append(first_seq)
+        return seg
+
+    def _drop_oldest(self, n: int) -> None:
+        dropped, self._segments = self._segments[:n], self._segments[n:]
+        self._firsts = self._firsts[n:]
+        for seg in dropped:
+            # The map stays valid for readers still holding it; unlink only
+            try:
+                os.unlink(seg.path)
+            except OSError:
+                pass
+
+    def _sync_segment(self, seg: _Segment) -> None:
+        if seg.end > seg.synced and seg.mm is not None:
+            start = seg.synced - seg.synced % _PAGE
+            seg.mm.flush(start, seg.end - start)
+            seg.synced = seg.end
+            self.syncs_total += 1
+
+    def sync(self) -> None:
+        """Flush everything appended so far to disk."""
+        if not self._opened:
+            return
+        with self._lock:
+            self._sync_segment(self._segments[-1])
+
+    def close(self) -> None:
+        if not self._opened:
+            return
+        with self._lock:
+            active = self._segments[-1]
+            self._sync_segment(active)
+            for seg in self._segments:
+                seg.mm = None
+            self._segments, self._firsts = [], []
+            self._opened = False
+            if self._lock_fd is not None:
+                os.close(self._lock_fd)
+                self._lock_fd = None
+
+    # ------------------------------------------------------------------
+    # Background flusher — same start/stop contract as ExpirySweeper
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        if not self._running:
+            self._running = True
+            self._task = asyncio.create_task(self._run_loop())
+            logger.info(f"SegmentLog[{self.directory}] flusher started.")
+
+    async def stop(self) -> None:
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self.sync()
+
+    async def _run_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._running:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await loop.run_in_executor(None, self.sync)
+            except Exception as exc:
+                logger.error(f"SegmentLog flush error: {exc}", exc_info=True)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _current(self) -> Tuple[int, int]:
+        """Open (and in shared mode refresh) the log; returns (first_seq, next_seq)."""
+        self._ensure_open()
+        if self.shared:
+            with self._lock, self._flock(exclusive=False):
+                self._refresh()
+        segments = self._segments
+        return segments[0].first_seq, segments[-1].first_seq + segments[-1].count
+
+    def __len__(self) -> int:
+        first, nxt = self._current()
+        return nxt - first
+
+    @property
+    def first_seq(self) -> int:
+        return self._current()[0]
+
+    @property
+    def next_seq(self) -> int:
+        return self._current()[1]
+
+    def _decode(self, seg: _Segment, start: int, end: int) -> Dict[str, Any]:
+        return json.loads(seg.mm[start:end])
+
+    def _iter_forward(self, lo: int, hi: int) -> Iterator[Dict[str, Any]]:
+        """Records with lo <= seq <= hi, oldest first."""
+        segments, firsts = self._segments, self._firsts
+        i = bisect_right(firsts, lo) - 1
+        seq = lo
+        while seq <= hi and i < len(segments):
+            seg = segments[i]
+            rel = seq - seg.first_seq
+            block = rel // self.index_interval
+            offset = seg.offsets[block]
+            skip = rel - block * self.index_interval
+            if skip:
+                _, _, offset = seg.headers(offset, skip)[-1]
+            n = min(hi - seq + 1, seg.count - rel)
+            for _, start, end in seg.headers(offset, n):
+                yield self._decode(seg, start, end)
+            seq += n
+            i += 1
+
+    def read_newest(self, skip: int = 0, limit: int = 50) -> List[Dict[str, Any]]:
+        """One page of records, newest first, after skipping the `skip` newest."""
+        first, nxt = self._current()
+        hi = nxt - 1 - max(0, skip)
+        lo = max(first, hi - limit + 1)
+        if limit <= 0 or hi < lo:
+            return []
+        page = list(self._iter_forward(lo, hi))
+        page.reverse()
+        return page
+
+    def iter_newest(self, since: Optional[float] = None, until: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Records with since <= timestamp <= until (epoch seconds), newest
+        first. Blocks that start after `until` are skipped from the index
+        alone, and the walk stops at the first record older than `since`.
+        """
+        self._current()
+        since_us = _to_us(since) if since is not None else None
+        until_us = _to_us(until) if until is not None else None
+        interval = self.index_interval
+        for seg in reversed(list(self._segments)):
+            if since_us is not None and seg.count and seg.last_ts < since_us:
+                return
+            count = seg.count
+            for b in range(len(seg.offsets) - 1, -1, -1):
+                if until_us is not None and seg.block_ts[b] > until_us:
+                    continue
+                n = min(interval, count - b * interval)
+                for ts, start, end in reversed(seg.headers(seg.offsets[b], n)):
+                    if until_us is not None and ts > until_us:
+                        continue
+                    if since_us is not None and ts < since_us:
+                        return
+                    yield self._decode(seg, start, end)
+
+    def iter_all(self) -> Iterator[Dict[str, Any]]:
+        """Every retained record, oldest first."""
+        yield from self.iter_from(0)
+
+    def iter_from(self, seq: int) -> Iterator[Dict[str, Any]]:
+        """Retained records with sequence number >= seq, oldest first."""
+        first, nxt = self._current()
+        lo, hi = max(seq, first), nxt - 1
+        if lo <= hi:
+            yield from self._iter_forward(lo, hi)
@@ -0,0 +1,241 @@
+"""
+Revocation status lists (StatusList2021-style)
+==============================================
+Each issuer owns a bitstring in which every issued credential gets one bit.
+Bit i set → credential with statusListIndex i is revoked.
+
+  - Revocation checks are a single bit test, no record lookup.
+  - The published artifact is the gzip-compressed bitstring (base64url in
+    JSON), cached per version and tagged with a strong ETag.
+  - A bounded change journal lets verifiers sync with a small diff instead
+    of re-downloading the whole list.
+
+Bit ordering follows StatusList2021: index 0 is the left-most (most
+significant) bit of the first byte.
+
+With a shared store backend (utils.kvstore) attached, allocation and
+revocation go through two shared tables — per-list counters and one record
+per change version — and each process replays the changes it has not seen
+before answering, so indexes, bits and versions agree across workers.
+"""
+
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+import base64
+import gzip
+import hashlib
+import threading
+
+# 16 KB of bits — the StatusList2021 minimum, which also hides how many
+# credentials an issuer has issued.
+DEFAULT_CAPACITY = 131_072
+DIFF_JOURNAL_LIMIT = 10_000
+
+
+class StatusList:
+    """Growable revocation bitstring for a single issuer."""
+
+    def __init__(self, list_id: str, capacity: int = DEFAULT_CAPACITY) -> None:
+        capacity = max(8, -(-capacity // 8) * 8)
+        self.list_id    = list_id
+        self.bits       = bytearray(capacity // 8)
+        self.next_index = 0
+        self.version    = 0
+        self._journal: Deque[Tuple[int, int, bool]] = deque(maxlen=DIFF_JOURNAL_LIMIT)
+        self._encoded: Optional[Tuple[int, int, bytes, str]] = None   # (version, size, gz, etag)
+        self._lock = threading.Lock()
+        self._shared: Optional[Tuple[Any, Any]] = None   # (states, changes) tables when attached
+
+    # ------------------------------------------------------------------
+    # Allocation / mutation
+    # ------------------------------------------------------------------
+
+    @property
+    def capacity(self) -> int:
+        return len(self.bits) * 8
+
+    def allocate(self) -> int:
+        """Reserve the next index for a newly issued credential."""
+        if self._shared is not None:
+            state = self._shared[0].modify(self.list_id, _next_index)
+            self.sync(state)
+            return state["next_index"] - 1
+        with self._lock:
+            return self._allocate()
+
+    def _allocate(self) -> int:
+        index = self.next_index
+        if index >= self.capacity:
+            # Double the bitstring; new bits are zero (= not revoked)
+            self.bits.extend(bytes(len(self.bits)))
+        self.next_index = index + 1
+        return index
+
+    def set_revoked(self, index: int, revoked: bool = True) -> bool:
+        """Flip one bit. Returns True if the status actually changed."""
+        if self._shared is not None:
+            self.sync()
+        if index < 0 or index >= self.next_index:
+            raise IndexError(f"status list index {index} not allocated in {self.list_id}")
+        if self._shared is not None:
+            if self.is_revoked(index) == revoked:
+                return False
+            states, changes = self._shared
+            state = states.modify(self.list_id, _next_version)
+            changes[_change_key(self.list_id, state["version"])] = (index, revoked)
+            self.sync(state)
+            return True
+        with self._lock:
+            return self._flip(index, revoked, self.version + 1)
+
+    def _flip(self, index: int, revoked: bool, version: int) -> bool:
+        byte, mask = index >> 3, 0x80 >> (index & 7)
+        current = bool(self.bits[byte] & mask)
+        if current == revoked:
+            return False
+        if revoked:
+            self.bits[byte] |= mask
+        else:
+            self.bits[byte] &= ~mask & 0xFF
+        self.version = version
+        self._journal.append((version, index, revoked))
+        return True
+
+    def sync(self, state: Optional[Dict[str, int]] = None) -> None:
+        """Catch up with allocations and changes made by other processes (shared mode)."""
+        if self._shared is None:
+            return
+        states, changes = self._shared
+        if state is None:
+            state = states.get(self.list_id)
+            if state is None:
+                return
+        if state["next_index"] <= self.next_index and state["version"] <= self.version:
+            return
+        with self._lock:
+            while self.next_index < state["next_index"]:
+                self._allocate()
+            for version in range(self.version + 1, state["version"] + 1):
+                change = changes.get(_change_key(self.list_id, version))
+                if change is None:
+                    break        # its writer has not stored it yet; picked up next time
+                index, revoked = change
+                while self.next_index <= index:
+                    self._allocate()
+                if not self._flip(index, revoked, version):
+                    self.version = version   # a duplicate revocation still consumes its version
+
+    # ------------------------------------------------------------------
+    # Checks
+    # ------------------------------------------------------------------
+
+    def is_revoked(self, index: int) -> bool:
+        """O(1) bit test. Unallocated indices are reported as not revoked."""
+        if index < 0 or index >= self.capacity:
+            return False
+        return bool(self.bits[index >> 3] & (0x80 >> (index & 7)))
+
+    # ------------------------------------------------------------------
+    # Publication
+    # ------------------------------------------------------------------
+
+    def encoded(self) -> Tuple[bytes, str]:
+        """Return (gzip bytes, ETag), re-compressing only when the list changed."""
+        cached = self._encoded
+        size = len(self.bits)
+        if cached and cached[0] == self.version and cached[1] == size:
+            return cached[2], cached[3]
+        with self._lock:
+            version, snapshot = self.version, bytes(self.bits)
+        gz = gzip.compress(snapshot, compresslevel=9, mtime=0)
+        # Content hash: versions restart at 0 with the process (memory store),
+        # so a version-based tag could match stale bits after a restart
+        tag = hashlib.sha256(self.list_id.encode() + b":" + gz).hexdigest()[:20]
+        etag = f'"{tag}"'
+        self._encoded = (version, len(snapshot), gz, etag)
+        return gz, etag
+
+    def encoded_list(self) -> str:
+        """base64url (no padding) of the gzip'd bitstring — the `encodedList` field."""
+        gz, _ = self.encoded()
+        return base64.urlsafe_b64encode(gz).rstrip(b"=").decode()
+
+    def diff(self, since_version: int) -> Optional[List[Tuple[int, bool]]]:
+        """
+        Changes after `since_version` as (index, revoked) pairs, latest state
+        per index. Returns None when the journal no longer reaches back that
+        far and the client has to re-fetch the full list.
+        """
+        if since_version >= self.version:
+            return []
+        changes: Dict[int, bool] = {}
+        with self._lock:
+            oldest = self._journal[0][0] if self._journal else self.version + 1
+            if oldest > since_version + 1:
+                return None
+            # Walk newest-first so only the tail after since_version is touched
+            for version, index, revoked in reversed(self._journal):
+                if version <= since_version:
+                    break
+                changes.setdefault(index, revoked)
+        return sorted(changes.items())
+
+
+def _change_key(list_id: str, version: int) -> str:
+    return f"{list_id}:{version:012d}"
+
+
+def _next_index(state: Optional[Dict[str, int]]) -> Dict[str, int]:
+    state = dict(state or {"next_index": 0, "version": 0})
+    state["next_index"] += 1
+    return state
+
+
+def _next_version(state: Optional[Dict[str, int]]) -> Dict[str, int]:
+    state = dict(state or {"next_index": 0, "version": 0})
+    state["version"] += 1
+    return state
+
+
+class StatusListRegistry:
+    """One status list per issuer, created on first use."""
+
+    def __init__(self) -> None:
+        self._lists: Dict[str, StatusList] = {}
+        self._lock = threading.Lock()
+        self._shared: Optional[Tuple[Any, Any]] = None
+
+    def attach(self, states: Any, changes: Any) -> None:
+        """Back every list with shared kvstore tables (call once, before first use)."""
+        self._shared = (states, changes)
+        for sl in self._lists.values():
+            sl._shared = self._shared
+
+    def get(self, list_id: str) -> Optional[StatusList]:
+        sl = self._lists.get(list_id)
+        if sl is None and self._shared is not None and list_id in self._shared[0]:
+            sl = self.get_or_create(list_id)
+        if sl is not None:
+            sl.sync()
+        return sl
+
+    def get_or_create(self, list_id: str) -> StatusList:
+        sl = self._lists.get(list_id)
+        if sl is None:
+            with self._lock:
+                sl = self._lists.get(list_id)
+                if sl is None:
+                    sl = StatusList(list_id)
+                    sl._shared = self._shared
+                    self._lists[list_id] = sl
+        sl.sync()
+        return sl
+
+    def ids(self) -> List[str]:
+        if self._shared is not None:
+            return list(dict.fromkeys([*self._lists, *self._shared[0]]))
+        return list(self._lists)
+
+
+# Module-level singleton shared by the issuer and PrivaSeal routers
+status_lists = StatusListRegistry()
@@ -0,0 +1,292 @@
+"""
+Write-ahead journal + snapshots for in-memory dict stores
+=========================================================
+Keeps a set of named dicts (table → {key: record}) durable across restarts.
+
+  - Every mutation is logged as a full-record upsert (or delete) to a WAL:
+        u32 length | u32 crc32 | pickle((table, key, value), protocol 5)
+    Writes go through a buffered file; a background task flushes + fsyncs
+    every `sync_interval` seconds (batched fsync).
+  - Every `snapshot_every` mutations (or `snapshot_interval` seconds) the WAL
+    rolls to a new generation and the tables are pickled to
+    snapshot-<gen>.pkl in the threadpool, written to a temp file and renamed.
+    WAL generations older than the newest snapshot are then deleted.
+  - Recovery loads the newest snapshot and replays WAL generations >= its
+    generation; a torn final frame is ignored.
+
+Because WAL entries carry whole records, replay is idempotent. The snapshot
+may therefore include a few mutations that are also in the WAL tail it
+starts from (it is taken while the service keeps running) without any
+locking between the two.
+"""
+
+from fastapi.concurrency import run_in_threadpool
+from typing import Any, Dict, List, Optional
+import asyncio
+import gc
+import logging
+import os
+import pickle
+import struct
+import time
+import zlib
+
+logger = logging.getLogger("store_journal")
+
+FRAME = struct.Struct("<II")
+PROTOCOL = 5
+_DELETE = ("__journal_delete__",)
+
+
+class StoreJournal:
+    """
+    Like ExpirySweeper, start() must be called from inside the running loop;
+    load() must run before it (and before the first mutation).
+    """
+
+    def __init__(
+        self,
+        directory:         str,
+        tables:            Dict[str, Dict[Any, Any]],
+        snapshot_every:    int = 100_000,
+        snapshot_interval: float = 300.0,
+        sync_interval:     float = 0.2,
+    ) -> None:
+        self.directory         = directory
+        self.tables            = tables
+        self.snapshot_every    = snapshot_every
+        self.snapshot_interval = snapshot_interval
+        self.sync_interval     = sync_interval
+        self.generation = 0
+        self._wal = None
+        self._since_snapshot = 0
+        self._last_snapshot = time.monotonic()
+        self._snapshotting = False
+        self._running = False
+        self._task: Optional[asyncio.Task] = None   # type: ignore[type-arg]
+        # Metrics
+        self.mutations_total = 0
+        self.snapshots_total = 0
+        self.last_snapshot_seconds = 0.0
+        self.last_load: Dict[str, Any] = {}
+
+    # ------------------------------------------------------------------
+    # Recovery
+    # ------------------------------------------------------------------
+
+    def _path(self, kind: str, generation: int) -> str:
+        ext = "pkl" if kind == "snapshot" else "log"
+        return os.path.join(self.directory, f"{kind}-{generation:012d}.{ext}")
+
+    def _generations(self, kind: str) -> List[int]:
+        prefix = f"{kind}-"
+        gens = []
+        for name in os.listdir(self.directory):
+            if name.startswith(prefix) and not name.endswith(".tmp"):
+                try:
+                    gens.append(int(name[len(prefix):].split(".")[0]))
+                except ValueError:
+                    continue
+        return sorted(gens)
+
+    def load(self) -> Dict[str, Any]:
+        """Restore the tables from disk and open a fresh WAL generation."""
+        start = time.perf_counter()
+        os.makedirs(self.directory, exist_ok=True)
+        # Millions of freshly unpickled dicts would otherwise trigger a long
+        # series of pointless cyclic-GC passes
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            restored, replayed, base, snapshots = self._load()
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        self.last_load = {
+            "snapshotGeneration": base if snapshots else None,
+            "snapshotRecords":    restored,
+            "walRecords":         replayed,
+            "seconds":            round(time.perf_counter() - start, 3),
+        }
+        logger.info(f"StoreJournal[{self.directory}] loaded: {self.last_load}")
+        return self.last_load
+
+    def _load(self):
+        snapshots = self._generations("snapshot")
+        base = snapshots[-1] if snapshots else 0
+        restored = 0
+        if snapshots:
+            with open(self._path("snapshot", base), "rb") as fh:
+                saved = pickle.load(fh)
+            for name, rows in saved["tables"].items():
+                if name in self.tables:
+                    self.tables[name].update(rows)
+                    restored += len(rows)
+
+        replayed = 0
+        wal_gens = [g for g in self._generations("wal") if g >= base]
+        for gen in wal_gens:
+            replayed += self._replay(self._path("wal", gen))
+
+        self.generation = (wal_gens[-1] + 1) if wal_gens else base + 1
+        self._open_wal()
+        return restored, replayed, base, snapshots
+
+    def _replay(self, path: str) -> int:
+        with open(path, "rb") as fh:
+            data = fh.read()
+        offset, count, size = 0, 0, len(data)
+        while offset + FRAME.size <= size:
+            length, crc = FRAME.unpack_from(data, offset)
+            start, end = offset + FRAME.size, offset + FRAME.size + length
+            if length == 0 or end > size or zlib.crc32(data[start:end]) != crc:
+                break
+            table, key, value = pickle.loads(data[start:end])
+            rows = self.tables.get(table)
+            if rows is not None:
+                if value == _DELETE:
+                    rows.pop(key, None)
+                else:
+                    rows[key] = value
+            count += 1
+            offset = end
+        if offset < size:
+            logger.warning(f"StoreJournal: ignoring torn tail of {path} at offset {offset}")
+        return count
+
+    # ------------------------------------------------------------------
+    # Logging mutations
+    # ------------------------------------------------------------------
+
+    def _open_wal(self) -> None:
+        self._wal = open(self._path("wal", self.generation), "ab", buffering=256 * 1024)
+
+    def _write(self, table: str, key: Any, value: Any) -> None:
+        if self._wal is None:
+            return   # not loaded (e.g. imported by a tool) — nothing to journal into
+        payload = pickle.dumps((table, key, value), protocol=PROTOCOL)
+        self._wal.write(FRAME.pack(len(payload), zlib.crc32(payload)) + payload)
+        self.mutations_total += 1
+        self._since_snapshot += 1
+
+    def put(self, table: str, key: Any, value: Any) -> None:
+        """Log the current value of tables[table][key] (call after mutating it)."""
+        self._write(table, key, value)
+
+    def delete(self, table: str, key: Any) -> None:
+        self._write(table, key, _DELETE)
+
+    def sync(self) -> None:
+        wal = self._wal
+        if wal is not None and not wal.closed:
+            wal.flush()
+            os.fsync(wal.fileno())
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    async def snapshot(self) -> Optional[str]:
+        """Roll the WAL and write a snapshot of every table. Returns its path."""
+        if self._wal is None or self._snapshotting:
+            return None
+        self._snapshotting = True
+        try:
+            # Roll first: the snapshot covers everything before the new
+            # generation, and replay starts from it
+            old = self._wal
+            self.generation += 1
+            self._open_wal()
+            gen = self.generation
+            await run_in_threadpool(self._close_wal, old)
+
+            tables = {name: dict(rows) for name, rows in self.tables.items()}
+            pending, self._since_snapshot = self._since_snapshot, 0
+            self._last_snapshot = time.monotonic()
+            start = time.perf_counter()
+            try:
+                path = await run_in_threadpool(self._write_snapshot, gen, tables)
+            except Exception:
+                # The WAL still holds everything; try again on the next tick
+                self._since_snapshot += max(pending, self.snapshot_every)
+                raise
+            self.last_snapshot_seconds = time.perf_counter() - start
+            self.snapshots_total += 1
+            return path
+        finally:
+            self._snapshotting = False
+
+    @staticmethod
+    def _close_wal(wal) -> None:
+        wal.flush()
+        os.fsync(wal.fileno())
+        wal.close()
+
+    def _write_snapshot(self, gen: int, tables: Dict[str, Dict[Any, Any]]) -> str:
+        path = self._path("snapshot", gen)
+        tmp = path + ".tmp"
+        # dumps() rather than dump(fh): no file I/O (and so no GIL release)
+        # while records that the event loop may touch are being walked
+        data = pickle.dumps({"generation": gen, "tables": tables}, protocol=PROTOCOL)
+        with open(tmp, "wb") as fh:
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        del data
+        os.replace(tmp, path)
+        # Older snapshots and the WAL they needed are now redundant
+        for g in self._generations("snapshot"):
+            if g < gen:
+                os.unlink(self._path("snapshot", g))
+        for g in self._generations("wal"):
+            if g < gen:
+                os.unlink(self._path("wal", g))
+        return path
+
+    def _snapshot_due(self) -> bool:
+        if self._since_snapshot == 0:
+            return False
+        return (self._since_snapshot >= self.snapshot_every
+                or time.monotonic() - self._last_snapshot >= self.snapshot_interval)
+
+    # ------------------------------------------------------------------
+    # Background task
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        if not self._running:
+            self._running = True
+            self._task = asyncio.create_task(self._run_loop())
+            logger.info(f"StoreJournal[{self.directory}] started.")
+
+    async def stop(self) -> None:
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._wal is not None:
+            self._close_wal(self._wal)
+            self._wal = None
+
+    async def _run_loop(self) -> None:
+        while self._running:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await run_in_threadpool(self.sync)
+                if self._snapshot_due():
+                    await self.snapshot()
+            except Exception as exc:
+                logger.error(f"StoreJournal error: {exc}", exc_info=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "generation":          self.generation,
+            "mutations":           self.mutations_total,
+            "sinceSnapshot":       self._since_snapshot,
+            "snapshots":           self.snapshots_total,
+            "lastSnapshotSeconds": round(self.last_snapshot_seconds, 3),
+            "lastLoad":            self.last_load,
+        }
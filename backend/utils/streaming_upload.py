@@ -0,0 +1,270 @@
+"""
+Streaming multipart uploads
+===========================
+Parses a multipart/form-data body straight off `request.stream()`:
+
+  - parsing is python-multipart's streaming MultipartParser (the one
+    Starlette uses); its callbacks only record events, which are handled
+    after each network chunk, as Starlette's own form parser does
+  - file parts are written chunk by chunk to a temp file on the blob store's
+    filesystem while a sha256 is updated incrementally, so nothing larger
+    than one network chunk is ever held in memory; the writes, the hashing
+    and opening / closing the temp files run in the threadpool, one hop per
+    network chunk, never on the event loop
+  - per-file, per-field and whole-body limits are checked as bytes arrive;
+    the first byte over a limit aborts the read with a 413 (a Content-Length
+    that is already too big is rejected before reading anything)
+  - finished files are handed back as (digest, temp path) pairs ready for
+    BlobStore.adopt_file(), which is a rename — no second pass over the data
+"""
+
+from fastapi import HTTPException, Request
+from multipart.exceptions import MultipartParseError
+from multipart.multipart import MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import os
+import tempfile
+
+from utils.blob_store import sniff_media_type
+
+DEFAULT_FIELD_LIMIT = 1024
+MAX_HEADER_BYTES = 16 * 1024
+
+# Parser events, recorded by the callbacks and handled once per chunk
+_BEGIN, _HEADER_FIELD, _HEADER_VALUE, _HEADER_END, _HEADERS_DONE, _DATA, _END, _DONE = range(8)
+
+
+class StreamedFile:
+    """A file part that has been spooled to disk and hashed."""
+
+    def __init__(self, field: str, filename: str, tmp_path: str) -> None:
+        self.field      = field
+        self.filename   = filename
+        self.tmp_path   = tmp_path
+        self.size       = 0
+        self.digest     = ""
+        self.media_type = "application/octet-stream"
+
+
+class _Part:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.data = bytearray()                 # text fields only
+        self.file: Optional[StreamedFile] = None
+        self.fh = None
+        self.sha = None
+        self.head = b""
+        self.pending: List[bytes] = []          # file data not yet written
+
+
+class StreamingUpload:
+    """
+    One-shot parser for a single request.
+
+        upload = StreamingUpload(blob_store.temp_dir(), file_fields=("front_image", ...))
+        fields, files = await upload.parse(request)
+
+    Temp files of an aborted or failed parse are removed; on success the
+    caller owns them (adopt or discard()).
+    """
+
+    def __init__(
+        self,
+        tmp_dir:     str,
+        file_fields: Tuple[str, ...],
+        file_limit:  int,
+        field_limit: int = DEFAULT_FIELD_LIMIT,
+        body_limit:  Optional[int] = None,
+    ) -> None:
+        self.tmp_dir     = tmp_dir
+        self.file_fields = file_fields
+        self.file_limit  = file_limit
+        self.field_limit = field_limit
+        self.body_limit  = body_limit if body_limit is not None else file_limit * len(file_fields) + 64 * 1024
+        self.fields: Dict[str, str] = {}
+        self.files:  Dict[str, StreamedFile] = {}
+        self._part: Optional[_Part] = None
+        self._open: List[_Part] = []
+        self._events: List[Tuple[int, Any]] = []
+        self._headers: List[Tuple[bytes, bytes]] = []
+        self._header_field = b""
+        self._header_value = b""
+        self._header_bytes = 0
+
+    # ------------------------------------------------------------------
+    # Driver
+    # ------------------------------------------------------------------
+
+    async def parse(self, request: Request) -> Tuple[Dict[str, str], Dict[str, StreamedFile]]:
+        content_type, params = parse_options_header(request.headers.get("content-type", ""))
+        if content_type != b"multipart/form-data" or not params.get(b"boundary"):
+            raise HTTPException(status_code=415, detail="Expected multipart/form-data")
+
+        declared = request.headers.get("content-length")
+        if declared and declared.isdigit() and int(declared) > self.body_limit:
+            raise HTTPException(status_code=413, detail="Upload too large")
+
+        parser = MultipartParser(params[b"boundary"], self._callbacks())
+        received = 0
+        done = False
+        try:
+            async for chunk in request.stream():
+                received += len(chunk)
+                if received > self.body_limit:
+                    raise HTTPException(status_code=413, detail="Upload too large")
+                try:
+                    parser.write(chunk)
+                except MultipartParseError:
+                    raise HTTPException(status_code=400, detail="Malformed multipart body")
+                done = await self._handle_events()
+                if done:
+                    break
+            if not done:
+                raise HTTPException(status_code=400, detail="Truncated multipart body")
+        except BaseException:
+            await run_in_threadpool(self._cleanup)
+            raise
+        return self.fields, self.files
+
+    def _callbacks(self) -> Dict[str, Any]:
+        events = self._events
+
+        def data_event(kind: int):
+            # The parser reuses its buffer: copy the slice out now
+            return lambda data, start, end: events.append((kind, data[start:end]))
+
+        return {
+            "on_part_begin":       lambda: events.append((_BEGIN, None)),
+            "on_header_field":     data_event(_HEADER_FIELD),
+            "on_header_value":     data_event(_HEADER_VALUE),
+            "on_header_end":       lambda: events.append((_HEADER_END, None)),
+            "on_headers_finished": lambda: events.append((_HEADERS_DONE, None)),
+            "on_part_data":        data_event(_DATA),
+            "on_part_end":         lambda: events.append((_END, None)),
+            "on_end":              lambda: events.append((_DONE, None)),
+        }
+
+    async def _handle_events(self) -> bool:
+        """Handle the events of one chunk; True once the closing boundary was seen."""
+        events = self._events[:]
+        self._events.clear()
+        done = False
+        for kind, value in events:
+            if kind == _DATA:
+                self._part_data(value)
+            elif kind == _HEADER_FIELD or kind == _HEADER_VALUE:
+                self._header_bytes += len(value)
+                if self._header_bytes > MAX_HEADER_BYTES:
+                    raise HTTPException(status_code=413, detail="Multipart headers too large")
+                if kind == _HEADER_FIELD:
+                    self._header_field += value
+                else:
+                    self._header_value += value
+            elif kind == _HEADER_END:
+                self._headers.append((self._header_field.lower(), self._header_value))
+                self._header_field = self._header_value = b""
+            elif kind == _BEGIN:
+                self._headers, self._header_bytes = [], 0
+            elif kind == _HEADERS_DONE:
+                await self._begin_part(self._headers)
+            elif kind == _END:
+                await self._end_part()
+            elif kind == _DONE:
+                done = True
+        await self._flush(self._part)
+        return done
+
+    # ------------------------------------------------------------------
+    # Part handling
+    # ------------------------------------------------------------------
+
+    async def _begin_part(self, headers: List[Tuple[bytes, bytes]]) -> None:
+        disposition = b""
+        for name, value in headers:
+            if name.strip() == b"content-disposition":
+                disposition = value.strip()
+        _, options = parse_options_header(disposition)
+        if b"name" not in options:
+            raise HTTPException(status_code=400, detail="Multipart part is missing a field name")
+        name = options[b"name"].decode("utf-8", "replace")
+        if name in self.fields or name in self.files:
+            raise HTTPException(status_code=400, detail=f"Duplicate field '{name}'")
+
+        part = self._part = _Part(name)
+        if b"filename" not in options:
+            return
+        if name not in self.file_fields:
+            raise HTTPException(status_code=400, detail=f"Unexpected file field '{name}'")
+        fd, tmp_path = await run_in_threadpool(tempfile.mkstemp, dir=self.tmp_dir, prefix="upload-")
+        part.fh   = os.fdopen(fd, "wb")
+        part.sha  = hashlib.sha256()
+        part.file = StreamedFile(name, options[b"filename"].decode("utf-8", "replace"), tmp_path)
+        self._open.append(part)
+
+    def _part_data(self, chunk: bytes) -> None:
+        """Check limits now; file data is written by _flush()."""
+        part = self._part
+        if not chunk or part is None:
+            return
+        if part.file is None:
+            if len(part.data) + len(chunk) > self.field_limit:
+                raise HTTPException(status_code=413, detail=f"Field '{part.name}' too large")
+            part.data += chunk
+            return
+        part.file.size += len(chunk)
+        if part.file.size > self.file_limit:
+            raise HTTPException(
+                status_code=413,
+                detail=f"{part.name} too large (max {self.file_limit // (1024 * 1024)} MB)",
+            )
+        if len(part.head) < 16:
+            part.head += chunk[:16 - len(part.head)]
+        part.pending.append(chunk)
+
+    async def _flush(self, part: Optional[_Part]) -> None:
+        if part is None or not part.pending:
+            return
+        chunks, part.pending = part.pending, []
+        await run_in_threadpool(_write_chunks, part, chunks)
+
+    async def _end_part(self) -> None:
+        part, self._part = self._part, None
+        if part is None:
+            return
+        if part.file is None:
+            self.fields[part.name] = part.data.decode("utf-8", "replace")
+            return
+        await self._flush(part)
+        await run_in_threadpool(part.fh.close)
+        part.fh = None
+        part.file.digest     = part.sha.hexdigest()
+        part.file.media_type = sniff_media_type(part.head)
+        self.files[part.name] = part.file
+
+    def discard(self) -> None:
+        """Remove temp files the caller did not adopt."""
+        for f in self.files.values():
+            _silent_unlink(f.tmp_path)
+
+    def _cleanup(self) -> None:
+        for part in self._open:
+            if part.fh is not None:
+                part.fh.close()
+            if part.file is not None:
+                _silent_unlink(part.file.tmp_path)
+
+
+def _write_chunks(part: _Part, chunks: List[bytes]) -> None:
+    # hashlib releases the GIL for large updates, so this overlaps the loop
+    for chunk in chunks:
+        part.sha.update(chunk)
+        part.fh.write(chunk)
+
+
+def _silent_unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
@@ -0,0 +1,143 @@
+"""
+Review thumbnails for blob-store images
+=======================================
+Admins mostly need a glance at each document, not the multi-megabyte
+original. Thumbnails are derived once per blob and cached on disk next to
+the blob store:
+
+    <root>/ab/cd/<digest>-<edge>.jpg
+
+Derivatives are keyed by the source digest, so they never go stale and
+identical uploads share one thumbnail. Generation runs in a background
+worker fed from the upload path; a request for a thumbnail the worker has
+not reached yet renders it inline (in the threadpool) instead of waiting.
+"""
+
+from fastapi.concurrency import run_in_threadpool
+from typing import Optional, Set
+import asyncio
+import logging
+import os
+import tempfile
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from utils.blob_store import BlobStore
+
+logger = logging.getLogger("thumbnails")
+
+THUMB_EDGE = 320
+THUMB_QUALITY = 70
+MAX_SOURCE_PIXELS = 40_000_000   # refuse decompression bombs well before Pillow's own limit
+
+
+class ThumbnailCache:
+    def __init__(self, blobs: BlobStore, root: str, edge: int = THUMB_EDGE) -> None:
+        self.blobs = blobs
+        self.root  = root
+        self.edge  = edge
+        self._failed: Set[str] = set()   # digests Pillow could not decode
+
+    def path(self, digest: str) -> str:
+        self.blobs.path(digest)          # validates the digest
+        return os.path.join(self.root, digest[:2], digest[2:4], f"{digest}-{self.edge}.jpg")
+
+    def exists(self, digest: str) -> bool:
+        try:
+            return os.path.exists(self.path(digest))
+        except ValueError:
+            return False
+
+    def failed(self, digest: str) -> bool:
+        return digest in self._failed
+
+    def generate(self, digest: str) -> Optional[str]:
+        """
+        Render the thumbnail for `digest` if it is not cached yet. Returns its
+        path, or None when the blob is not a decodable image. Blocking — call
+        from a worker thread.
+        """
+        target = self.path(digest)
+        if os.path.exists(target):
+            return target
+        if digest in self._failed or not self.blobs.exists(digest):
+            return None
+        try:
+            with Image.open(self.blobs.path(digest)) as img:
+                if img.width * img.height > MAX_SOURCE_PIXELS:
+                    raise ValueError(f"{img.width}x{img.height} exceeds the source pixel limit")
+                # JPEG draft mode decodes straight at 1/2..1/8 scale
+                img.draft("RGB", (self.edge, self.edge))
+                img = ImageOps.exif_transpose(img)
+                img.thumbnail((self.edge, self.edge), Image.LANCZOS)
+                if img.mode != "RGB":
+                    img = img.convert("RGB")
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target), prefix=".tmp-")
+                try:
+                    with os.fdopen(fd, "wb") as fh:
+                        img.save(fh, "JPEG", quality=THUMB_QUALITY, optimize=True, progressive=True)
+                    os.replace(tmp, target)
+                except BaseException:
+                    try:
+                        os.unlink(tmp)
+                    except OSError:
+                        pass
+                    raise
+        except (UnidentifiedImageError, OSError, ValueError, Image.DecompressionBombError) as exc:
+            logger.warning(f"Thumbnail for {digest[:12]}… not generated: {exc}")
+            self._failed.add(digest)
+            return None
+        return target
+
+
+class ThumbnailWorker:
+    """
+    Background task that renders queued thumbnails one at a time.
+    Like ExpirySweeper, start() must be called from inside the running loop.
+    """
+
+    def __init__(self, cache: ThumbnailCache, queue_size: int = 1024) -> None:
+        self.cache = cache
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(queue_size)
+        self.generated_total = 0
+        self.skipped_total   = 0
+        self._pending: Set[str] = set()
+        self._running = False
+        self._task: Optional[asyncio.Task] = None   # type: ignore[type-arg]
+
+    def submit(self, digest: Optional[str]) -> None:
+        """Queue `digest` without blocking; a full queue just defers to on-demand rendering."""
+        if not digest or digest in self._pending or self.cache.exists(digest) or self.cache.failed(digest):
+            return
+        try:
+            self.queue.put_nowait(digest)
+            self._pending.add(digest)
+        except asyncio.QueueFull:
+            self.skipped_total += 1
+
+    def start(self) -> None:
+        if not self._running:
+            self._running = True
+            self._task = asyncio.create_task(self._run_loop())
+            logger.info("ThumbnailWorker started.")
+
+    async def stop(self) -> None:
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run_loop(self) -> None:
+        while self._running:
+            digest = await self.queue.get()
+            try:
+                if await run_in_threadpool(self.cache.generate, digest):
+                    self.generated_total += 1
+            except Exception as exc:
+                logger.error(f"ThumbnailWorker error: {exc}", exc_info=True)
+            finally:
+                self._pending.discard(digest)
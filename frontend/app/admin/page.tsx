@@ -22,11 +22,12 @@ interface Request {
 }
 interface RequestDetail extends Request {
     front_image: string | null; back_image: string | null; selfie_image: string | null;
+    front_thumb: string | null; back_thumb: string | null; selfie_thumb: string | null;
 }
 interface Stats { total: number; pending: number; approved: number; rejected: number; reupload: number; }
 
 // ── Image Preview Helper ───────────────────────────────────────────────────────
-function DocImage({ src, label }: { src: string | null; label: string }) {
+function DocImage({ src, thumb, label }: { src: string | null; thumb?: string | null; label: string }) {
     const [zoom, setZoom] = useState(false);
     if (!src) return (
         <div className="bg-slate-900/60 rounded-xl h-28 flex flex-col items-center justify-center gap-1">
@@ -38,7 +39,7 @@ function DocImage({ src, label }: { src: string | null; label: string }) {
         <>
             <div className="group relative rounded-xl overflow-hidden border border-white/10 cursor-pointer" onClick={() => setZoom(true)}>
                 {/* eslint-disable-next-line @next/next/no-img-element */}
-                <img src={src} alt={label} className="w-full h-28 object-cover" />
+                <img src={thumb || src} alt={label} loading="lazy" className="w-full h-28 object-cover" />
                 <div className="absolute inset-0 bg-black/40 opacity-0 group-hover:opacity-100 transition-opacity flex items-center justify-center">
                     <Eye className="w-5 h-5 text-white" />
                 </div>
@@ -335,9 +336,9 @@ function AdminPanelContent() {
                                         <Camera className="w-3.5 h-3.5" /> Document Images (Admin Only)
                                     </p>
                                     <div className="grid grid-cols-3 gap-2">
-                                        <DocImage src={detail.front_image} label="Front" />
-                                        <DocImage src={detail.back_image} label="Back" />
-                                        <DocImage src={detail.selfie_image} label="Selfie" />
+                                        <DocImage src={detail.front_image} thumb={detail.front_thumb} label="Front" />
+                                        <DocImage src={detail.back_image} thumb={detail.back_thumb} label="Back" />
+                                        <DocImage src={detail.selfie_image} thumb={detail.selfie_thumb} label="Selfie" />
                                     </div>
                                 </div>
 
@@ -15,32 +15,60 @@ import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@
 import { useToast } from "@/components/ui/use-toast";
 import { Progress } from "@/components/ui/progress";
 
+const BACKEND = process.env.NEXT_PUBLIC_API_BASE_URL || "http://localhost:8000";
+
 export default function ExportCenterPage() {
     const { toast } = useToast();
     const [isExporting, setIsExporting] = useState(false);
     const [progress, setProgress] = useState(0);
     const [exportFormat, setExportFormat] = useState("csv");
 
+    const [source, setSource] = useState("issued");
+    const [range, setRange] = useState("30d");
+    const [typeFilter, setTypeFilter] = useState("all");
+
+    // Each data source maps to a streaming export endpoint on the backend
+    const EXPORT_ENDPOINTS: Record<string, string> = {
+        issued: "/api/issuer/export",
+        logs: "/api/verifier/export",
+        audit: "/api/privaseal/audit/export",
+    };
+
+    const rangeStart = (value: string): string | null => {
+        const now = new Date();
+        if (value === "7d") return new Date(now.getTime() - 7 * 86400000).toISOString();
+        if (value === "30d") return new Date(now.getTime() - 30 * 86400000).toISOString();
+        if (value === "q1") return new Date(Date.UTC(now.getUTCFullYear(), 0, 1)).toISOString();
+        return null;
+    };
+
     const startExport = async () => {
+        const endpoint = EXPORT_ENDPOINTS[source];
+        if (!endpoint) {
+            toast({ title: "Not available", description: "This data source cannot be exported yet.", variant: "destructive" });
+            return;
+        }
+
         setIsExporting(true);
         setProgress(0);
 
-        // Progress simulation
-        const interval = setInterval(() => {
-            setProgress(prev => {
-                if (prev >= 100) {
-                    clearInterval(interval);
-                    return 100;
-                }
-                return prev + 10;
-            });
-        }, 300);
+        const params = new URLSearchParams({ format: exportFormat, gzip: "true" });
+        const since = rangeStart(range);
+        if (since) params.set("since", since);
+        if (range === "q1") params.set("until", new Date(Date.UTC(new Date().getUTCFullYear(), 3, 1)).toISOString());
+        if (source === "issued" && typeFilter !== "all") params.set("type_filter", typeFilter);
 
-        await new Promise(r => setTimeout(r, 3500));
+        // Let the browser stream the download straight to disk instead of buffering it in JS
+        const link = document.createElement("a");
+        link.href = `${BACKEND}${endpoint}?${params.toString()}`;
+        document.body.appendChild(link);
+        link.click();
+        link.remove();
 
+        setProgress(100);
         toast({
-            title: "Export Ready ✅",
-            description: `Your ${exportFormat.toUpperCase()} file is ready for download.`,
+            title: "Export Started ✅",
+            description: `Your ${exportFormat.toUpperCase()} file is downloading.`,
         });
         setIsExporting(false);
     };
@@ -67,7 +95,7 @@ export default function ExportCenterPage() {
                             <div className="space-y-6">
                                 <div className="space-y-2">
                                     <label className="text-[10px] font-black text-slate-500 uppercase tracking-widest px-1">Report Data Source</label>
-                                    <Select defaultValue="issued">
+                                    <Select value={source} onValueChange={setSource}>
                                         <SelectTrigger className="bg-slate-950/50 border-white/10 text-white h-11">
                                             <SelectValue />
                                         </SelectTrigger>
@@ -82,7 +110,7 @@ export default function ExportCenterPage() {
 
                                 <div className="space-y-2">
                                     <label className="text-[10px] font-black text-slate-500 uppercase tracking-widest px-1">Date Range</label>
-                                    <Select defaultValue="30d">
+                                    <Select value={range} onValueChange={setRange}>
                                         <SelectTrigger className="bg-slate-950/50 border-white/10 text-white h-11">
                                             <Calendar className="w-3.5 h-3.5 mr-2" />
                                             <SelectValue />
@@ -91,21 +119,22 @@ export default function ExportCenterPage() {
                                             <SelectItem value="7d">Last 7 Days</SelectItem>
                                             <SelectItem value="30d">Last 30 Days</SelectItem>
                                             <SelectItem value="q1">Q1 Report (Jan-Mar)</SelectItem>
-                                            <SelectItem value="custom">Custom Range...</SelectItem>
+                                            <SelectItem value="all">All Time</SelectItem>
                                         </SelectContent>
                                     </Select>
                                 </div>
 
                                 <div className="space-y-2">
                                     <label className="text-[10px] font-black text-slate-500 uppercase tracking-widest px-1">Filter by Type</label>
-                                    <Select defaultValue="all">
+                                    <Select value={typeFilter} onValueChange={setTypeFilter}>
                                         <SelectTrigger className="bg-slate-950/50 border-white/10 text-white h-11">
                                             <SelectValue />
                                         </SelectTrigger>
                                         <SelectContent className="bg-slate-900 border-white/10 text-white">
                                             <SelectItem value="all">All Credential Types</SelectItem>
-                                            <SelectItem value="Age">Age Verification only</SelectItem>
-                                            <SelectItem value="Identity">National Identity only</SelectItem>
+                                            <SelectItem value="age_verification">Age Verification only</SelectItem>
+                                            <SelectItem value="vaccination">Vaccination only</SelectItem>
+                                            <SelectItem value="prescription">Prescription only</SelectItem>
                                         </SelectContent>
                                     </Select>
                                 </div>
@@ -126,26 +155,15 @@ export default function ExportCenterPage() {
                                         {exportFormat === "csv" && <CheckCircle2 className="w-4 h-4 text-blue-400" />}
                                     </button>
                                     <button
-                                        onClick={() => setExportFormat("xlsx")}
-                                        className={`flex items-center justify-between p-4 rounded-2xl border transition-all ${exportFormat === "xlsx" ? "bg-blue-600/10 border-blue-500/50 text-white" : "bg-slate-950/50 border-white/5 text-slate-500 hover:border-white/10"
-                                            }`}
-                                    >
-                                        <div className="flex items-center gap-3">
-                                            <FileText className="w-5 h-5 text-blue-500" />
-                                            <span className="font-bold text-sm">Excel Spreadsheet (.xlsx)</span>
-                                        </div>
-                                        {exportFormat === "xlsx" && <CheckCircle2 className="w-4 h-4 text-blue-400" />}
-                                    </button>
-                                    <button
-                                        onClick={() => setExportFormat("pdf")}
-                                        className={`flex items-center justify-between p-4 rounded-2xl border transition-all ${exportFormat === "pdf" ? "bg-blue-600/10 border-blue-500/50 text-white" : "bg-slate-950/50 border-white/5 text-slate-500 hover:border-white/10"
+                                        onClick={() => setExportFormat("ndjson")}
+                                        className={`flex items-center justify-between p-4 rounded-2xl border transition-all ${exportFormat === "ndjson" ? "bg-blue-600/10 border-blue-500/50 text-white" : "bg-slate-950/50 border-white/5 text-slate-500 hover:border-white/10"
                                             }`}
                                     >
                                         <div className="flex items-center gap-3">
-                                            <FileText className="w-5 h-5 text-rose-500" />
-                                            <span className="font-bold text-sm">PDF Compliance Report</span>
+                                            <FileJson className="w-5 h-5 text-blue-500" />
+                                            <span className="font-bold text-sm">JSON Lines (NDJSON)</span>
                                         </div>
-                                        {exportFormat === "pdf" && <CheckCircle2 className="w-4 h-4 text-blue-400" />}
+                                        {exportFormat === "ndjson" && <CheckCircle2 className="w-4 h-4 text-blue-400" />}
                                     </button>
                                 </div>
                             </div>
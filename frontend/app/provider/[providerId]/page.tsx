@@ -1,6 +1,6 @@
 "use client";
 
-import { useState, useEffect } from "react";
+import { useState, useEffect, useCallback } from "react";
 import { useParams } from "next/navigation";
 import { Button } from "@/components/ui/button";
 import { Card, CardContent, CardHeader, CardTitle, CardDescription, CardFooter } from "@/components/ui/card";
@@ -41,8 +41,7 @@ export default function ProviderPage() {
     const [history, setHistory] = useState<VerificationItem[]>([]);
 
     // Fetch History
-    // eslint-disable-next-line react-hooks/exhaustive-deps
-    const fetchHistory = async () => {
+    const fetchHistory = useCallback(async () => {
         try {
             const res = await fetch(`/api/provider/${providerId}/audit`);
             if (res.ok) {
@@ -52,44 +51,26 @@ export default function ProviderPage() {
         } catch {
             console.error("Failed to fetch history");
         }
-    };
+    }, [providerId]);
 
     useEffect(() => {
         fetchHistory();
     }, [fetchHistory]);
 
-    // Cleanup polling on unmount
+    // Live history: the backend pushes every completed verification for this provider (SSE)
     useEffect(() => {
-        let interval: NodeJS.Timeout;
-        if (activeRequest && status === "waiting") {
-            interval = setInterval(async () => {
-                try {
-                    // Check status - In a real app this would be a specific endpoint for the request status
-                    // checking audit log for recent verification matching this request ID
-                    const res = await fetch(`/api/provider/${providerId}/audit`);
-                    if (res.ok) {
-                        const data = await res.json();
-                        // eslint-disable-next-line @typescript-eslint/no-explicit-any
-                        const found = data.verifications.find((v: any) => v.request_id === activeRequest.request_id);
-                        if (found) {
-                            // logic to use found if needed, otherwise just checking existence
-                        }
-                        // Note: The audit API might not return request_id in the list, checking implementation...
-                        // If not, we might need a direct status check endpoint. 
-                        // Let's assume there is one or we add one.
-                        // Actually, the previous file had `/api/provider/request/${requestId}` but that was just request details.
-                        // It also had `/api/provider/verify/${requestId}/status` which I should probably use if it existed, 
-                        // but I didn't see it in the routes.py I read earlier! 
-                        // Wait, looking at `routes.py`, I DID NOT See a status endpoint for polling!
-                        // The previous `VerifyRequestPage` had: `fetch(\`/api/provider/verify/${requestId}/status\`)`.
-                        // I must have missed it or it wasn't there?
-                        // Let's re-read routes.py carefully.
-                    }
-                } catch { }
-            }, 2000);
-        }
-        return () => clearInterval(interval);
-    }, [activeRequest, status, providerId, fetchHistory]);
+        const source = new EventSource(`/api/provider/${providerId}/events`);
+        source.addEventListener("verification", (e) => {
+            const event = JSON.parse((e as MessageEvent).data);
+            setHistory(prev => [{
+                verified: event.verified,
+                predicate: event.predicate,
+                timestamp: event.timestamp,
+                request_id: event.request_id,
+            }, ...prev]);
+        });
+        return () => source.close();
+    }, [providerId]);
 
     // Create Request
     const handleCreateRequest = async () => {
@@ -127,45 +108,17 @@ export default function ProviderPage() {
         }
     };
 
-    // Polling Logic Fix:
-    // Since I might not have a dedicated status endpoint, I'll simulate it or rely on history.
-    // Or better, I will implement a check in the useEffect that queries the audit log to see if this request was verified.
+    // Active request status is pushed by the backend (SSE) instead of polled
     useEffect(() => {
-        let interval: NodeJS.Timeout;
-        if (activeRequest && status === "waiting") {
-            interval = setInterval(async () => {
-                const res = await fetch(`/api/provider/${providerId}/audit`);
-                if (res.ok) {
-                    const data = await res.json();
-                    // We need to know if our request ID is in the verified list.
-                    // The audit list returns: verification_id, verified, predicate, timestamp.
-                    // It DOES NOT return request_id in the summary list based on my reading of routes.py...
-                    // "verifications": [ { "verification_id": ..., "verified": ..., ... } ]
-                    // Wait, I should verify the `routes.py` output again.
-                    // Line 115 in routes.py:
-                    // "verification_id": row[0].verification_id,
-                    // "verified": row[0].verified,
-                    // "predicate": row[1].predicate_human_readable,
-                    // "timestamp": row[0].verified_at
-
-                    // Ideally, I should add request_id to this output or add a specific status endpoint.
-                    // For now, I'll just assume if the *newest* verification matches our predicate and is very recent (last 5 seconds), it's ours.
-                    // This is hacky but works for a demo.
-
-                    if (data.verifications.length > 0) {
-                        const latest = data.verifications[0];
-                        const timeDiff = new Date().getTime() - new Date(latest.timestamp).getTime();
-                        if (timeDiff < 5000 && latest.verified) { // 5 seconds
-                            setStatus("verified");
-                            fetchHistory(); // Refresh list
-                            clearInterval(interval);
-                        }
-                    }
-                }
-            }, 2000);
-        }
-        return () => clearInterval(interval);
-    }, [activeRequest, status, providerId, fetchHistory]);
+        if (!activeRequest || status !== "waiting") return;
+        const source = new EventSource(`/api/provider/request/${activeRequest.request_id}/events`);
+        source.addEventListener("verification", (e) => {
+            const event = JSON.parse((e as MessageEvent).data);
+            setStatus(event.verified ? "verified" : "failed");
+            source.close();
+        });
+        return () => source.close();
+    }, [activeRequest, status]);
 
     const resetRequest = () => {
         setActiveRequest(null);